@@ -20,7 +20,7 @@ CORS(app,
      resources={r"/*": {"origins": "*"}},  # 모든 경로에 CORS 적용
      supports_credentials=True,
      allow_headers=["Content-Type", "Authorization", "X-Requested-With"],
-     methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+     methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
      expose_headers=["Content-Type"])
 
 # OPTIONS 요청 전역 처리
@@ -30,7 +30,7 @@ def handle_preflight():
         response = jsonify({'status': 'ok'})
         response.headers.add("Access-Control-Allow-Origin", "*")
         response.headers.add('Access-Control-Allow-Headers', "Content-Type,Authorization,X-Requested-With")
-        response.headers.add('Access-Control-Allow-Methods', "GET,PUT,POST,DELETE,OPTIONS")
+        response.headers.add('Access-Control-Allow-Methods', "GET,PUT,PATCH,POST,DELETE,OPTIONS")
         response.headers.add('Access-Control-Max-Age', "3600")
         return response
 
@@ -42,12 +42,46 @@ os.makedirs(os.path.join(os.path.dirname(__file__), 'database'), exist_ok=True)
 from models import db
 db.init_app(app)
 
+# Table version counters for cache invalidation
+from services import change_tracking
+change_tracking.install()
+
+# Committed changes published to /api/events subscribers
+from services import change_feed
+change_feed.install()
+
+def upgrade_schema():
+    """Add columns and indexes that were introduced after the database file was created"""
+    inspector = db.inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}')
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
 # Enable WAL mode for SQLite (better concurrent access)
 def setup_database():
     with app.app_context():
         # Create all tables
         db.create_all()
+        upgrade_schema()
         
+        # Full-text index for document contents (SQLite FTS5 virtual table)
+        from services import document_index
+        if document_index.available():
+            # documents not yet in the index: titles now, body text on a job worker
+            if document_index.ensure_index():
+                from services import jobs
+                jobs.enqueue('documents_extract_missing')
+                db.session.commit()
+
         # Enable WAL mode for better concurrent write performance
         if 'sqlite' in app.config['SQLALCHEMY_DATABASE_URI']:
             try:
@@ -65,6 +99,12 @@ def setup_database():
 with app.app_context():
     setup_database()
 
+# 요청별 SQL 계측 (Server-Timing 헤더, 느린 쿼리 로그) 및 운영 지표
+from services import sql_profiler, metrics
+with app.app_context():
+    sql_profiler.init_app(app, db)
+    metrics.init_app(app, db)
+
 
 # Register blueprints (API routes)
 from routes.auth import auth_bp
@@ -76,6 +116,8 @@ from routes.users import users_bp
 from routes.offices import offices_bp
 from routes.gis import gis_bp
 from routes.consulting import consulting_bp
+from routes.jobs import jobs_bp
+from routes.events import events_bp
 
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(projects_bp, url_prefix='/api/projects')
@@ -86,6 +128,22 @@ app.register_blueprint(users_bp, url_prefix='/api/users')
 app.register_blueprint(offices_bp, url_prefix='/api/offices')
 app.register_blueprint(gis_bp, url_prefix='/api/gis')
 app.register_blueprint(consulting_bp, url_prefix='/api/consulting')
+app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+app.register_blueprint(events_bp, url_prefix='/api/events')
+
+from services import activity_writer, response_cache
+
+
+def init_background(app):
+    """Start the serving process's background work.
+
+    Called from __main__ and wsgi.py only: scripts that import app (imports,
+    job workers, benchmarks) must not start threads or warm-up queries.
+    """
+    # 로그인/로그아웃 기록 일괄 저장
+    activity_writer.start_writer(app)
+    # GIS/대시보드 응답 캐시 예열 (완료 전까지 readiness probe 는 503)
+    response_cache.start_warmup(app)
 
 
 # Serve frontend files
@@ -130,9 +188,32 @@ def health_check():
     })
 
 
+# Readiness probe: DB, WAL, disk space and cache warm-up
+@app.route('/api/health/ready')
+def readiness_check():
+    from services import health
+    ready, checks = health.readiness()
+    return jsonify({
+        'status': 'ready' if ready else 'not_ready',
+        'service': 'GBMS',
+        'checks': checks
+    }), 200 if ready else 503
+
+
+# Prometheus scrape endpoint
+@app.route('/metrics')
+def metrics_endpoint():
+    if not app.config['METRICS_ENABLED']:
+        return jsonify({'error': '요청한 리소스를 찾을 수 없습니다.'}), 404
+    if not metrics.scrape_allowed(app.config):
+        return jsonify({'error': '접근 권한이 없습니다.'}), 403
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
 if __name__ == '__main__':
+    init_background(app)
     # Run the Flask development server
-    # In production, use a WSGI server like gunicorn
+    # In production, use a WSGI server like gunicorn (wsgi:app)
     app.run(
         host='0.0.0.0',  # Allow connections from other machines in the network
         port=5001,
@@ -3,6 +3,7 @@ GBMS - Flask Configuration
 글로벌사업처 해외사업관리시스템
 """
 import os
+import tempfile
 from datetime import timedelta
 
 # Base directory
@@ -32,14 +33,114 @@ class Config:
     
     # JWT configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'gbms-jwt-secret-change-in-production'
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=8)  # Token expires after 8 hours (work day)
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)  # Short-lived; carries role/department claims
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    TOKEN_REVOCATION_REFRESH_SECONDS = 60  # Reload the revocation list from the DB at most this often
+    
+    # Password hashing on a process pool (login bursts must not block API workers)
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt:32768:8:1'
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = 32  # queued + running hash jobs per process
+    PASSWORD_HASH_QUEUE_TIMEOUT = 5  # seconds to wait for a slot before answering 503
+    
+    # Login throttling (failed attempts, in-memory sliding windows)
+    LOGIN_MAX_FAILURES_PER_ACCOUNT = 5
+    LOGIN_ACCOUNT_WINDOW_SECONDS = 15 * 60
+    LOGIN_MAX_FAILURES_PER_IP = 30
+    LOGIN_IP_WINDOW_SECONDS = 5 * 60
+    LOGIN_THROTTLE_MAX_KEYS = 10000
+    
+    # Login/logout bookkeeping (last_login, activity log) written in batches off the request path
+    ACTIVITY_FLUSH_INTERVAL = float(os.environ.get('ACTIVITY_FLUSH_INTERVAL', 5))  # seconds; 0 = write inline
+    ACTIVITY_FLUSH_MAX_EVENTS = 500  # flush early once this many events are waiting
+    ACTIVITY_BUFFER_LIMIT = 10000  # oldest buffered events are dropped beyond this
     
     # Upload configuration
     UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
     MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'hwp', 'txt', 'jpg', 'jpeg', 'png', 'gif', 'zip'}
     
+    # Content-addressed document storage (SHA-256 keyed, shared between documents)
+    BLOB_FOLDER = os.environ.get('BLOB_FOLDER') or os.path.join(UPLOAD_FOLDER, 'blobs')
+    BLOB_GC_GRACE_SECONDS = 3600  # Unreferenced blobs younger than this are kept
+    
+    # Document downloads: None (served by the app), 'x-accel-redirect' (nginx) or 'x-sendfile'
+    DOCUMENT_SENDFILE_MODE = os.environ.get('DOCUMENT_SENDFILE_MODE')
+    DOCUMENT_ACCEL_PREFIX = os.environ.get('DOCUMENT_ACCEL_PREFIX') or '/protected-uploads/'  # internal location -> UPLOAD_FOLDER
+    DOCUMENT_BLOB_ACCEL_PREFIX = os.environ.get('DOCUMENT_BLOB_ACCEL_PREFIX')  # internal location -> BLOB_FOLDER, needed when it is outside UPLOAD_FOLDER
+    
+    # Background jobs (jobs table, processed by scripts/run_job_worker.py)
+    JOB_FOLDER = os.environ.get('JOB_FOLDER') or os.path.join(UPLOAD_FOLDER, 'jobs')
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))  # worker processes started by the script
+    JOB_POLL_SECONDS = 2  # idle workers check the queue this often
+    JOB_STALE_SECONDS = 30 * 60  # running jobs without a progress report for this long are retried
+    JOB_MAX_ATTEMPTS = 2
+    JOB_RESULT_TTL = 24 * 3600  # seconds a finished job (and its download) is kept
+    
+    # Set-based bulk delete/update (consulting projects, projects)
+    BULK_DELETE_CHUNK = 500  # rows per DELETE ... RETURNING statement (and per commit)
+    BULK_UPDATE_CHUNK = 500  # ids bound per UPDATE statement (one transaction for all)
+    BULK_DELETE_MAX_SECONDS = int(os.environ.get('BULK_DELETE_MAX_SECONDS', 10))  # synchronous requests stop after this
+    
+    # Document text extraction for full-text search (process pool size)
+    DOCUMENT_INDEX_WORKERS = int(os.environ.get('DOCUMENT_INDEX_WORKERS', 2))
+    
+    # Document previews (images, first PDF page) - LRU disk cache
+    PREVIEW_FOLDER = os.environ.get('PREVIEW_FOLDER') or os.path.join(UPLOAD_FOLDER, 'previews')
+    PREVIEW_CACHE_MAX_BYTES = 500 * 1024 * 1024  # 500MB
+    PREVIEW_SIZE = 480  # px, longest side
+    PREVIEW_WORKERS = int(os.environ.get('PREVIEW_WORKERS', 2))
+    
+    # SQL profiling: fraction of requests timed (Server-Timing header + slow-query log)
+    SQL_PROFILE_SAMPLE_RATE = float(os.environ.get('SQL_PROFILE_SAMPLE_RATE', 0.1))
+    SQL_SLOW_QUERY_MS = int(os.environ.get('SQL_SLOW_QUERY_MS', 200))
+    SQL_SLOW_QUERY_LOG = os.environ.get('SQL_SLOW_QUERY_LOG') or os.path.join(BASE_DIR, 'logs', 'slow_queries.log')
+    SQL_SLOW_QUERY_LOG_BYTES = 10 * 1024 * 1024  # rotate at 10MB
+    SQL_SLOW_QUERY_LOG_BACKUPS = 5
+    SQL_EXPLAIN_INTERVAL = 600  # seconds between EXPLAINs of the same statement shape
+    
+    # Prometheus-style /metrics endpoint (request/DB latency, caches, uploads)
+    # Off unless enabled; scrapers send "Authorization: Bearer <METRICS_TOKEN>" or
+    # connect directly (not through the proxy) from METRICS_ALLOWED_IPS
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    METRICS_ALLOWED_IPS = [
+        ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()
+    ]
+    
+    # GIS/dashboard response cache (per process, invalidated on committed writes)
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))  # seconds
+    RESPONSE_CACHE_MAX_ENTRIES = 256
+    RESPONSE_CACHE_WARMUP = os.environ.get('RESPONSE_CACHE_WARMUP', 'true').lower() == 'true'
+    
+    # In-memory user directory (user list, manager/creator names in serializers)
+    USER_DIRECTORY_TTL = int(os.environ.get('USER_DIRECTORY_TTL', 300))  # seconds; writes in this process invalidate at once
+    
+    # Grid index for radius queries (projects near an office)
+    GIS_INDEX_CELL_DEGREES = 1.0  # must divide 360
+    GIS_INDEX_TTL = int(os.environ.get('GIS_INDEX_TTL', 300))  # seconds; writes in this process invalidate at once
+    OFFICE_NEARBY_DEFAULT_KM = 300
+    OFFICE_NEARBY_MAX_KM = 5000
+    
+    # Incremental sync (?since=<version> on list and GIS endpoints)
+    DELTA_SYNC_OVERLAP_SECONDS = 5  # re-send rows stamped shortly before the token (commit lag)
+    DELTA_SYNC_TOMBSTONE_DAYS = int(os.environ.get('DELTA_SYNC_TOMBSTONE_DAYS', 90))  # older tokens get a full list
+    
+    # Live change feed (/api/events, server-sent events)
+    # per process; each stream (and long-poll) holds a server thread, so keep this
+    # below the threads per worker (GUNICORN_THREADS) to leave room for other requests
+    CHANGE_FEED_MAX_CLIENTS = int(os.environ.get('CHANGE_FEED_MAX_CLIENTS', 16))
+    CHANGE_FEED_QUEUE_SIZE = 256  # undelivered deltas per client before it is told to resync
+    CHANGE_FEED_BACKLOG = 1000  # recent deltas replayed to reconnecting clients
+    CHANGE_FEED_HEARTBEAT = 15  # seconds between keep-alive comments
+    CHANGE_FEED_MAX_SECONDS = 300  # streams close after this; clients reconnect (and refresh their token)
+    CHANGE_FEED_RETRY_MS = 3000
+    
+    # Readiness probe thresholds (/api/health/ready)
+    HEALTH_MIN_FREE_DISK_MB = int(os.environ.get('HEALTH_MIN_FREE_DISK_MB', 500))
+    HEALTH_WAL_WARN_BYTES = 256 * 1024 * 1024
+    HEALTH_WAL_WARN_FRAMES = 10000
+    
     # Pagination defaults
     ITEMS_PER_PAGE = 20
     
@@ -51,6 +152,8 @@ class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     SQLALCHEMY_ECHO = True  # Log SQL queries
+    SQL_PROFILE_SAMPLE_RATE = float(os.environ.get('SQL_PROFILE_SAMPLE_RATE', 1.0))
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
 
 
 class ProductionConfig(Config):
@@ -67,6 +170,14 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    ACTIVITY_FLUSH_INTERVAL = 0
+    
+    # Keep files written by tests out of the source tree
+    UPLOAD_FOLDER = os.path.join(tempfile.gettempdir(), 'gbms-test-uploads')
+    BLOB_FOLDER = os.path.join(UPLOAD_FOLDER, 'blobs')
+    JOB_FOLDER = os.path.join(UPLOAD_FOLDER, 'jobs')
+    PREVIEW_FOLDER = os.path.join(UPLOAD_FOLDER, 'previews')
+    SQL_PROFILE_SAMPLE_RATE = 0
 
 
 # Configuration dictionary
@@ -0,0 +1,19 @@
+"""
+GBMS - Gunicorn settings
+글로벌사업처 해외사업관리시스템 - 운영 서버 설정
+
+gunicorn reads this file from the working directory (gunicorn wsgi:app) or
+with -c gunicorn.conf.py. Change-feed streams (/api/events/stream) stay open
+for up to CHANGE_FEED_MAX_SECONDS and long-polls for twice the heartbeat, so
+sync workers (one request each) would be blocked by a few open tabs. gthread
+workers serve GUNICORN_THREADS requests at once; CHANGE_FEED_MAX_CLIENTS
+keeps streams to part of them (further ones get 503 and retry).
+"""
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5001')
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+# streams send a keep-alive every CHANGE_FEED_HEARTBEAT seconds
+timeout = 60
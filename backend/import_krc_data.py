@@ -9,37 +9,109 @@ import json
 import sqlite3
 import os
 import sys
+import argparse
+import hashlib
 from datetime import datetime
+from services.json_stream import iter_json_array, batched, prefetch
+from services.periods import parse_period_point, parse_period_range
 
 # 프로젝트 루트 경로 설정
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 KRC_DATA_DIR = os.path.join(PROJECT_ROOT, 'KRC', 'data')
 DB_PATH = os.path.join(SCRIPT_DIR, 'database', 'gbms.db')
+DEFAULT_BATCH_SIZE = 500
 
 def parse_date(date_str):
-    """날짜 문자열을 YYYY-MM-DD 형식으로 변환"""
-    if not date_str or date_str.strip() == '':
-        return None
+    """날짜 문자열('24-02 형식)을 YYYY-MM-DD 형식으로 변환"""
+    parsed = parse_period_point(date_str)
+    return parsed.isoformat() if parsed else None
+
+def fallback_code(prefix, *parts):
+    """__id가 없는 항목의 코드: 내용(사업명/국가/기간) 해시라 파일 내 순서가 바뀌어도 유지됨"""
+    payload = json.dumps([part or '' for part in parts], ensure_ascii=False, default=str)
+    return f"{prefix}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+def consulting_row(project):
+    """해외기술용역 JSON 항목 -> projects 컬럼 값"""
+    # 상태 매핑
+    status_map = {
+        '준공': 'completed',
+        '시행중': 'in_progress',
+        '제안중': 'planning'
+    }
+    
+    return {
+        'code': project.get('__id') or fallback_code(
+            'CONS', project.get('description'), project.get('name'),
+            project.get('startDate'), project.get('endDate')),
+        'title': project.get('description', ''),
+        'project_type': 'consulting',
+        'country': project.get('name', ''),
+        'latitude': project.get('lat'),
+        'longitude': project.get('lng'),
+        'start_date': parse_date(project.get('startDate')),
+        'end_date': parse_date(project.get('endDate')),
+        'budget_total': project.get('budget', 0) * 1000000 if project.get('budget') else 0,  # 백만원 -> 원
+        'client': project.get('client', ''),
+        'status': status_map.get(project.get('status'), 'planning'),
+        'description': project.get('projectType', ''),  # description에 사업형태 저장
+        'title_en': project.get('englishName', ''),
+        'department': 'gb'  # 글로벌사업부
+    }
+
+def oda_row(project):
+    """ODA JSON 항목 -> projects 컬럼 값"""
+    # 기간 파싱 ('23-'28 형식, ODA 기간은 항상 연도 범위: '10-12 = 2010~2012)
+    start_date, end_date = parse_period_range(project.get('period') or None, prefer_range=True)
+    
+    return {
+        'code': project.get('__id') or fallback_code(
+            'ODA', project.get('description'), project.get('name'), project.get('period')),
+        'title': project.get('description', ''),
+        'project_type': 'oda_bilateral',
+        'country': project.get('name', ''),
+        'latitude': project.get('lat'),
+        'longitude': project.get('lng'),
+        'start_date': start_date.isoformat() if start_date else None,
+        'end_date': end_date.isoformat() if end_date else None,
+        'budget_total': project.get('budget', 0) * 1000000 if project.get('budget') else 0,  # 백만원 -> 원
+        'client': project.get('type', ''),  # ODA는 type 필드 사용
+        'status': 'in_progress',  # ODA는 대부분 진행중
+        'description': project.get('content', ''),
+        'region': project.get('continent', ''),
+        'department': 'aidc'  # 농식품국제개발협력센터
+    }
+
+def insert_rows(cursor, rows):
+    """INSERT OR REPLACE rows with executemany; on failure retry one by one to report bad rows"""
+    if not rows:
+        return 0
     
-    # '24-02 형식 처리
-    if '-' in date_str:
-        parts = date_str.replace("'", "").split('-')
-        if len(parts) == 2:
-            year = parts[0]
-            month = parts[1]
-            # 2자리 연도를 4자리로 변환
-            if len(year) == 2:
-                year_int = int(year)
-                if year_int >= 72:  # 1972년부터
-                    year = f"19{year}"
-                else:
-                    year = f"20{year}"
-            return f"{year}-{month.zfill(2)}-01"
-    
-    return None
-
-def import_consulting_data(conn):
+    # created_at/updated_at: ?since= 증분 동기화 클라이언트가 새로 입력된 행을 받도록 설정
+    now = datetime.utcnow().isoformat(sep=' ')
+    columns = list(rows[0])
+    sql = f'''
+        INSERT OR REPLACE INTO projects ({', '.join(columns)}, created_at, updated_at)
+        VALUES ({', '.join('?' for _ in columns)}, ?, ?)
+    '''
+    
+    try:
+        cursor.executemany(sql, [tuple(row[c] for c in columns) + (now, now) for row in rows])
+        return len(rows)
+    except sqlite3.Error:
+        pass
+    
+    inserted = 0
+    for row in rows:
+        try:
+            cursor.execute(sql, tuple(row[c] for c in columns) + (now, now))
+            inserted += 1
+        except sqlite3.Error as e:
+            print(f"⚠️  프로젝트 import 실패: {row.get('title', 'Unknown')} - {e}")
+    return inserted
+
+def import_consulting_data(conn, batch_size=DEFAULT_BATCH_SIZE):
     """해외기술용역 데이터 import"""
     json_path = os.path.join(KRC_DATA_DIR, 'global_consulting.json')
     
@@ -47,60 +119,24 @@ def import_consulting_data(conn):
         print(f"❌ 파일을 찾을 수 없습니다: {json_path}")
         return 0
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        projects = json.load(f)
-    
     cursor = conn.cursor()
     imported = 0
     
-    for project in projects:
-        try:
-            # 날짜 파싱
-            start_date = parse_date(project.get('startDate'))
-            end_date = parse_date(project.get('endDate'))
-            
-            # 상태 매핑
-            status_map = {
-                '준공': 'completed',
-                '시행중': 'in_progress',
-                '제안중': 'planning'
-            }
-            status = status_map.get(project.get('status'), 'planning')
-            
-            # 프로젝트 삽입
-            cursor.execute('''
-                INSERT OR REPLACE INTO projects (
-                    code, title, project_type, country, latitude, longitude,
-                    start_date, end_date, budget_total, client, status,
-                    description, title_en, department
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                project.get('__id', f"CONS-{imported}"),
-                project.get('description', ''),
-                'consulting',  # project_type
-                project.get('name', ''),
-                project.get('lat'),
-                project.get('lng'),
-                start_date,
-                end_date,
-                project.get('budget', 0) * 1000000 if project.get('budget') else 0,  # 백만원 -> 원
-                project.get('client', ''),
-                status,
-                project.get('projectType', ''),  # description에 사업형태 저장
-                project.get('englishName', ''),
-                'gb'  # 글로벌사업부
-            ))
-            
-            imported += 1
-            
-        except Exception as e:
-            print(f"⚠️  프로젝트 import 실패: {project.get('description', 'Unknown')} - {e}")
-            continue
+    # 항목을 하나씩 읽으며(별도 스레드) batch 단위로 삽입
+    for batch in batched(prefetch(iter_json_array(json_path)), batch_size):
+        rows = []
+        for project in batch:
+            try:
+                rows.append(consulting_row(project))
+            except Exception as e:
+                print(f"⚠️  프로젝트 import 실패: {project.get('description', 'Unknown')} - {e}")
+        
+        imported += insert_rows(cursor, rows)
     
     conn.commit()
     return imported
 
-def import_oda_data(conn):
+def import_oda_data(conn, batch_size=DEFAULT_BATCH_SIZE):
     """ODA 데이터 import"""
     json_path = os.path.join(KRC_DATA_DIR, 'global_oda.json')
     
@@ -108,72 +144,238 @@ def import_oda_data(conn):
         print(f"❌ 파일을 찾을 수 없습니다: {json_path}")
         return 0
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        projects = json.load(f)
-    
     cursor = conn.cursor()
     imported = 0
     
-    for project in projects:
+    # 항목을 하나씩 읽으며(별도 스레드) batch 단위로 삽입
+    for batch in batched(prefetch(iter_json_array(json_path)), batch_size):
+        rows = []
+        for project in batch:
+            try:
+                rows.append(oda_row(project))
+            except Exception as e:
+                print(f"⚠️  프로젝트 import 실패: {project.get('description', 'Unknown')} - {e}")
+        
+        imported += insert_rows(cursor, rows)
+    
+    conn.commit()
+    return imported
+
+# ---------------------------------------------------------------------------
+# 증분 동기화 (--sync)
+# 원본 항목별 fingerprint를 저장해 두고 바뀐 항목만 UPSERT, 원본에서 사라진
+# 항목만 삭제합니다. 기존 행은 id가 유지되므로 예산/문서 FK가 깨지지 않습니다.
+# ---------------------------------------------------------------------------
+
+SYNC_SOURCES = {
+    'consulting': ('global_consulting.json', consulting_row),
+    'oda': ('global_oda.json', oda_row),
+}
+
+def ensure_sync_table(conn):
+    """동기화 fingerprint 테이블 생성 (삭제 기록 테이블은 앱 시작 전이어도 준비)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS krc_sync_state (
+            code VARCHAR(50) PRIMARY KEY,
+            source VARCHAR(20) NOT NULL,
+            fingerprint VARCHAR(64) NOT NULL,
+            synced_at DATETIME
+        )
+    ''')
+    # models.Tombstone 과 같은 구조
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tombstones (
+            id INTEGER PRIMARY KEY,
+            entity_type VARCHAR(50) NOT NULL,
+            entity_id INTEGER NOT NULL,
+            deleted_at DATETIME NOT NULL
+        )
+    ''')
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS ix_tombstones_entity_deleted ON tombstones (entity_type, deleted_at)'
+    )
+
+def fingerprint(row):
+    """변환된 행의 해시 (원본 값과 변환 규칙이 모두 반영됨)"""
+    payload = json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def plan_sync(conn, source):
+    """원본과 DB를 비교하여 변경 계획 생성"""
+    filename, to_row = SYNC_SOURCES[source]
+    json_path = os.path.join(KRC_DATA_DIR, filename)
+    
+    if not os.path.exists(json_path):
+        print(f"❌ 파일을 찾을 수 없습니다: {json_path}")
+        return None
+    
+    stored = dict(conn.execute(
+        'SELECT code, fingerprint FROM krc_sync_state WHERE source = ?', (source,)
+    ).fetchall())
+    existing_codes = {code for (code,) in conn.execute('SELECT code FROM projects')}
+    
+    plan = {'insert': [], 'update': [], 'unchanged': 0, 'delete': [], 'kept': [], 'skipped': 0}
+    seen = set()
+    
+    for item in prefetch(iter_json_array(json_path)):
         try:
-            # 기간 파싱 ('23-'28 형식)
-            period = project.get('period', '')
-            start_date = None
-            end_date = None
-            
-            if period and '-' in period:
-                parts = period.replace("'", "").split('-')
-                if len(parts) == 2:
-                    start_year = parts[0]
-                    end_year = parts[1]
-                    
-                    # 2자리 연도를 4자리로 변환
-                    if len(start_year) == 2:
-                        start_year_int = int(start_year)
-                        start_year = f"20{start_year}" if start_year_int < 72 else f"19{start_year}"
-                    
-                    if len(end_year) == 2:
-                        end_year_int = int(end_year)
-                        end_year = f"20{end_year}" if end_year_int < 72 else f"19{end_year}"
-                    
-                    start_date = f"{start_year}-01-01"
-                    end_date = f"{end_year}-12-31"
-            
-            # 프로젝트 삽입
-            cursor.execute('''
-                INSERT OR REPLACE INTO projects (
-                    code, title, project_type, country, latitude, longitude,
-                    start_date, end_date, budget_total, client, status,
-                    description, region, department
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                project.get('__id', f"ODA-{imported}"),
-                project.get('description', ''),
-                'oda_bilateral',  # project_type
-                project.get('name', ''),
-                project.get('lat'),
-                project.get('lng'),
-                start_date,
-                end_date,
-                project.get('budget', 0) * 1000000 if project.get('budget') else 0,  # 백만원 -> 원
-                project.get('type', ''),  # ODA는 type 필드 사용
-                'in_progress',  # ODA는 대부분 진행중
-                project.get('content', ''),
-                project.get('continent', ''),
-                'aidc'  # 농식품국제개발협력센터
-            ))
-            
-            imported += 1
-            
+            row = to_row(item)
         except Exception as e:
-            print(f"⚠️  프로젝트 import 실패: {project.get('description', 'Unknown')} - {e}")
+            name = item.get('description', 'Unknown') if isinstance(item, dict) else item
+            print(f"⚠️  항목 변환 실패 (건너뜀): {name} - {e}")
+            plan['skipped'] += 1
+            continue
+        code = row['code']
+        if code in seen:
+            print(f"⚠️  중복 코드 건너뜀: {code}")
             continue
+        seen.add(code)
+        
+        digest = fingerprint(row)
+        if code not in existing_codes:
+            plan['insert'].append((row, digest))
+        elif stored.get(code) != digest:
+            plan['update'].append((row, digest))
+        else:
+            plan['unchanged'] += 1
+    
+    # 변환에 실패한 항목의 코드는 알 수 없으므로 이번에는 삭제하지 않음
+    if plan['skipped']:
+        print("⚠️  변환 실패 항목이 있어 삭제 판정을 건너뜁니다.")
+        return plan
+    
+    # 원본에서 사라진 항목 (이 스크립트가 동기화한 행만 대상)
+    removed = [code for code in stored if code not in seen]
+    for code in removed:
+        referenced = conn.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM budgets b JOIN projects p ON b.project_id = p.id WHERE p.code = ?) +
+                (SELECT COUNT(*) FROM documents d JOIN projects p ON d.project_id = p.id WHERE p.code = ?) +
+                (SELECT COUNT(*) FROM project_phases ph JOIN projects p ON ph.project_id = p.id WHERE p.code = ?) +
+                (SELECT COUNT(*) FROM project_personnel pp JOIN projects p ON pp.project_id = p.id WHERE p.code = ?)
+        ''', (code, code, code, code)).fetchone()[0]
+        if referenced:
+            plan['kept'].append(code)
+        else:
+            plan['delete'].append(code)
+    
+    return plan
+
+def apply_sync(conn, source, plan, batch_size=DEFAULT_BATCH_SIZE):
+    """변경 계획을 하나의 트랜잭션으로 반영"""
+    now = datetime.utcnow().isoformat(sep=' ')
+    changed = plan['insert'] + plan['update']
+    
+    for batch in batched(changed, batch_size):
+        columns = list(batch[0][0]) + ['updated_at']
+        assignments = ', '.join(f'{c} = excluded.{c}' for c in columns if c != 'code')
+        conn.executemany(f'''
+            INSERT INTO projects ({', '.join(columns)}, created_at)
+            VALUES ({', '.join('?' for _ in columns)}, ?)
+            ON CONFLICT(code) DO UPDATE SET {assignments}
+        ''', [list(row.values()) + [now, now] for row, digest in batch])
+    
+    conn.executemany('''
+        INSERT INTO krc_sync_state (code, source, fingerprint, synced_at) VALUES (?, ?, ?, ?)
+        ON CONFLICT(code) DO UPDATE SET source = excluded.source,
+            fingerprint = excluded.fingerprint, synced_at = excluded.synced_at
+    ''', [(row['code'], source, digest, now) for row, digest in changed])
+    
+    # ?since= 증분 동기화 클라이언트가 삭제를 반영하도록 같은 트랜잭션에서 삭제 기록
+    removed = [(code,) for code in plan['delete']]
+    conn.executemany('''
+        INSERT INTO tombstones (entity_type, entity_id, deleted_at)
+        SELECT 'projects', id, ? FROM projects WHERE code = ?
+    ''', [(now, code) for code in plan['delete']])
+    conn.executemany('DELETE FROM projects WHERE code = ?', removed)
+    conn.executemany('DELETE FROM krc_sync_state WHERE code = ?', removed)
+
+def print_plan(plan, verbose):
+    """변경 내역 출력"""
+    print(f"  + 추가: {len(plan['insert'])}개")
+    print(f"  ~ 변경: {len(plan['update'])}개")
+    print(f"  - 삭제: {len(plan['delete'])}개")
+    print(f"  = 변경 없음: {plan['unchanged']}개")
+    if plan['skipped']:
+        print(f"  ? 변환 실패로 건너뜀: {plan['skipped']}개")
+    if plan['kept']:
+        print(f"  ! 원본에서 삭제되었지만 예산/문서/단계/인력이 연결되어 유지: {len(plan['kept'])}개")
     
+    if verbose:
+        for row, _ in plan['insert']:
+            print(f"    + {row['code']}  {row['title']}")
+        for row, _ in plan['update']:
+            print(f"    ~ {row['code']}  {row['title']}")
+        for code in plan['delete']:
+            print(f"    - {code}")
+        for code in plan['kept']:
+            print(f"    ! {code}")
+
+def sync_krc_data(conn, dry_run=False, verbose=False, batch_size=DEFAULT_BATCH_SIZE):
+    """KRC JSON과 projects 테이블 증분 동기화"""
+    ensure_sync_table(conn)
     conn.commit()
-    return imported
+    
+    try:
+        for source in SYNC_SOURCES:
+            print(f"\n📊 {source} 동기화 계획 계산 중...")
+            plan = plan_sync(conn, source)
+            if plan is None:
+                continue
+            print_plan(plan, verbose or dry_run)
+            if not dry_run:
+                apply_sync(conn, source, plan, batch_size)
+        
+        if dry_run:
+            conn.rollback()
+            print("\nℹ dry-run: 데이터베이스를 변경하지 않았습니다.")
+        else:
+            conn.commit()
+            print("\n✅ 동기화 완료")
+    except Exception:
+        conn.rollback()
+        raise
+
+def reimport_krc_data(conn, batch_size=DEFAULT_BATCH_SIZE):
+    """기존 프로젝트를 모두 삭제하고 KRC JSON 전체를 다시 입력. (해외기술용역 수, ODA 수) 반환"""
+    print("\n🗑️  기존 프로젝트 데이터 삭제 중...")
+    ensure_sync_table(conn)
+    old_ids = {project_id for (project_id,) in conn.execute('SELECT id FROM projects')}
+    conn.execute('DELETE FROM projects')
+    conn.commit()
+    print("✅ 기존 데이터 삭제 완료")
+    
+    # Consulting 데이터 import
+    print("\n📊 해외기술용역 데이터 import 중...")
+    consulting_count = import_consulting_data(conn, batch_size)
+    print(f"✅ 해외기술용역: {consulting_count}개 프로젝트 import 완료")
+    
+    # ODA 데이터 import
+    print("\n📊 ODA 데이터 import 중...")
+    oda_count = import_oda_data(conn, batch_size)
+    print(f"✅ ODA: {oda_count}개 프로젝트 import 완료")
+    
+    # SQLite는 id를 재사용함: 다시 입력된 id는 updated_at으로 전달되므로
+    # 다시 채워지지 않은 id만 삭제 기록을 남김
+    current_ids = {project_id for (project_id,) in conn.execute('SELECT id FROM projects')}
+    now = datetime.utcnow().isoformat(sep=' ')
+    conn.executemany(
+        "INSERT INTO tombstones (entity_type, entity_id, deleted_at) VALUES ('projects', ?, ?)",
+        [(project_id, now) for project_id in sorted(old_ids - current_ids)]
+    )
+    conn.commit()
+    return consulting_count, oda_count
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description='KRC JSON 데이터 import')
+    parser.add_argument('--sync', action='store_true',
+                        help='전체 삭제 후 재입력 대신 변경된 항목만 증분 동기화')
+    parser.add_argument('--dry-run', action='store_true', help='동기화 변경 내역만 출력 (--sync 포함)')
+    parser.add_argument('--verbose', action='store_true', help='변경 항목별 코드 출력')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='executemany batch 크기')
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("KRC 데이터 Import 시작")
     print("=" * 60)
@@ -186,23 +388,19 @@ def main():
     
     conn = sqlite3.connect(DB_PATH)
     
+    if args.sync or args.dry_run:
+        try:
+            sync_krc_data(conn, dry_run=args.dry_run, verbose=args.verbose, batch_size=args.batch_size)
+        except Exception as e:
+            print(f"\n❌ 오류 발생: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            conn.close()
+        return
+    
     try:
-        # 기존 프로젝트 데이터 삭제 (선택사항)
-        print("\n🗑️  기존 프로젝트 데이터 삭제 중...")
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM projects')
-        conn.commit()
-        print("✅ 기존 데이터 삭제 완료")
-        
-        # Consulting 데이터 import
-        print("\n📊 해외기술용역 데이터 import 중...")
-        consulting_count = import_consulting_data(conn)
-        print(f"✅ 해외기술용역: {consulting_count}개 프로젝트 import 완료")
-        
-        # ODA 데이터 import
-        print("\n📊 ODA 데이터 import 중...")
-        oda_count = import_oda_data(conn)
-        print(f"✅ ODA: {oda_count}개 프로젝트 import 완료")
+        consulting_count, oda_count = reimport_krc_data(conn, args.batch_size)
         
         # 통계 출력
         print("\n" + "=" * 60)
@@ -2,9 +2,13 @@
 GBMS - Database Models
 글로벌사업처 해외사업관리시스템
 """
+import json
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from services.periods import parse_period_point
+from services import user_directory
 
 db = SQLAlchemy()
 
@@ -97,7 +101,7 @@ class Project(db.Model):
     funding_source = db.Column(db.String(100))  # 재원조달처
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
     
     # Relationships
@@ -139,7 +143,7 @@ class Project(db.Model):
                 'currency': self.currency,
                 'partner': self.partner,
                 'fundingSource': self.funding_source,
-                'manager': self.manager.to_dict() if self.manager else None,
+                'manager': user_directory.get(self.manager_id),
                 'createdAt': self.created_at.isoformat() if self.created_at else None,
                 'updatedAt': self.updated_at.isoformat() if self.updated_at else None
             })
@@ -252,6 +256,8 @@ class Document(db.Model):
     file_path = db.Column(db.String(500), nullable=False)
     file_size = db.Column(db.Integer)
     file_type = db.Column(db.String(20))
+    content_hash = db.Column(db.String(64), index=True)  # SHA-256 (blob store key)
+    text_status = db.Column(db.String(10))  # 본문 추출 결과: indexed, empty, failed (NULL: 미추출)
     
     description = db.Column(db.Text)
     version = db.Column(db.String(20), default='1.0')
@@ -273,12 +279,13 @@ class Document(db.Model):
             'fileName': self.file_name,
             'fileSize': self.file_size,
             'fileType': self.file_type,
+            'contentHash': self.content_hash,
             'description': self.description,
             'version': self.version,
             'isPublic': self.is_public,
             'department': self.department,
             'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'createdBy': self.creator.name if self.creator else None
+            'createdBy': user_directory.name(self.created_by)
         }
 
 
@@ -293,6 +300,8 @@ class Office(db.Model):
     region = db.Column(db.String(50))
     city = db.Column(db.String(50))
     address = db.Column(db.String(300))
+    latitude = db.Column(db.Numeric(10, 7))  # 위도
+    longitude = db.Column(db.Numeric(10, 7))  # 경도
     
     office_type = db.Column(db.String(50))  # regular, oda_desk
     status = db.Column(db.String(20), default='active')
@@ -316,6 +325,8 @@ class Office(db.Model):
             'region': self.region,
             'city': self.city,
             'address': self.address,
+            'latitude': float(self.latitude) if self.latitude else None,
+            'longitude': float(self.longitude) if self.longitude else None,
             'officeType': self.office_type,
             'status': self.status,
             'contactPerson': self.contact_person,
@@ -382,7 +393,7 @@ class ActivityLog(db.Model):
         return {
             'id': self.id,
             'userId': self.user_id,
-            'userName': self.user.name if self.user else None,
+            'userName': user_directory.name(self.user_id),
             'action': self.action,
             'entityType': self.entity_type,
             'entityId': self.entity_id,
@@ -391,6 +402,79 @@ class ActivityLog(db.Model):
         }
 
 
+class TokenRevocation(db.Model):
+    """토큰 폐기 목록 (로그아웃한 토큰, 권한/상태가 바뀐 사용자의 이전 토큰)"""
+    __tablename__ = 'token_revocations'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), index=True)  # 특정 토큰 폐기
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
+    not_before = db.Column(db.DateTime)  # 이 시각 이전에 발급된 사용자 토큰 전체 폐기
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # 이후에는 목록에서 삭제
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class Tombstone(db.Model):
+    """삭제 기록 (?since= 증분 동기화에서 클라이언트 캐시의 삭제 반영용)"""
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        db.Index('ix_tombstones_entity_deleted', 'entity_type', 'deleted_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(50), nullable=False)  # 테이블명: projects, consulting_projects, offices
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Job(db.Model):
+    """백그라운드 작업 모델 (엑셀 업로드/내보내기, 일괄 삭제, KRC 가져오기)"""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_id', 'status', 'id'),  # 대기열 조회
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed, cancelled
+    params = db.Column(db.Text)  # JSON
+    input_path = db.Column(db.String(500))  # 업로드된 원본 파일
+
+    progress = db.Column(db.Integer, default=0)  # 0~100
+    message = db.Column(db.String(500))
+    result = db.Column(db.Text)  # JSON
+    result_path = db.Column(db.String(500))
+    result_name = db.Column(db.String(255))  # 다운로드 파일명
+    download_token = db.Column(db.String(64), unique=True)
+    error = db.Column(db.Text)
+
+    attempts = db.Column(db.Integer, default=0)
+    worker = db.Column(db.String(100))
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # 마지막 진행 보고 (중단된 작업 감지)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'type': self.job_type,
+            'status': self.status,
+            'progress': self.progress or 0,
+            'message': self.message,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'fileName': self.result_name if self.download_token else None,
+            'downloadUrl': f'/api/jobs/download/{self.download_token}' if self.download_token else None,
+            'attempts': self.attempts,
+            'createdBy': user_directory.name(self.created_by),
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'startedAt': self.started_at.isoformat() if self.started_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
 class ConsultingProject(db.Model):
     """해외기술용역 프로젝트 모델"""
     __tablename__ = 'consulting_projects'
@@ -410,13 +494,15 @@ class ConsultingProject(db.Model):
 
     start_date = db.Column(db.String(20))  # 착수일 (예: '72-10)
     end_date = db.Column(db.String(20))  # 준공일 (예: '73-09)
+    start_on = db.Column(db.Date, index=True)  # 착수일 정규화 (월 첫날, 범위 검색/정렬용)
+    end_on = db.Column(db.Date, index=True)  # 준공일 정규화 (월 마지막날)
 
     budget = db.Column(db.Numeric(15, 2))  # 용역비(공사)(백만원)
     client = db.Column(db.String(200))  # 발주처
 
     # 메타 정보
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
 
     creator = db.relationship('User', foreign_keys=[created_by])
@@ -435,9 +521,19 @@ class ConsultingProject(db.Model):
             'projectType': self.project_type,
             'startDate': self.start_date,
             'endDate': self.end_date,
+            'startOn': self.start_on.isoformat() if self.start_on else None,
+            'endOn': self.end_on.isoformat() if self.end_on else None,
             'budget': float(self.budget) if self.budget else 0,
             'client': self.client,
             'createdAt': self.created_at.isoformat() if self.created_at else None,
             'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
-            'createdBy': self.creator.name if self.creator else None
+            'createdBy': user_directory.name(self.created_by)
         }
+
+
+@event.listens_for(ConsultingProject, 'before_insert')
+@event.listens_for(ConsultingProject, 'before_update')
+def normalize_consulting_period(mapper, connection, target):
+    """start_date/end_date 문자열이 바뀔 때마다 DATE 컬럼을 함께 갱신"""
+    target.start_on = parse_period_point(target.start_date)
+    target.end_on = parse_period_point(target.end_date, end=True)
@@ -4,9 +4,12 @@ GBMS - Authentication Routes
 """
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+import uuid
 import jwt
 from functools import wraps
-from models import db, User, ActivityLog
+from models import db, User
+from services import activity_writer, login_throttle, password_hasher, token_revocation, user_directory
+from services.password_hasher import HasherBusy
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -16,8 +19,100 @@ def get_secret_key():
     return current_app.config['JWT_SECRET_KEY']
 
 
+class TokenUser:
+    """Stands in for User using the access-token claims.
+
+    id, user_id, name, role, department and is_active come from the token.
+    Any other attribute loads the User row on first use.
+    """
+
+    def __init__(self, claims):
+        self.id = claims['user_id']
+        self.user_id = claims.get('uid')
+        self.name = claims.get('name')
+        self.role = claims.get('role')
+        self.department = claims.get('dept')
+        self.is_active = claims.get('active', True)
+        self.claims = claims
+        self._record = None
+
+    def record(self):
+        if self._record is None:
+            self._record = db.session.get(User, self.id)
+        return self._record
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        user = self.record()
+        if user is None:
+            raise AttributeError(name)
+        return getattr(user, name)
+
+
+def issue_tokens(user, refresh=True):
+    """Short-lived access token with authorization claims (+ long-lived refresh token)"""
+    from flask import current_app
+    now = datetime.utcnow()
+    issued_at = round((now - datetime(1970, 1, 1)).total_seconds(), 3)  # ms precision for revocation cutoffs
+    access_token = jwt.encode({
+        'type': 'access',
+        'jti': uuid.uuid4().hex,
+        'user_id': user.id,
+        'uid': user.user_id,
+        'name': user.name,
+        'role': user.role,
+        'dept': user.department,
+        'active': bool(user.is_active),
+        'iat': issued_at,
+        'exp': now + current_app.config['JWT_ACCESS_TOKEN_EXPIRES']
+    }, get_secret_key(), algorithm='HS256')
+
+    tokens = {
+        'token': access_token,
+        'expiresIn': int(current_app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
+    }
+    if refresh:
+        tokens['refreshToken'] = jwt.encode({
+            'type': 'refresh',
+            'jti': uuid.uuid4().hex,
+            'user_id': user.id,
+            'iat': issued_at,
+            'exp': now + current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+        }, get_secret_key(), algorithm='HS256')
+    return tokens
+
+
+def authenticate(token):
+    """Access token -> (current_user, None) or (None, error response)"""
+    try:
+        data = jwt.decode(token, get_secret_key(), algorithms=['HS256'])
+    except jwt.ExpiredSignatureError:
+        return None, (jsonify({'message': '토큰이 만료되었습니다.'}), 401)
+    except jwt.InvalidTokenError:
+        return None, (jsonify({'message': '유효하지 않은 토큰입니다.'}), 401)
+    
+    token_type = data.get('type')
+    if token_type == 'access':
+        if token_revocation.is_revoked(data):
+            return None, (jsonify({'message': '토큰이 만료되었습니다.'}), 401)
+        current_user = TokenUser(data)
+    elif token_type is None:
+        # Tokens issued before claims were added: check the user row
+        current_user = db.session.get(User, data['user_id'])
+        if not current_user:
+            return None, (jsonify({'message': '사용자를 찾을 수 없습니다.'}), 401)
+    else:
+        return None, (jsonify({'message': '유효하지 않은 토큰입니다.'}), 401)
+    
+    if not current_user.is_active:
+        return None, (jsonify({'message': '비활성화된 계정입니다.'}), 401)
+    
+    return current_user, None
+
+
 def token_required(f):
-    """JWT token verification decorator"""
+    """JWT token verification decorator (authorizes from token claims, no DB lookup)"""
     @wraps(f)
     def decorated(*args, **kwargs):
         token = None
@@ -32,26 +127,35 @@ def token_required(f):
         if not token:
             return jsonify({'message': '인증 토큰이 필요합니다.'}), 401
         
-        try:
-            data = jwt.decode(token, get_secret_key(), algorithms=['HS256'])
-            current_user = User.query.get(data['user_id'])
-            
-            if not current_user:
-                return jsonify({'message': '사용자를 찾을 수 없습니다.'}), 401
-            
-            if not current_user.is_active:
-                return jsonify({'message': '비활성화된 계정입니다.'}), 401
-                
-        except jwt.ExpiredSignatureError:
-            return jsonify({'message': '토큰이 만료되었습니다.'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'message': '유효하지 않은 토큰입니다.'}), 401
+        current_user, error = authenticate(token)
+        if error:
+            return error
         
         return f(current_user, *args, **kwargs)
     
     return decorated
 
 
+def too_many_attempts(wait):
+    """429 response for throttled login attempts"""
+    response = jsonify({
+        'success': False,
+        'message': f'로그인 시도가 너무 많습니다. {wait}초 후에 다시 시도해주세요.'
+    })
+    response.headers['Retry-After'] = str(wait)
+    return response, 429
+
+
+def hasher_busy():
+    """503 response when the password hashing queue is full"""
+    response = jsonify({
+        'success': False,
+        'message': '로그인 요청이 많아 처리가 지연되고 있습니다. 잠시 후 다시 시도해주세요.'
+    })
+    response.headers['Retry-After'] = '5'
+    return response, 503
+
+
 def admin_required(f):
     """Admin role verification decorator"""
     @wraps(f)
@@ -78,60 +182,90 @@ def login():
     if not user_id or not password:
         return jsonify({'success': False, 'message': '아이디와 비밀번호를 입력해주세요.'}), 400
     
+    ip = request.remote_addr
+    wait = login_throttle.retry_after(ip, user_id)
+    if wait:
+        return too_many_attempts(wait)
+    
     user = User.query.filter_by(user_id=user_id).first()
     
-    if not user or not user.check_password(password):
+    try:
+        # Verifies on the hashing pool and upgrades outdated hashes
+        valid = user is not None and password_hasher.verify_and_update(user, password)
+    except HasherBusy:
+        return hasher_busy()
+    
+    if not valid:
+        login_throttle.record_failure(ip, user_id)
         return jsonify({'success': False, 'message': '아이디 또는 비밀번호가 올바르지 않습니다.'}), 401
     
+    login_throttle.record_success(user_id)
+    
     if not user.is_active:
         return jsonify({'success': False, 'message': '비활성화된 계정입니다. 관리자에게 문의하세요.'}), 401
     
-    # Generate JWT token
-    from flask import current_app
-    token_expires = current_app.config['JWT_ACCESS_TOKEN_EXPIRES']
+    # Generate JWT tokens (access + refresh)
+    tokens = issue_tokens(user)
     
-    token = jwt.encode({
-        'user_id': user.id,
-        'exp': datetime.utcnow() + token_expires
-    }, get_secret_key(), algorithm='HS256')
+    # last_login + activity log are buffered and written in the background
+    activity_writer.record_login(user, request.remote_addr)
     
-    # Update last login
-    user.last_login = datetime.utcnow()
-    
-    # Log activity
-    log = ActivityLog(
-        user_id=user.id,
-        action='login',
-        entity_type='user',
-        entity_id=user.id,
-        description=f'{user.name}님이 로그인했습니다.',
-        ip_address=request.remote_addr
-    )
-    db.session.add(log)
-    db.session.commit()
+    if db.session.is_modified(user):
+        db.session.commit()  # password hash was upgraded
     
     return jsonify({
         'success': True,
-        'token': token,
+        **tokens,
         'user': user.to_dict()
     })
 
 
+@auth_bp.route('/refresh', methods=['POST'])
+def refresh():
+    """Issue a new access token from a refresh token (claims re-read from the user row)"""
+    data = request.get_json(silent=True) or {}
+    token = data.get('refreshToken')
+    
+    if not token:
+        return jsonify({'success': False, 'message': 'refresh 토큰이 필요합니다.'}), 400
+    
+    try:
+        claims = jwt.decode(token, get_secret_key(), algorithms=['HS256'])
+    except jwt.ExpiredSignatureError:
+        return jsonify({'success': False, 'message': '로그인이 만료되었습니다. 다시 로그인해주세요.'}), 401
+    except jwt.InvalidTokenError:
+        return jsonify({'success': False, 'message': '유효하지 않은 토큰입니다.'}), 401
+    
+    if claims.get('type') != 'refresh' or token_revocation.is_revoked(claims):
+        return jsonify({'success': False, 'message': '로그인이 만료되었습니다. 다시 로그인해주세요.'}), 401
+    
+    user = db.session.get(User, claims['user_id'])
+    if not user or not user.is_active:
+        return jsonify({'success': False, 'message': '비활성화된 계정입니다. 관리자에게 문의하세요.'}), 401
+    
+    return jsonify({'success': True, **issue_tokens(user, refresh=False)})
+
+
 @auth_bp.route('/logout', methods=['POST'])
 @token_required
 def logout(current_user):
-    """User logout"""
-    # Log activity
-    log = ActivityLog(
-        user_id=current_user.id,
-        action='logout',
-        entity_type='user',
-        entity_id=current_user.id,
-        description=f'{current_user.name}님이 로그아웃했습니다.',
-        ip_address=request.remote_addr
-    )
-    db.session.add(log)
-    db.session.commit()
+    """User logout (revokes the access token and, if sent, the refresh token)"""
+    claims = getattr(current_user, 'claims', None)
+    if claims and claims.get('jti'):
+        token_revocation.revoke_token(claims['jti'], current_user.id, datetime.utcfromtimestamp(claims['exp']))
+    
+    refresh_token = (request.get_json(silent=True) or {}).get('refreshToken')
+    if refresh_token:
+        try:
+            refresh_claims = jwt.decode(refresh_token, get_secret_key(), algorithms=['HS256'])
+            if refresh_claims.get('type') == 'refresh' and refresh_claims.get('user_id') == current_user.id:
+                token_revocation.revoke_token(refresh_claims['jti'], current_user.id,
+                                              datetime.utcfromtimestamp(refresh_claims['exp']))
+        except jwt.InvalidTokenError:
+            pass
+    
+    activity_writer.record_logout(current_user, request.remote_addr)
+    db.session.commit()  # revocations
     
     return jsonify({'success': True, 'message': '로그아웃되었습니다.'})
 
@@ -142,14 +276,14 @@ def get_current_user(current_user):
     """Get current user info"""
     return jsonify({
         'success': True,
-        'user': current_user.to_dict()
+        'user': user_directory.get(current_user.id) or current_user.to_dict()
     })
 
 
 @auth_bp.route('/change-password', methods=['POST'])
 @token_required
 def change_password(current_user):
-    """Change password"""
+    """Change password (revokes every token issued to the user)"""
     data = request.get_json()
     
     current_password = data.get('currentPassword')
@@ -158,13 +292,26 @@ def change_password(current_user):
     if not current_password or not new_password:
         return jsonify({'success': False, 'message': '현재 비밀번호와 새 비밀번호를 입력해주세요.'}), 400
     
-    if not current_user.check_password(current_password):
-        return jsonify({'success': False, 'message': '현재 비밀번호가 올바르지 않습니다.'}), 400
+    wait = login_throttle.retry_after(request.remote_addr, current_user.user_id)
+    if wait:
+        return too_many_attempts(wait)
     
-    if len(new_password) < 6:
-        return jsonify({'success': False, 'message': '새 비밀번호는 6자 이상이어야 합니다.'}), 400
+    user = db.session.get(User, current_user.id)
+    
+    try:
+        if not password_hasher.verify(user.password_hash, current_password):
+            login_throttle.record_failure(request.remote_addr, current_user.user_id)
+            return jsonify({'success': False, 'message': '현재 비밀번호가 올바르지 않습니다.'}), 400
+        
+        if len(new_password) < 6:
+            return jsonify({'success': False, 'message': '새 비밀번호는 6자 이상이어야 합니다.'}), 400
+        
+        password_hasher.set_password(user, new_password)
+    except HasherBusy:
+        return hasher_busy()
     
-    current_user.set_password(new_password)
+    # sessions signed in with the old password (this one included) end here
+    token_revocation.revoke_user(user.id)
     db.session.commit()
     
-    return jsonify({'success': True, 'message': '비밀번호가 변경되었습니다.'})
+    return jsonify({'success': True, 'message': '비밀번호가 변경되었습니다. 다시 로그인해주세요.'})
@@ -2,19 +2,26 @@
 GBMS - Consulting Projects Routes
 해외기술용역 프로젝트 관리 API
 """
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, current_app
 from datetime import datetime
 from io import BytesIO
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
 import pandas as pd
+import time
+from werkzeug.datastructures import MultiDict
 from werkzeug.utils import secure_filename
 from models import db, ConsultingProject, ActivityLog
 from routes.auth import token_required
+from routes.jobs import job_accepted
+from services import jobs, user_directory, delta_sync, bulk_update
+from services.periods import parse_period_point
 import os
 
 consulting_bp = Blueprint('consulting', __name__)
 
+UPLOAD_PROGRESS_ROWS = 500  # 백그라운드 업로드: 진행률 보고(및 커밋) 간격
+
 
 def validate_project_data(data, is_update=False):
     """프로젝트 데이터 유효성 검증"""
@@ -70,21 +77,27 @@ def validate_project_data(data, is_update=False):
     return errors
 
 
-@consulting_bp.route('', methods=['GET'])
-@token_required
-def get_consulting_projects(current_user):
-    """Get all consulting projects with filters"""
-    # Get query parameters
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
-    country = request.args.get('country')
-    status = request.args.get('status')
-    year = request.args.get('year', type=int)
-    client = request.args.get('client')
-    search = request.args.get('search')
+def parse_date_arg(value):
+    """YYYY-MM-DD 또는 '72-10 형식 쿼리 파라미터 -> date"""
+    return parse_period_point(value) if value else None
 
-    # Build query
-    query = ConsultingProject.query
+
+CONSULTING_FILTER_ARGS = ('country', 'status', 'year', 'client', 'search', 'date_from', 'date_to')
+
+
+def filter_consulting_projects(query, args):
+    """목록/내보내기에서 공통으로 쓰는 필터
+
+    기간 필터는 정규화된 start_on/end_on 인덱스 컬럼을 사용합니다.
+    date_from/date_to 는 사업기간이 해당 구간과 겹치는 프로젝트를 찾습니다.
+    """
+    country = args.get('country')
+    status = args.get('status')
+    year = args.get('year', type=int)
+    client = args.get('client')
+    search = args.get('search')
+    date_from = parse_date_arg(args.get('date_from'))
+    date_to = parse_date_arg(args.get('date_to'))
 
     if country:
         query = query.filter(ConsultingProject.country == country)
@@ -108,12 +121,66 @@ def get_consulting_projects(current_user):
             )
         )
 
-    # Order by contract year (descending) and number
-    query = query.order_by(
-        ConsultingProject.contract_year.desc(),
+    if date_to:
+        query = query.filter(ConsultingProject.start_on <= date_to)
+
+    if date_from:
+        # 준공일이 없으면 착수일 기준
+        query = query.filter(
+            db.or_(
+                ConsultingProject.end_on >= date_from,
+                db.and_(ConsultingProject.end_on.is_(None), ConsultingProject.start_on >= date_from)
+            )
+        )
+
+    return query
+
+
+def consulting_order(sort, descending):
+    """정렬 기준: 기본은 수주년도+번호, sort=start/end 는 정규화된 날짜 컬럼"""
+    columns = {
+        'start': ConsultingProject.start_on,
+        'end': ConsultingProject.end_on,
+    }
+    column = columns.get(sort, ConsultingProject.contract_year)
+    return (
+        column.desc() if descending else column.asc(),
         ConsultingProject.number.asc()
     )
 
+
+@consulting_bp.route('', methods=['GET'])
+@token_required
+def get_consulting_projects(current_user):
+    """Get all consulting projects with filters
+
+    ?since=<version> returns the projects changed since that response's
+    version (no paging) and the ids deleted or no longer matching.
+    """
+    # Get query parameters
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    version = delta_sync.new_version()
+
+    try:
+        since = delta_sync.requested_since()
+    except delta_sync.InvalidVersion:
+        return jsonify({'success': False, 'message': '유효하지 않은 버전입니다.'}), 400
+
+    query = filter_consulting_projects(ConsultingProject.query, request.args)
+
+    if since is not None:
+        projects, deleted_ids = delta_sync.delta(ConsultingProject, query, since)
+        return jsonify({
+            'success': True,
+            'data': [project.to_dict() for project in projects],
+            'deleted': deleted_ids,
+            'version': version,
+            'full': False
+        })
+
+    query = query.order_by(*consulting_order(request.args.get('sort'), descending=True))
+
     # Paginate
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
@@ -122,7 +189,9 @@ def get_consulting_projects(current_user):
         'data': [project.to_dict() for project in pagination.items],
         'total': pagination.total,
         'pages': pagination.pages,
-        'currentPage': page
+        'currentPage': page,
+        'version': version,
+        'full': True
     })
 
 
@@ -319,6 +388,89 @@ def update_consulting_project(current_user, project_id):
         }), 500
 
 
+CONSULTING_BULK_FIELDS = {
+    'status': 'status',
+    'contractYear': 'contract_year',
+    'country': 'country',
+    'client': 'client',
+    'projectType': 'project_type',
+}
+
+
+@consulting_bp.route('/bulk-update', methods=['PATCH'])
+@token_required
+def bulk_update_consulting_projects(current_user):
+    """여러 프로젝트의 같은 필드를 한 번에 수정 (연말 상태 일괄 변경 등)
+
+    {"ids": [...]} 또는 {"filters": {...}} 와 {"changes": {"status": "준공"}}.
+    수정 가능한 필드: status, contractYear, country, client, projectType
+    """
+    data = request.get_json(silent=True) or {}
+    ids, filters, error = bulk_update.requested_target(data, CONSULTING_FILTER_ARGS)
+    if error:
+        return jsonify({'success': False, 'message': error}), 400
+
+    changes = data.get('changes')
+    if not isinstance(changes, dict) or not changes:
+        return jsonify({'success': False, 'message': '수정할 데이터가 없습니다.'}), 400
+
+    unknown = [field for field in changes if field not in CONSULTING_BULK_FIELDS]
+    if unknown:
+        return jsonify({
+            'success': False,
+            'message': f'일괄 수정할 수 없는 항목입니다: {", ".join(unknown)}'
+        }), 400
+
+    errors = validate_project_data(changes, is_update=True)
+    if 'country' in changes and not (changes['country'] or '').strip():
+        errors.append('국가는 필수 입력 항목입니다.')
+    if errors:
+        return jsonify({
+            'success': False,
+            'message': '입력 데이터 검증 실패',
+            'errors': errors
+        }), 400
+
+    changes = {field: (value.strip() or None) if isinstance(value, str) else value
+               for field, value in changes.items()}
+    values = {CONSULTING_BULK_FIELDS[field]: value for field, value in changes.items()}
+
+    try:
+        query = filter_consulting_projects(ConsultingProject.query, MultiDict(filters)) if filters else None
+        updated = bulk_update.update_rows(ConsultingProject, values, ids=ids, query=query)
+
+        if not updated:
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'message': '수정할 프로젝트를 찾을 수 없습니다.'
+            }), 404
+
+        summary = ', '.join(f'{field}={value}' for field, value in changes.items())
+        log = ActivityLog(
+            user_id=current_user.id,
+            action='bulk_update',
+            entity_type='consulting_project',
+            description=f'{current_user.name}님이 {updated}개의 해외기술용역 프로젝트를 일괄 수정했습니다: {summary}',
+            ip_address=request.remote_addr
+        )
+        db.session.add(log)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'message': f'{updated}개의 프로젝트가 수정되었습니다.',
+            'data': {'updated': updated}
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'일괄 수정 중 오류가 발생했습니다: {str(e)}'
+        }), 500
+
+
 @consulting_bp.route('/<int:project_id>', methods=['DELETE'])
 @token_required
 def delete_consulting_project(current_user, project_id):
@@ -339,6 +491,7 @@ def delete_consulting_project(current_user, project_id):
     db.session.add(log)
 
     db.session.delete(project)
+    delta_sync.record_deletes(ConsultingProject.__tablename__, [project_id])
     db.session.commit()
 
     return jsonify({
@@ -347,65 +500,31 @@ def delete_consulting_project(current_user, project_id):
     })
 
 
-@consulting_bp.route('/export', methods=['GET'])
-@token_required
-def export_consulting_projects(current_user):
-    """Export consulting projects to Excel"""
-    # Get filters from query parameters
-    country = request.args.get('country')
-    status = request.args.get('status')
-    year = request.args.get('year', type=int)
-    client = request.args.get('client')
-    search = request.args.get('search')
+CONSULTING_HEADERS = [
+    '번호', '수주년도', '진행여부', '국가별', 'X', 'Y',
+    '영문사업명', '국문사업명', '사업형태',
+    '착수일', '준공일', '용역비(공사)(백만원)', '발주처'
+]
 
-    # Build query
-    query = ConsultingProject.query
 
-    if country:
-        query = query.filter(ConsultingProject.country == country)
-    if status:
-        query = query.filter(ConsultingProject.status == status)
-    if year:
-        query = query.filter(ConsultingProject.contract_year == year)
-    if client:
-        query = query.filter(ConsultingProject.client.ilike(f'%{client}%'))
-    if search:
-        query = query.filter(
-            db.or_(
-                ConsultingProject.title_kr.ilike(f'%{search}%'),
-                ConsultingProject.title_en.ilike(f'%{search}%'),
-                ConsultingProject.country.ilike(f'%{search}%'),
-                ConsultingProject.client.ilike(f'%{search}%')
-            )
-        )
+def export_filename():
+    return f"해외기술용역_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 
-    # Order by contract year and number
-    query = query.order_by(
-        ConsultingProject.contract_year.asc(),
-        ConsultingProject.number.asc()
-    )
-
-    projects = query.all()
 
+def write_consulting_workbook(projects, output):
+    """프로젝트 목록을 Excel로 저장 (output: 파일 경로 또는 BytesIO)"""
     # Create Excel workbook
     wb = Workbook()
     ws = wb.active
     ws.title = "해외기술컨설팅"
 
-    # Define headers
-    headers = [
-        '번호', '수주년도', '진행여부', '국가별', 'X', 'Y',
-        '영문사업명', '국문사업명', '사업형태',
-        '착수일', '준공일', '용역비(공사)(백만원)', '발주처'
-    ]
-
     # Style for headers
     header_fill = PatternFill(start_color="0A3D62", end_color="0A3D62", fill_type="solid")
     header_font = Font(bold=True, color="FFFFFF", size=11)
     header_alignment = Alignment(horizontal="center", vertical="center")
 
     # Write headers
-    for col_num, header in enumerate(headers, 1):
+    for col_num, header in enumerate(CONSULTING_HEADERS, 1):
         cell = ws.cell(row=1, column=col_num, value=header)
         cell.fill = header_fill
         cell.font = header_font
@@ -432,33 +551,67 @@ def export_consulting_projects(current_user):
     for col_num, width in enumerate(column_widths, 1):
         ws.column_dimensions[ws.cell(row=1, column=col_num).column_letter].width = width
 
-    # Save to BytesIO
-    output = BytesIO()
     wb.save(output)
-    output.seek(0)
+    return ws.max_row - 1
 
-    # Log activity
+
+def log_consulting_export(user_id, user_name, count, ip_address):
     log = ActivityLog(
-        user_id=current_user.id,
+        user_id=user_id,
         action='export',
         entity_type='consulting_project',
-        description=f'{current_user.name}님이 해외기술용역 프로젝트 {len(projects)}건을 Excel로 다운로드했습니다.',
-        ip_address=request.remote_addr
+        description=f'{user_name}님이 해외기술용역 프로젝트 {count}건을 Excel로 다운로드했습니다.',
+        ip_address=ip_address
     )
     db.session.add(log)
     db.session.commit()
 
-    # Generate filename with timestamp
-    filename = f"해외기술용역_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+
+@consulting_bp.route('/export', methods=['GET'])
+@token_required
+def export_consulting_projects(current_user):
+    """Export consulting projects to Excel (?async=true: 202 + job, download via token)"""
+    if jobs.async_requested():
+        args = request.args.to_dict(flat=False)
+        args.pop('async', None)
+        job = jobs.enqueue('consulting_export', {'args': args, 'ip': request.remote_addr},
+                           user_id=current_user.id)
+        db.session.commit()
+        return job_accepted(job, 'Excel 내보내기 작업이 등록되었습니다.')
+
+    query = filter_consulting_projects(ConsultingProject.query, request.args)
+    query = query.order_by(*consulting_order(request.args.get('sort'), descending=False))
+
+    projects = query.all()
+
+    # Save to BytesIO
+    output = BytesIO()
+    write_consulting_workbook(projects, output)
+    output.seek(0)
+
+    # Log activity
+    log_consulting_export(current_user.id, current_user.name, len(projects), request.remote_addr)
 
     return send_file(
         output,
         mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         as_attachment=True,
-        download_name=filename
+        download_name=export_filename()
     )
 
 
+@jobs.handler('consulting_export')
+def run_consulting_export(job):
+    args = MultiDict(job.params.get('args', {}))
+    query = filter_consulting_projects(ConsultingProject.query, args)
+    projects = query.order_by(*consulting_order(args.get('sort'), descending=False)).all()
+    job.progress(30, f'{len(projects)}건 조회 완료, Excel 작성 중')
+
+    count = write_consulting_workbook(projects, job.result_file(export_filename()))
+    log_consulting_export(job.user_id, user_directory.name(job.user_id), count, job.params.get('ip'))
+    return {'count': count}
+
+
 @consulting_bp.route('/stats', methods=['GET'])
 @token_required
 def get_consulting_stats(current_user):
@@ -559,10 +712,102 @@ def get_consulting_clients(current_user):
     })
 
 
+REQUIRED_UPLOAD_COLUMNS = ['국문사업명', '국가별']
+
+
+def import_consulting_rows(df, user_id, progress=None):
+    """Excel 행을 프로젝트로 추가 -> (imported, skipped, errors)
+
+    progress(percent, message, imported=, skipped=) 가 주어지면 UPLOAD_PROGRESS_ROWS
+    행마다 호출됩니다 (백그라운드 작업에서는 그때마다 커밋). 마지막 커밋은 호출한
+    쪽에서 합니다. 이미 있는 프로젝트는 중복으로 건너뛰므로 다시 실행해도 안전합니다.
+    """
+    imported_count = 0
+    skipped_count = 0
+    errors = []
+    total = len(df)
+
+    for position, (idx, row) in enumerate(df.iterrows(), 1):
+        try:
+            # 필수 필드 검증
+            if pd.isna(row.get('국문사업명')) or pd.isna(row.get('국가별')):
+                errors.append(f'행 {idx + 2}: 필수 필드(국문사업명, 국가) 누락')
+                skipped_count += 1
+                continue
+
+            # 프로젝트 데이터 준비
+            project_data = {
+                'number': int(row['번호']) if pd.notna(row.get('번호')) else None,
+                'contract_year': int(row['수주년도']) if pd.notna(row.get('수주년도')) else None,
+                'status': row['진행여부'] if pd.notna(row.get('진행여부')) else '준공',
+                'country': str(row['국가별']).strip(),
+                'longitude': float(row['X']) if pd.notna(row.get('X')) else None,
+                'latitude': float(row['Y']) if pd.notna(row.get('Y')) else None,
+                'title_en': str(row['영문사업명']).strip() if pd.notna(row.get('영문사업명')) else None,
+                'title_kr': str(row['국문사업명']).strip(),
+                'project_type': str(row['사업형태']).strip() if pd.notna(row.get('사업형태')) else None,
+                'start_date': str(row['착수일']) if pd.notna(row.get('착수일')) else None,
+                'end_date': str(row['준공일']) if pd.notna(row.get('준공일')) else None,
+                'budget': float(row['용역비(공사)(백만원)']) if pd.notna(row.get('용역비(공사)(백만원)')) else None,
+                'client': str(row['발주처']).strip() if pd.notna(row.get('발주처')) else None,
+                'created_by': user_id
+            }
+
+            # 중복 체크
+            existing = ConsultingProject.query.filter_by(
+                title_kr=project_data['title_kr'],
+                country=project_data['country']
+            )
+            if project_data['contract_year']:
+                existing = existing.filter_by(contract_year=project_data['contract_year'])
+
+            if existing.first():
+                errors.append(f'행 {idx + 2}: 중복된 프로젝트 - {project_data["title_kr"]}')
+                skipped_count += 1
+                continue
+
+            # 프로젝트 생성
+            project = ConsultingProject(**project_data)
+            db.session.add(project)
+            imported_count += 1
+
+        except Exception as e:
+            errors.append(f'행 {idx + 2}: {str(e)}')
+            skipped_count += 1
+            continue
+        finally:
+            if progress and position % UPLOAD_PROGRESS_ROWS == 0:
+                progress(position * 100 // total, f'{position}/{total}행 처리',
+                         imported=imported_count, skipped=skipped_count)
+
+    return imported_count, skipped_count, errors
+
+
+def log_consulting_import(user_id, user_name, imported_count, ip_address):
+    log = ActivityLog(
+        user_id=user_id,
+        action='import',
+        entity_type='consulting_project',
+        description=f'{user_name}님이 Excel 파일로 {imported_count}개의 해외기술용역 프로젝트를 업로드했습니다.',
+        ip_address=ip_address
+    )
+    db.session.add(log)
+    db.session.commit()
+
+
+def upload_summary(imported_count, skipped_count, errors):
+    return {
+        'imported': imported_count,
+        'skipped': skipped_count,
+        'total': imported_count + skipped_count,
+        'errors': errors[:10]  # 최대 10개의 에러만 반환
+    }
+
+
 @consulting_bp.route('/upload', methods=['POST'])
 @token_required
 def upload_consulting_projects(current_user):
-    """Excel 파일을 통한 프로젝트 일괄 업로드"""
+    """Excel 파일을 통한 프로젝트 일괄 업로드 (?async=true: 202 + 작업 ID)"""
 
     if 'file' not in request.files:
         return jsonify({
@@ -584,13 +829,19 @@ def upload_consulting_projects(current_user):
             'message': 'Excel 파일(.xlsx, .xls)만 업로드 가능합니다.'
         }), 400
 
+    if jobs.async_requested():
+        # 파일만 저장하고 바로 응답 (컬럼 확인 포함 처리는 작업자가 수행)
+        job = jobs.enqueue('consulting_upload', {'fileName': file.filename, 'ip': request.remote_addr},
+                           user_id=current_user.id, input_path=jobs.save_input(file))
+        db.session.commit()
+        return job_accepted(job, 'Excel 업로드 작업이 등록되었습니다.')
+
     try:
         # Excel 파일 읽기
         df = pd.read_excel(file)
 
         # 필수 컬럼 확인
-        required_columns = ['국문사업명', '국가별']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in REQUIRED_UPLOAD_COLUMNS if col not in df.columns]
 
         if missing_columns:
             return jsonify({
@@ -598,99 +849,18 @@ def upload_consulting_projects(current_user):
                 'message': f'필수 컬럼이 없습니다: {", ".join(missing_columns)}'
             }), 400
 
-        # 컬럼 매핑
-        column_mapping = {
-            '번호': 'number',
-            '수주년도': 'contract_year',
-            '진행여부': 'status',
-            '국가별': 'country',
-            'X': 'longitude',
-            'Y': 'latitude',
-            '영문사업명': 'title_en',
-            '국문사업명': 'title_kr',
-            '사업형태': 'project_type',
-            '착수일': 'start_date',
-            '준공일': 'end_date',
-            '용역비(공사)(백만원)': 'budget',
-            '발주처': 'client'
-        }
-
-        imported_count = 0
-        skipped_count = 0
-        errors = []
-
-        for idx, row in df.iterrows():
-            try:
-                # 필수 필드 검증
-                if pd.isna(row.get('국문사업명')) or pd.isna(row.get('국가별')):
-                    errors.append(f'행 {idx + 2}: 필수 필드(국문사업명, 국가) 누락')
-                    skipped_count += 1
-                    continue
-
-                # 프로젝트 데이터 준비
-                project_data = {
-                    'number': int(row['번호']) if pd.notna(row.get('번호')) else None,
-                    'contract_year': int(row['수주년도']) if pd.notna(row.get('수주년도')) else None,
-                    'status': row['진행여부'] if pd.notna(row.get('진행여부')) else '준공',
-                    'country': str(row['국가별']).strip(),
-                    'longitude': float(row['X']) if pd.notna(row.get('X')) else None,
-                    'latitude': float(row['Y']) if pd.notna(row.get('Y')) else None,
-                    'title_en': str(row['영문사업명']).strip() if pd.notna(row.get('영문사업명')) else None,
-                    'title_kr': str(row['국문사업명']).strip(),
-                    'project_type': str(row['사업형태']).strip() if pd.notna(row.get('사업형태')) else None,
-                    'start_date': str(row['착수일']) if pd.notna(row.get('착수일')) else None,
-                    'end_date': str(row['준공일']) if pd.notna(row.get('준공일')) else None,
-                    'budget': float(row['용역비(공사)(백만원)']) if pd.notna(row.get('용역비(공사)(백만원)')) else None,
-                    'client': str(row['발주처']).strip() if pd.notna(row.get('발주처')) else None,
-                    'created_by': current_user.id
-                }
-
-                # 중복 체크
-                existing = ConsultingProject.query.filter_by(
-                    title_kr=project_data['title_kr'],
-                    country=project_data['country']
-                )
-                if project_data['contract_year']:
-                    existing = existing.filter_by(contract_year=project_data['contract_year'])
-
-                if existing.first():
-                    errors.append(f'행 {idx + 2}: 중복된 프로젝트 - {project_data["title_kr"]}')
-                    skipped_count += 1
-                    continue
-
-                # 프로젝트 생성
-                project = ConsultingProject(**project_data)
-                db.session.add(project)
-                imported_count += 1
-
-            except Exception as e:
-                errors.append(f'행 {idx + 2}: {str(e)}')
-                skipped_count += 1
-                continue
+        imported_count, skipped_count, errors = import_consulting_rows(df, current_user.id)
 
         # 데이터베이스에 커밋
         db.session.commit()
 
         # 활동 로그
-        log = ActivityLog(
-            user_id=current_user.id,
-            action='import',
-            entity_type='consulting_project',
-            description=f'{current_user.name}님이 Excel 파일로 {imported_count}개의 해외기술용역 프로젝트를 업로드했습니다.',
-            ip_address=request.remote_addr
-        )
-        db.session.add(log)
-        db.session.commit()
+        log_consulting_import(current_user.id, current_user.name, imported_count, request.remote_addr)
 
         return jsonify({
             'success': True,
             'message': f'업로드가 완료되었습니다. (성공: {imported_count}개, 실패: {skipped_count}개)',
-            'data': {
-                'imported': imported_count,
-                'skipped': skipped_count,
-                'total': imported_count + skipped_count,
-                'errors': errors[:10]  # 최대 10개의 에러만 반환
-            }
+            'data': upload_summary(imported_count, skipped_count, errors)
         }), 200
 
     except Exception as e:
@@ -701,62 +871,166 @@ def upload_consulting_projects(current_user):
         }), 500
 
 
+@jobs.handler('consulting_upload')
+def run_consulting_upload(job):
+    df = pd.read_excel(job.input_path)
+
+    missing_columns = [col for col in REQUIRED_UPLOAD_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f'필수 컬럼이 없습니다: {", ".join(missing_columns)}')
+
+    job.progress(0, f'{len(df)}행 처리 시작')
+    imported_count, skipped_count, errors = import_consulting_rows(df, job.user_id, progress=job.progress)
+    db.session.commit()
+
+    log_consulting_import(job.user_id, user_directory.name(job.user_id), imported_count, job.params.get('ip'))
+    return upload_summary(imported_count, skipped_count, errors)
+
+
+def _delete_consulting_chunk(id_select):
+    """id_select 에 해당하는 프로젝트를 한 문장으로 삭제 -> [(id, title_kr)]"""
+    if db.engine.dialect.delete_returning:
+        return db.session.execute(
+            db.delete(ConsultingProject)
+            .where(ConsultingProject.id.in_(id_select))
+            .returning(ConsultingProject.id, ConsultingProject.title_kr)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+    # RETURNING 미지원 DB: 대상 ID 를 먼저 읽고 삭제
+    rows = db.session.execute(
+        db.select(ConsultingProject.id, ConsultingProject.title_kr).where(ConsultingProject.id.in_(id_select))
+    ).all()
+    if rows:
+        db.session.execute(
+            db.delete(ConsultingProject)
+            .where(ConsultingProject.id.in_([row.id for row in rows]))
+            .execution_options(synchronize_session=False)
+        )
+    return rows
+
+
+def bulk_delete_consulting(user_id, user_name, ip_address, ids=None, filters=None,
+                           time_limit=None, progress=None):
+    """ID 목록 또는 목록 필터(filters)에 해당하는 프로젝트 일괄 삭제
+
+    BULK_DELETE_CHUNK 건씩 DELETE ... RETURNING 한 문장으로 지우고 묶음마다
+    커밋합니다 (쓰기 잠금을 오래 잡지 않도록). time_limit 초가 지나면 남은
+    대상은 두고 멈춥니다 (complete=False).
+    -> {'deleted', 'titles', 'complete', 'remaining'}; 지운 것이 없으면 None
+    """
+    chunk_size = current_app.config['BULK_DELETE_CHUNK']
+    deadline = time.monotonic() + time_limit if time_limit else None
+
+    if ids is not None:
+        pending = sorted(set(ids))
+        total = len(pending)
+    else:
+        filtered = filter_consulting_projects(ConsultingProject.query, filters)
+        total = filtered.count()
+
+    deleted_count = 0
+    project_titles = []  # 최대 5개만 기록
+    remaining = 0
+    try:
+        while True:
+            if ids is not None:
+                batch, pending = pending[:chunk_size], pending[chunk_size:]
+                if not batch:
+                    break
+                rows = _delete_consulting_chunk(batch)
+            else:
+                rows = _delete_consulting_chunk(
+                    filtered.with_entities(ConsultingProject.id)
+                    .order_by(ConsultingProject.id).limit(chunk_size).statement
+                )
+                if not rows:
+                    break
+
+            delta_sync.record_deletes(ConsultingProject.__tablename__, [row.id for row in rows])
+            db.session.commit()
+            deleted_count += len(rows)
+            project_titles.extend(row.title_kr for row in rows[:5 - len(project_titles)])
+
+            if progress and total:
+                progress(min(99, deleted_count * 100 // total), f'{deleted_count}/{total}건 삭제',
+                         deleted=deleted_count)
+            if ids is None and len(rows) < chunk_size:
+                break
+            if deadline and time.monotonic() > deadline:
+                remaining = len(pending) if ids is not None else filtered.count()
+                break
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        # 활동 로그 (중간에 실패해도 이미 커밋된 삭제는 기록)
+        if deleted_count:
+            log = ActivityLog(
+                user_id=user_id,
+                action='bulk_delete',
+                entity_type='consulting_project',
+                description=f'{user_name}님이 {deleted_count}개의 해외기술용역 프로젝트를 일괄 삭제했습니다.',
+                ip_address=ip_address
+            )
+            db.session.add(log)
+            db.session.commit()
+
+    if not deleted_count and not remaining:
+        return None
+
+    return {
+        'deleted': deleted_count,
+        'titles': project_titles,
+        'complete': not remaining,
+        'remaining': remaining
+    }
+
+
 @consulting_bp.route('/bulk-delete', methods=['POST'])
 @token_required
 def bulk_delete_consulting_projects(current_user):
-    """여러 프로젝트를 일괄 삭제"""
-    data = request.get_json()
-
-    if not data or 'ids' not in data:
+    """여러 프로젝트를 일괄 삭제 (?async=true: 202 + 작업 ID)
+
+    {"ids": [...]} 또는 목록과 같은 필터 {"filters": {"country": ..., "year": ...}}.
+    동기 요청은 BULK_DELETE_MAX_SECONDS 후 멈추고 complete=false 와 남은
+    건수를 돌려줍니다 (같은 요청을 다시 보내거나 ?async=true 사용).
+    """
+    data = request.get_json(silent=True) or {}
+    ids, filters, error = bulk_update.requested_target(data, CONSULTING_FILTER_ARGS)
+    if error:
         return jsonify({
             'success': False,
-            'message': '삭제할 프로젝트 ID 목록이 없습니다.'
+            'message': error
         }), 400
 
-    ids = data['ids']
-
-    if not isinstance(ids, list) or len(ids) == 0:
-        return jsonify({
-            'success': False,
-            'message': '유효한 ID 목록이 아닙니다.'
-        }), 400
+    if jobs.async_requested():
+        job = jobs.enqueue('consulting_bulk_delete', {'ids': ids, 'filters': filters, 'ip': request.remote_addr},
+                           user_id=current_user.id)
+        db.session.commit()
+        return job_accepted(job, '일괄 삭제 작업이 등록되었습니다.')
 
     try:
-        # 프로젝트 조회
-        projects = ConsultingProject.query.filter(ConsultingProject.id.in_(ids)).all()
+        deleted = bulk_delete_consulting(
+            current_user.id, current_user.name, request.remote_addr,
+            ids=ids, filters=MultiDict(filters) if filters else None,
+            time_limit=current_app.config['BULK_DELETE_MAX_SECONDS']
+        )
 
-        if not projects:
+        if deleted is None:
             return jsonify({
                 'success': False,
                 'message': '삭제할 프로젝트를 찾을 수 없습니다.'
             }), 404
 
-        deleted_count = len(projects)
-        project_titles = [p.title_kr for p in projects[:5]]  # 최대 5개만 기록
-
-        # 프로젝트 삭제
-        for project in projects:
-            db.session.delete(project)
-
-        # 활동 로그
-        log = ActivityLog(
-            user_id=current_user.id,
-            action='bulk_delete',
-            entity_type='consulting_project',
-            description=f'{current_user.name}님이 {deleted_count}개의 해외기술용역 프로젝트를 일괄 삭제했습니다.',
-            ip_address=request.remote_addr
-        )
-        db.session.add(log)
-
-        db.session.commit()
+        message = f'{deleted["deleted"]}개의 프로젝트가 삭제되었습니다.'
+        if not deleted['complete']:
+            message += f' (시간 제한으로 {deleted["remaining"]}건이 남았습니다.)'
 
         return jsonify({
             'success': True,
-            'message': f'{deleted_count}개의 프로젝트가 삭제되었습니다.',
-            'data': {
-                'deleted': deleted_count,
-                'titles': project_titles
-            }
+            'message': message,
+            'data': deleted
         }), 200
 
     except Exception as e:
@@ -765,3 +1039,16 @@ def bulk_delete_consulting_projects(current_user):
             'success': False,
             'message': f'삭제 중 오류가 발생했습니다: {str(e)}'
         }), 500
+
+
+@jobs.handler('consulting_bulk_delete')
+def run_consulting_bulk_delete(job):
+    filters = job.params.get('filters')
+    deleted = bulk_delete_consulting(
+        job.user_id, user_directory.name(job.user_id), job.params.get('ip'),
+        ids=job.params.get('ids'), filters=MultiDict(filters) if filters else None,
+        progress=job.progress
+    )
+    if deleted is None:
+        return {'deleted': 0, 'titles': []}
+    return {'deleted': deleted['deleted'], 'titles': deleted['titles']}
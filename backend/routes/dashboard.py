@@ -6,6 +6,7 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime, timedelta
 from models import db, Project, Budget, Document, Office
 from routes.auth import token_required
+from services import response_cache
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -14,6 +15,17 @@ dashboard_bp = Blueprint('dashboard', __name__)
 @token_required
 def get_overview(current_user):
     """Get dashboard overview statistics"""
+    return overview_response()
+
+
+def overview_response():
+    return response_cache.cached_json(
+        'dashboard.overview', ('projects', 'budgets', 'offices'), build_overview,
+        key=(datetime.now().year,)
+    )
+
+
+def build_overview():
     current_year = datetime.now().year
     
     # Project statistics
@@ -53,7 +65,7 @@ def get_overview(current_user):
         db.func.count(Project.id)
     ).filter(Project.status.in_(['in_progress', 'planning'])).group_by(Project.department).all()
     
-    return jsonify({
+    return {
         'success': True,
         'data': {
             'projects': {
@@ -73,7 +85,7 @@ def get_overview(current_user):
             'byType': {t[0]: t[1] for t in by_type},
             'byDepartment': {d[0]: d[1] for d in by_department}
         }
-    })
+    }
 
 
 @dashboard_bp.route('/recent-projects', methods=['GET'])
@@ -96,6 +108,17 @@ def get_recent_projects(current_user):
 @token_required
 def get_department_budgets(current_user):
     """Get budget by department for current year"""
+    return department_budgets_response()
+
+
+def department_budgets_response():
+    return response_cache.cached_json(
+        'dashboard.department_budgets', ('projects', 'budgets'), build_department_budgets,
+        key=(datetime.now().year,)
+    )
+
+
+def build_department_budgets():
     current_year = datetime.now().year
     
     dept_names = {
@@ -124,16 +147,24 @@ def get_department_budgets(current_user):
             'rate': round(executed / planned * 100, 1) if planned else 0
         })
     
-    return jsonify({
+    return {
         'success': True,
         'data': result
-    })
+    }
 
 
 @dashboard_bp.route('/country-stats', methods=['GET'])
 @token_required
 def get_country_stats(current_user):
     """Get project statistics by country"""
+    return country_stats_response()
+
+
+def country_stats_response():
+    return response_cache.cached_json('dashboard.country_stats', ('projects',), build_country_stats)
+
+
+def build_country_stats():
     countries = db.session.query(
         Project.country,
         Project.country_code,
@@ -146,7 +177,7 @@ def get_country_stats(current_user):
         db.func.count(Project.id).desc()
     ).all()
     
-    return jsonify({
+    return {
         'success': True,
         'data': [
             {
@@ -158,7 +189,7 @@ def get_country_stats(current_user):
             }
             for c in countries
         ]
-    })
+    }
 
 
 @dashboard_bp.route('/upcoming-events', methods=['GET'])
@@ -206,3 +237,9 @@ def get_activity_log(current_user):
         'success': True,
         'data': [log.to_dict() for log in logs]
     })
+
+
+# 시작 시 미리 계산할 응답 (readiness probe 가 완료를 기다림)
+response_cache.register_warmup('/api/dashboard/overview', overview_response)
+response_cache.register_warmup('/api/dashboard/department-budgets', department_budgets_response)
+response_cache.register_warmup('/api/dashboard/country-stats', country_stats_response)
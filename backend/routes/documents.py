@@ -3,11 +3,12 @@ GBMS - Documents Routes
 글로벌사업처 해외사업관리시스템 - 문서관리 API
 """
 import os
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, Response, request, jsonify, send_file, current_app
 from datetime import datetime
-from werkzeug.utils import secure_filename
+from werkzeug.utils import secure_filename, send_file as werkzeug_send_file
 from models import db, Document, ActivityLog
 from routes.auth import token_required
+from services import blob_store, document_index, jobs, metrics, previews, zip_stream
 
 documents_bp = Blueprint('documents', __name__)
 
@@ -18,18 +19,11 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
 
-@documents_bp.route('', methods=['GET'])
-@token_required
-def get_documents(current_user):
-    """Get all documents with filters"""
-    project_id = request.args.get('project_id', type=int)
-    doc_type = request.args.get('type')
-    department = request.args.get('department')
-    search = request.args.get('search')
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
-    
-    query = Document.query
+def filter_documents(query, args):
+    """Apply the get_documents filters (project_id, type, department)"""
+    project_id = args.get('project_id', type=int)
+    doc_type = args.get('type')
+    department = args.get('department')
     
     if project_id:
         query = query.filter(Document.project_id == project_id)
@@ -40,27 +34,78 @@ def get_documents(current_user):
     if department:
         query = query.filter(Document.department == department)
     
-    if search:
-        query = query.filter(
-            db.or_(
-                Document.title.ilike(f'%{search}%'),
-                Document.file_name.ilike(f'%{search}%')
-            )
-        )
+    return query
+
+
+@documents_bp.route('', methods=['GET'])
+@token_required
+def get_documents(current_user):
+    """Get all documents with filters"""
+    search = request.args.get('search')
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
     
-    query = query.order_by(Document.created_at.desc())
+    query = filter_documents(Document.query, request.args)
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Full-text search over title, file name and extracted body text
+    if search and document_index.build_match_query(search):
+        query = document_index.apply_search(query, search)
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        data = [dict(d.to_dict(), snippet=snippet) for d, snippet in pagination.items]
+    else:
+        query = query.order_by(Document.created_at.desc())
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        data = [d.to_dict() for d in pagination.items]
     
     return jsonify({
         'success': True,
-        'data': [d.to_dict() for d in pagination.items],
+        'data': data,
         'total': pagination.total,
         'pages': pagination.pages,
         'currentPage': page
     })
 
 
+@documents_bp.route('/archive', methods=['GET'])
+@token_required
+def download_documents_archive(current_user):
+    """Download documents as a ZIP streamed on the fly (same filters as get_documents)"""
+    search = request.args.get('search')
+    
+    query = filter_documents(Document.query, request.args)
+    if search and document_index.build_match_query(search):
+        documents = [d for d, snippet in document_index.apply_search(query, search).all()]
+    else:
+        documents = query.order_by(Document.created_at.desc()).all()
+    
+    if not documents:
+        return jsonify({'success': False, 'message': '다운로드할 문서가 없습니다.'}), 404
+    
+    # Only metadata is collected here; file contents are read while streaming
+    entries = [(d.file_name, d.file_path, d.file_type, d.created_at) for d in documents]
+    
+    # Log activity
+    log = ActivityLog(
+        user_id=current_user.id,
+        action='export',
+        entity_type='document',
+        description=f'문서 {len(entries)}건 일괄 다운로드',
+        ip_address=request.remote_addr
+    )
+    db.session.add(log)
+    db.session.commit()
+    
+    project_id = request.args.get('project_id', type=int)
+    filename = f"documents_{project_id or 'all'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    
+    return Response(
+        zip_stream.iter_zip(entries),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename={filename}'},
+        direct_passthrough=True
+    )
+
+
 @documents_bp.route('/<int:doc_id>', methods=['GET'])
 @token_required
 def get_document(current_user, doc_id):
@@ -95,20 +140,9 @@ def upload_document(current_user):
     description = request.form.get('description')
     department = request.form.get('department', current_user.department)
     
-    # Secure filename and save
+    # Hash while saving; identical content is stored only once
     filename = secure_filename(file.filename)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    saved_filename = f"{timestamp}_{filename}"
-    
-    # Create upload directory if not exists
-    upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'], str(project_id) if project_id else 'general')
-    os.makedirs(upload_path, exist_ok=True)
-    
-    file_path = os.path.join(upload_path, saved_filename)
-    file.save(file_path)
-    
-    # Get file info
-    file_size = os.path.getsize(file_path)
+    content_hash, file_path, file_size = blob_store.store_stream(file.stream)
     file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
     
     # Create document record
@@ -120,12 +154,14 @@ def upload_document(current_user):
         file_path=file_path,
         file_size=file_size,
         file_type=file_ext,
+        content_hash=content_hash,
         description=description,
         department=department,
         created_by=current_user.id
     )
     
     db.session.add(document)
+    db.session.flush()  # Get the document ID
     
     # Log activity
     log = ActivityLog(
@@ -140,6 +176,10 @@ def upload_document(current_user):
     
     db.session.commit()
     
+    # Search index: metadata now, body text extracted in the background
+    document_index.index_document(document)
+    previews.schedule(document)
+    
     return jsonify({
         'success': True,
         'message': '문서가 업로드되었습니다.',
@@ -147,20 +187,110 @@ def upload_document(current_user):
     }), 201
 
 
+def accel_location(file_path):
+    """Internal proxy URI for a stored file, or None when no configured location contains it.
+
+    Blobs map onto DOCUMENT_BLOB_ACCEL_PREFIX (-> BLOB_FOLDER), other files
+    onto DOCUMENT_ACCEL_PREFIX (-> UPLOAD_FOLDER). A path outside both would
+    need '../' in the URI, which the proxy rejects or resolves outside its
+    internal location.
+    """
+    config = current_app.config
+    real_path = os.path.realpath(file_path)
+    for folder, prefix in ((config['BLOB_FOLDER'], config['DOCUMENT_BLOB_ACCEL_PREFIX']),
+                           (config['UPLOAD_FOLDER'], config['DOCUMENT_ACCEL_PREFIX'])):
+        if not prefix:
+            continue
+        root = os.path.realpath(folder)
+        try:
+            if os.path.commonpath([real_path, root]) != root:
+                continue
+        except ValueError:  # different drives
+            continue
+        relative_path = os.path.relpath(real_path, root)
+        return prefix.rstrip('/') + '/' + relative_path.replace(os.sep, '/')
+    return None
+
+
+def proxy_download(document, mode, location=None):
+    """Let the front proxy push the bytes (X-Accel-Redirect for nginx, X-Sendfile for Apache/lighttpd)"""
+    response = werkzeug_send_file(
+        document.file_path,
+        request.environ,
+        as_attachment=True,
+        download_name=document.file_name,
+        etag=document.content_hash or True,
+        conditional=False,
+        use_x_sendfile=True,
+        response_class=current_app.response_class
+    )
+    # Only answer If-None-Match here; Range requests are served by the proxy
+    response.make_conditional(request.environ)
+
+    if mode == 'x-accel-redirect':
+        # Map the file onto the proxy's internal location (see accel_location)
+        del response.headers['X-Sendfile']
+        response.headers['X-Accel-Redirect'] = location
+
+    return response
+
+
 @documents_bp.route('/<int:doc_id>/download', methods=['GET'])
 @token_required
 def download_document(current_user, doc_id):
-    """Download document"""
+    """Download document (supports Range/If-None-Match; ETag is the content hash)"""
     document = Document.query.get_or_404(doc_id)
     
-    if not os.path.exists(document.file_path):
+    try:
+        mode = current_app.config.get('DOCUMENT_SENDFILE_MODE')
+        if mode == 'x-sendfile':
+            return proxy_download(document, mode)
+        if mode == 'x-accel-redirect':
+            location = accel_location(document.file_path)
+            if location:
+                return proxy_download(document, mode, location)
+            current_app.logger.warning(
+                'X-Accel-Redirect: %s is outside UPLOAD_FOLDER/BLOB_FOLDER locations; served by the app',
+                document.file_path
+            )
+        
+        # Without a proxy the open file is handed to wsgi.file_wrapper
+        # (sendfile(2) under gunicorn) instead of being read in Python
+        return send_file(
+            document.file_path,
+            as_attachment=True,
+            download_name=document.file_name,
+            etag=document.content_hash or True,
+            conditional=True
+        )
+    except FileNotFoundError:
         return jsonify({'success': False, 'message': '파일을 찾을 수 없습니다.'}), 404
+
+
+@documents_bp.route('/<int:doc_id>/preview', methods=['GET'])
+@token_required
+def get_document_preview(current_user, doc_id):
+    """Get preview image (JPEG thumbnail of an image or the first PDF page)"""
+    document = Document.query.get_or_404(doc_id)
     
-    return send_file(
-        document.file_path,
-        as_attachment=True,
-        download_name=document.file_name
-    )
+    if not previews.is_supported(document) or previews.has_failed(document):
+        return jsonify({'success': False, 'message': '미리보기를 지원하지 않는 문서입니다.'}), 404
+    
+    path = previews.lookup(document)
+    if path is None:
+        # Not generated yet (or evicted): render in the background
+        metrics.cache_miss('preview')
+        previews.schedule(document)
+        return jsonify({'success': True, 'status': 'pending', 'message': '미리보기를 생성하고 있습니다.'}), 202
+    
+    metrics.cache_hit('preview')
+    # Previews are keyed by content hash, so they never change
+    response = send_file(path, mimetype='image/jpeg', etag=document.content_hash, conditional=True, max_age=31536000)
+    response.cache_control.no_cache = None
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    return response
 
 
 @documents_bp.route('/<int:doc_id>', methods=['PUT'])
@@ -181,6 +311,7 @@ def update_document(current_user, doc_id):
     if 'isPublic' in data:
         document.is_public = data['isPublic']
     
+    document_index.update_metadata(document)
     db.session.commit()
     
     return jsonify({
@@ -195,10 +326,8 @@ def update_document(current_user, doc_id):
 def delete_document(current_user, doc_id):
     """Delete document"""
     document = Document.query.get_or_404(doc_id)
-    
-    # Delete file from disk
-    if os.path.exists(document.file_path):
-        os.remove(document.file_path)
+    content_hash = document.content_hash
+    file_path = document.file_path
     
     # Log activity
     log = ActivityLog(
@@ -211,10 +340,24 @@ def delete_document(current_user, doc_id):
     )
     db.session.add(log)
     
+    document_index.remove(document.id)
     db.session.delete(document)
     db.session.commit()
     
+    # Delete file from disk (shared blobs only when no other document references them)
+    if content_hash:
+        blob_store.release(content_hash)
+    elif os.path.exists(file_path):
+        os.remove(file_path)
+    
     return jsonify({
         'success': True,
         'message': '문서가 삭제되었습니다.'
     })
+
+
+@jobs.handler('documents_extract_missing')
+def run_documents_extract_missing(job):
+    """Body text for documents the startup backfill added to the search index"""
+    indexed, skipped = document_index.extract_missing(progress=job.progress)
+    return {'indexed': indexed, 'skipped': skipped}
@@ -0,0 +1,134 @@
+"""
+GBMS - Events Routes
+글로벌사업처 해외사업관리시스템 - 실시간 변경 알림 (SSE / long-poll)
+"""
+import json
+import time
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from models import Project, ConsultingProject, Budget, Document
+from routes.auth import token_required, authenticate
+from routes.gis import project_gis_entry, consulting_gis_entry
+from services import change_feed
+
+events_bp = Blueprint('events', __name__)
+
+# Map entries use the same shape as /api/gis/projects, so clients patch them in place
+change_feed.register(Project, 'project', project_gis_entry)
+change_feed.register(ConsultingProject, 'consulting', consulting_gis_entry)
+change_feed.register(Budget, 'budget', lambda budget: budget.to_dict())
+change_feed.register(Document, 'document', lambda document: document.to_dict())
+
+
+def requested_entities():
+    """?topics=project,consulting (all entities when omitted)"""
+    topics = request.args.get('topics', '')
+    return [topic.strip() for topic in topics.split(',') if topic.strip()]
+
+
+def feed_full_response():
+    response = jsonify({'success': False, 'message': '실시간 연결이 너무 많습니다. 잠시 후 다시 시도해주세요.'})
+    response.headers['Retry-After'] = '30'
+    return response, 503
+
+
+def sse(event, data, event_id=None):
+    lines = []
+    if event_id:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, ensure_ascii=False, default=str)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+@events_bp.route('/stream', methods=['GET'])
+def stream_events():
+    """Server-sent events: one 'change' event per committed write.
+
+    EventSource cannot send headers, so the access token may be passed as
+    ?token=. The browser resends the last event id on reconnect and gets
+    what it missed, or a 'resync' event when that is no longer available.
+    """
+    token = request.args.get('token')
+    if not token and 'Authorization' in request.headers:
+        token = request.headers['Authorization'].partition(' ')[2]
+    if not token:
+        return jsonify({'message': '인증 토큰이 필요합니다.'}), 401
+    current_user, error = authenticate(token)
+    if error:
+        return error
+
+    cursor = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    try:
+        subscription = change_feed.subscribe(requested_entities(), cursor)
+    except change_feed.FeedFull:
+        return feed_full_response()
+
+    config = current_app.config
+    heartbeat = config['CHANGE_FEED_HEARTBEAT']
+    # bounded by the access token lifetime; the client reconnects with a fresh token
+    deadline = time.monotonic() + config['CHANGE_FEED_MAX_SECONDS']
+    retry_ms = config['CHANGE_FEED_RETRY_MS']
+
+    def generate():
+        try:
+            yield f'retry: {retry_ms}\n\n'
+            if subscription.resync:
+                yield sse('resync', {'cursor': change_feed.current_cursor()}, change_feed.current_cursor())
+            for delta in subscription.replay:
+                yield sse('change', delta, delta['cursor'])
+
+            while time.monotonic() < deadline:
+                # writes from job workers, scripts and raw SQL arrive as 'invalidate'
+                change_feed.check_unpublished()
+                delta = subscription.get(timeout=min(heartbeat, max(0.1, deadline - time.monotonic())))
+                if subscription.overflowed:
+                    # fell behind: the client reloads once instead of receiving a gap
+                    yield sse('resync', {'cursor': change_feed.current_cursor()}, change_feed.current_cursor())
+                    return
+                if delta is None:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield sse('change', delta, delta['cursor'])
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx: do not buffer the stream
+    return response
+
+
+@events_bp.route('', methods=['GET'])
+@token_required
+def poll_events(current_user):
+    """Long-poll fallback: deltas after ?cursor=, waiting up to ?timeout= seconds for the first"""
+    config = current_app.config
+    timeout = max(0.0, min(request.args.get('timeout', 25, type=float), config['CHANGE_FEED_HEARTBEAT'] * 2))
+    cursor = request.args.get('cursor')
+    try:
+        subscription = change_feed.subscribe(requested_entities(), cursor or change_feed.current_cursor())
+    except change_feed.FeedFull:
+        return feed_full_response()
+
+    try:
+        change_feed.check_unpublished()
+        deltas = list(subscription.replay)
+        if not deltas and not subscription.resync and timeout:
+            delta = subscription.get(timeout=timeout)
+            if delta is not None:
+                deltas.append(delta)
+        while not subscription.overflowed:
+            delta = subscription.get(timeout=0)
+            if delta is None:
+                break
+            deltas.append(delta)
+    finally:
+        change_feed.unsubscribe(subscription)
+
+    resync = subscription.resync or subscription.overflowed
+    return jsonify({
+        'success': True,
+        'data': [] if resync else deltas,
+        'cursor': change_feed.current_cursor() if resync or not deltas else deltas[-1]['cursor'],
+        'resync': resync
+    })
@@ -3,37 +3,159 @@ GBMS - GIS Routes
 글로벌사업처 해외사업관리시스템 - GIS 지도 API
 """
 from flask import Blueprint, request, jsonify
-from models import db, Project, ConsultingProject
+from models import db, Project, ConsultingProject, Office
 from routes.auth import token_required
+from services import response_cache, delta_sync
 
 gis_bp = Blueprint('gis', __name__)
 
 
-@gis_bp.route('/projects', methods=['GET'])
-# @token_required  # 임시로 인증 비활성화 (개발용)
-def get_gis_projects():
-    """Get all projects with GIS data for map display (includes both regular and consulting projects)"""
-    # Get query parameters
-    project_type = request.args.get('type')
-    category = request.args.get('category')  # 'consulting' or 'oda'
-    country = request.args.get('country')
-    status = request.args.get('status')
-    search = request.args.get('search')
-    include_consulting = request.args.get('includeConsulting', 'true').lower() == 'true'
+GIS_TABLES = ('projects', 'consulting_projects', 'offices')
 
-    gis_projects = []
 
-    # Get regular projects
+def project_gis_entry(project):
+    """일반 사업을 GIS 마커 형식으로 변환 (좌표 없으면 None)"""
     try:
-        query = Project.query.filter(
-            Project.latitude.isnot(None),
-            Project.longitude.isnot(None),
-            Project.latitude != 0,
-            Project.longitude != 0
-        )
-    except Exception as e:
-        print(f"좌표 필드 확인 실패: {e}")
-        query = Project.query
+        lat = float(project.latitude) if project.latitude else None
+        lng = float(project.longitude) if project.longitude else None
+    except (AttributeError, TypeError):
+        return None
+
+    if not lat or not lng or lat == 0 or lng == 0:
+        return None
+
+    cat = 'Consulting'
+    if project.project_type in ['oda_bilateral', 'oda_multilateral']:
+        cat = 'ODA'
+
+    period = ''
+    if project.start_date and project.end_date:
+        period = f"'{project.start_date.year % 100}-'{project.end_date.year % 100}"
+    elif project.start_date:
+        period = f"'{project.start_date.year % 100}-"
+
+    budget = float(project.budget_total) if project.budget_total else 0
+
+    return {
+        '__id': f'PROJECT-{project.id}',
+        'source': 'regular',
+        'name': project.country,
+        'latitude': lat,
+        'longitude': lng,
+        'lat': lat,
+        'lng': lng,
+        'title': project.title,
+        'description': project.title,
+        'category': cat,
+        'period': period,
+        'budget': budget,
+        'continent': project.region or '',
+        'type': project.project_type,
+        'status': project.status,
+        'client': project.client or '',
+        'startDate': project.start_date.strftime('%Y-%m-%d') if project.start_date else None,
+        'endDate': project.end_date.strftime('%Y-%m-%d') if project.end_date else None,
+        'budgetTotal': budget,
+        'code': project.code
+    }
+
+
+def consulting_gis_entry(cp):
+    """해외기술용역 프로젝트를 GIS 마커 형식으로 변환 (좌표 없으면 None)"""
+    try:
+        lat = float(cp.latitude) if cp.latitude else None
+        lng = float(cp.longitude) if cp.longitude else None
+    except (AttributeError, TypeError):
+        return None
+
+    if not lat or not lng or lat == 0 or lng == 0:
+        return None
+
+    return {
+        '__id': f'CONSULTING-{cp.id}',
+        'source': 'consulting',
+        'name': cp.country,
+        'latitude': lat,
+        'longitude': lng,
+        'lat': lat,
+        'lng': lng,
+        'title': cp.title_kr,
+        'titleEn': cp.title_en,
+        'description': cp.title_kr,
+        'category': 'Consulting',
+        'period': f"{cp.start_date or ''}-{cp.end_date or ''}",
+        'budget': float(cp.budget) if cp.budget else 0,
+        'continent': '',
+        'type': cp.project_type or '해외기술용역',
+        'status': cp.status,
+        'client': cp.client or '',
+        'startDate': cp.start_date,
+        'endDate': cp.end_date,
+        'budgetTotal': float(cp.budget) if cp.budget else 0,
+        'contractYear': cp.contract_year,
+        'number': cp.number
+    }
+
+
+def office_gis_entry(office):
+    """해외사무소를 프로젝트와 같은 GIS 마커 형식으로 변환 (좌표 없으면 None)"""
+    lat = float(office.latitude) if office.latitude else None
+    lng = float(office.longitude) if office.longitude else None
+    if not lat or not lng:
+        return None
+
+    return {
+        '__id': f'OFFICE-{office.id}',
+        'source': 'office',
+        'name': office.country,
+        'latitude': lat,
+        'longitude': lng,
+        'lat': lat,
+        'lng': lng,
+        'title': office.name,
+        'description': office.address or office.name,
+        'category': 'Office',
+        'continent': office.region or '',
+        'type': office.office_type,
+        'status': office.status,
+        'city': office.city,
+        'officeId': office.id
+    }
+
+
+def located_office_query(status=None, country=None):
+    query = Office.query.filter(
+        Office.latitude.isnot(None),
+        Office.longitude.isnot(None),
+        Office.latitude != 0,
+        Office.longitude != 0
+    )
+    if status:
+        query = query.filter(Office.status == status)
+    if country:
+        query = query.filter(Office.country == country)
+    return query
+
+
+def located_offices(status=None, country=None):
+    query = located_office_query(status, country)
+    return [entry for entry in map(office_gis_entry, query.order_by(Office.name)) if entry]
+
+
+def gis_project_query(args):
+    """좌표가 있는 일반 사업 (GIS 필터 적용)"""
+    project_type = args.get('type')
+    category = args.get('category')  # 'consulting' or 'oda'
+    country = args.get('country')
+    status = args.get('status')
+    search = args.get('search')
+
+    query = Project.query.filter(
+        Project.latitude.isnot(None),
+        Project.longitude.isnot(None),
+        Project.latitude != 0,
+        Project.longitude != 0
+    )
 
     if project_type:
         query = query.filter(Project.project_type == project_type)
@@ -59,133 +181,156 @@ def get_gis_projects():
             )
         )
 
-    projects = query.all()
-    print(f"GIS API: 일반 프로젝트 {len(projects)}개 발견")
+    return query
 
-    # Transform regular projects to GIS format
-    for project in projects:
-        try:
-            lat = float(project.latitude) if project.latitude else None
-            lng = float(project.longitude) if project.longitude else None
-        except (AttributeError, TypeError):
-            continue
-
-        if not lat or not lng or lat == 0 or lng == 0:
-            continue
-
-        cat = 'Consulting'
-        if project.project_type in ['oda_bilateral', 'oda_multilateral']:
-            cat = 'ODA'
-
-        period = ''
-        if project.start_date and project.end_date:
-            period = f"'{project.start_date.year % 100}-'{project.end_date.year % 100}"
-        elif project.start_date:
-            period = f"'{project.start_date.year % 100}-"
-
-        budget = float(project.budget_total) if project.budget_total else 0
-
-        gis_project = {
-            '__id': f'PROJECT-{project.id}',
-            'source': 'regular',
-            'name': project.country,
-            'latitude': lat,
-            'longitude': lng,
-            'lat': lat,
-            'lng': lng,
-            'title': project.title,
-            'description': project.title,
-            'category': cat,
-            'period': period,
-            'budget': budget,
-            'continent': project.region or '',
-            'type': project.project_type,
-            'status': project.status,
-            'client': project.client or '',
-            'startDate': project.start_date.strftime('%Y-%m-%d') if project.start_date else None,
-            'endDate': project.end_date.strftime('%Y-%m-%d') if project.end_date else None,
-            'budgetTotal': budget,
-            'code': project.code
-        }
-        gis_projects.append(gis_project)
 
-    # Get consulting projects
-    if include_consulting:
-        consulting_query = ConsultingProject.query.filter(
-            ConsultingProject.latitude.isnot(None),
-            ConsultingProject.longitude.isnot(None),
-            ConsultingProject.latitude != 0,
-            ConsultingProject.longitude != 0
-        )
+def gis_consulting_query(args):
+    """좌표가 있는 해외기술용역 프로젝트 (GIS 필터 적용)"""
+    country = args.get('country')
+    status = args.get('status')
+    search = args.get('search')
 
-        if country:
-            consulting_query = consulting_query.filter(ConsultingProject.country == country)
+    consulting_query = ConsultingProject.query.filter(
+        ConsultingProject.latitude.isnot(None),
+        ConsultingProject.longitude.isnot(None),
+        ConsultingProject.latitude != 0,
+        ConsultingProject.longitude != 0
+    )
 
-        if status:
-            consulting_query = consulting_query.filter(ConsultingProject.status == status)
+    if country:
+        consulting_query = consulting_query.filter(ConsultingProject.country == country)
+
+    if status:
+        consulting_query = consulting_query.filter(ConsultingProject.status == status)
 
-        if search:
-            consulting_query = consulting_query.filter(
-                db.or_(
-                    ConsultingProject.title_kr.ilike(f'%{search}%'),
-                    ConsultingProject.title_en.ilike(f'%{search}%'),
-                    ConsultingProject.country.ilike(f'%{search}%')
-                )
+    if search:
+        consulting_query = consulting_query.filter(
+            db.or_(
+                ConsultingProject.title_kr.ilike(f'%{search}%'),
+                ConsultingProject.title_en.ilike(f'%{search}%'),
+                ConsultingProject.country.ilike(f'%{search}%')
             )
+        )
+
+    return consulting_query
+
+
+@gis_bp.route('/projects', methods=['GET'])
+# @token_required  # 임시로 인증 비활성화 (개발용)
+def get_gis_projects():
+    """Get all projects with GIS data for map display (includes both regular and consulting projects)
 
-        consulting_projects = consulting_query.all()
+    ?since=<version> returns only markers changed since that response's
+    version, and the __ids to remove.
+    """
+    try:
+        since = delta_sync.requested_since()
+    except delta_sync.InvalidVersion:
+        return jsonify({'success': False, 'message': '유효하지 않은 버전입니다.'}), 400
+
+    if since is not None:
+        return jsonify(build_gis_delta(since))
+    return response_cache.cached_json('gis.projects', GIS_TABLES, build_gis_projects)
+
+
+def build_gis_projects():
+    """GIS 지도용 프로젝트 목록 (요청 파라미터 기준, 응답 캐시에서 호출)"""
+    version = delta_sync.new_version()
+    include_consulting = request.args.get('includeConsulting', 'true').lower() == 'true'
+    include_offices = request.args.get('includeOffices', 'false').lower() == 'true'
+
+    gis_projects = []
+
+    # Get regular projects
+    projects = gis_project_query(request.args).all()
+    print(f"GIS API: 일반 프로젝트 {len(projects)}개 발견")
+
+    # Transform regular projects to GIS format
+    gis_projects.extend(entry for entry in map(project_gis_entry, projects) if entry)
+
+    # Get consulting projects
+    if include_consulting:
+        consulting_projects = gis_consulting_query(request.args).all()
         print(f"GIS API: 해외기술용역 프로젝트 {len(consulting_projects)}개 발견")
 
         # Transform consulting projects to GIS format
-        for cp in consulting_projects:
-            try:
-                lat = float(cp.latitude) if cp.latitude else None
-                lng = float(cp.longitude) if cp.longitude else None
-            except (AttributeError, TypeError):
-                continue
-
-            if not lat or not lng or lat == 0 or lng == 0:
-                continue
-
-            gis_project = {
-                '__id': f'CONSULTING-{cp.id}',
-                'source': 'consulting',
-                'name': cp.country,
-                'latitude': lat,
-                'longitude': lng,
-                'lat': lat,
-                'lng': lng,
-                'title': cp.title_kr,
-                'titleEn': cp.title_en,
-                'description': cp.title_kr,
-                'category': 'Consulting',
-                'period': f"{cp.start_date or ''}-{cp.end_date or ''}",
-                'budget': float(cp.budget) if cp.budget else 0,
-                'continent': '',
-                'type': cp.project_type or '해외기술용역',
-                'status': cp.status,
-                'client': cp.client or '',
-                'startDate': cp.start_date,
-                'endDate': cp.end_date,
-                'budgetTotal': float(cp.budget) if cp.budget else 0,
-                'contractYear': cp.contract_year,
-                'number': cp.number
-            }
-            gis_projects.append(gis_project)
+        gis_projects.extend(entry for entry in map(consulting_gis_entry, consulting_projects) if entry)
+
+    # Offices as additional markers on the same layer
+    if include_offices:
+        gis_projects.extend(located_offices(country=request.args.get('country')))
 
     print(f"GIS API: 총 {len(gis_projects)}개의 프로젝트를 반환합니다.")
 
-    return jsonify({
+    return {
         'success': True,
         'data': gis_projects,
-        'count': len(gis_projects)
-    })
+        'count': len(gis_projects),
+        'version': version,
+        'full': True
+    }
+
+
+def build_gis_delta(since):
+    """?since= 응답: 바뀐 마커와 지도에서 뺄 __id 목록"""
+    version = delta_sync.new_version()
+    include_consulting = request.args.get('includeConsulting', 'true').lower() == 'true'
+    include_offices = request.args.get('includeOffices', 'false').lower() == 'true'
+
+    sources = [(Project, gis_project_query(request.args), project_gis_entry, 'PROJECT')]
+    if include_consulting:
+        sources.append((ConsultingProject, gis_consulting_query(request.args), consulting_gis_entry, 'CONSULTING'))
+    if include_offices:
+        sources.append((Office, located_office_query(country=request.args.get('country')),
+                        office_gis_entry, 'OFFICE'))
+
+    changed, removed = [], []
+    for model, query, to_entry, prefix in sources:
+        rows, removed_ids = delta_sync.delta(model, query, since)
+        for row in rows:
+            entry = to_entry(row)
+            if entry:
+                changed.append(entry)
+            else:
+                removed.append(f'{prefix}-{row.id}')
+        removed.extend(f'{prefix}-{record_id}' for record_id in removed_ids)
+
+    return {
+        'success': True,
+        'data': changed,
+        'deleted': removed,
+        'count': len(changed),
+        'version': version,
+        'full': False
+    }
+
+
+@gis_bp.route('/offices', methods=['GET'])
+# @token_required  # 임시로 인증 비활성화 (개발용)
+def get_gis_offices():
+    """Get offices with coordinates for map display (same marker format as projects)"""
+    return response_cache.cached_json('gis.offices', ('offices',), build_gis_offices)
+
+
+def build_gis_offices():
+    """GIS 지도용 해외사무소 목록 (응답 캐시에서 호출)"""
+    offices = located_offices(status=request.args.get('status'), country=request.args.get('country'))
+    return {
+        'success': True,
+        'data': offices,
+        'count': len(offices)
+    }
 
 
 @gis_bp.route('/stats', methods=['GET'])
 # @token_required  # 임시로 인증 비활성화 (개발용)
 def get_gis_stats():
     """Get GIS statistics for map (includes consulting projects)"""
+    return response_cache.cached_json('gis.stats', GIS_TABLES, build_gis_stats)
+
+
+def build_gis_stats():
+    """GIS 통계 (응답 캐시에서 호출)"""
     # Count regular projects by category
     regular_consulting_count = Project.query.filter(
         Project.project_type == 'consulting',
@@ -233,7 +378,7 @@ def get_gis_stats():
     for country, count in consulting_country_stats:
         country_dict[country] = country_dict.get(country, 0) + count
 
-    return jsonify({
+    return {
         'success': True,
         'data': {
             'consulting': total_consulting,
@@ -243,7 +388,7 @@ def get_gis_stats():
             'regularConsulting': regular_consulting_count,
             'byCountry': country_dict
         }
-    })
+    }
 
 
 @gis_bp.route('/projects/<int:project_id>/location', methods=['PUT'])
@@ -270,3 +415,7 @@ def update_project_location(project_id):
     })
 
 
+# 시작 시 미리 계산할 응답 (readiness probe 가 완료를 기다림)
+response_cache.register_warmup('/api/gis/projects', get_gis_projects)
+response_cache.register_warmup('/api/gis/stats', get_gis_stats)
+response_cache.register_warmup('/api/gis/offices', get_gis_offices)
@@ -0,0 +1,134 @@
+"""
+GBMS - Jobs Routes
+글로벌사업처 해외사업관리시스템 - 백그라운드 작업 상태/결과 API
+"""
+import os
+from datetime import datetime
+from flask import Blueprint, request, jsonify, send_file, url_for
+from models import db, Job
+from routes.auth import token_required, admin_required
+from services import jobs
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+def job_accepted(job, message):
+    """202 response for a queued job (Location points at its status)"""
+    response = jsonify({
+        'success': True,
+        'message': message,
+        'data': job.to_dict()
+    })
+    response.headers['Location'] = url_for('jobs.get_job', job_id=job.id)
+    return response, 202
+
+
+def visible_job(current_user, job_id):
+    """Job owned by the user (admins see all); None otherwise"""
+    job = db.session.get(Job, job_id)
+    if job is None or (job.created_by != current_user.id and current_user.role != 'admin'):
+        return None
+    return job
+
+
+@jobs_bp.route('', methods=['GET'])
+@token_required
+def get_jobs(current_user):
+    """Recent jobs of the current user"""
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    query = Job.query
+    if not (current_user.role == 'admin' and request.args.get('all', '').lower() == 'true'):
+        query = query.filter(Job.created_by == current_user.id)
+    if request.args.get('status'):
+        query = query.filter(Job.status == request.args['status'])
+
+    job_list = query.order_by(Job.id.desc()).limit(limit).all()
+
+    return jsonify({
+        'success': True,
+        'data': [job.to_dict() for job in job_list]
+    })
+
+
+@jobs_bp.route('/<int:job_id>', methods=['GET'])
+@token_required
+def get_job(current_user, job_id):
+    """Job status and progress"""
+    job = visible_job(current_user, job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': '작업을 찾을 수 없습니다.'}), 404
+
+    return jsonify({
+        'success': True,
+        'data': job.to_dict()
+    })
+
+
+@jobs_bp.route('/<int:job_id>', methods=['DELETE'])
+@token_required
+def cancel_job(current_user, job_id):
+    """Cancel a job that has not started yet"""
+    job = visible_job(current_user, job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': '작업을 찾을 수 없습니다.'}), 404
+
+    cancelled = Job.query.filter(Job.id == job.id, Job.status == 'queued').update(
+        {'status': 'cancelled', 'finished_at': datetime.utcnow()}, synchronize_session=False
+    )
+    db.session.commit()
+    if not cancelled:
+        return jsonify({'success': False, 'message': '이미 시작되었거나 끝난 작업은 취소할 수 없습니다.'}), 409
+
+    return jsonify({'success': True, 'message': '작업이 취소되었습니다.'})
+
+
+@jobs_bp.route('/download/<token>', methods=['GET'])
+def download_job_result(token):
+    """Download a job's result file (the token itself authorizes the download)"""
+    job = Job.query.filter_by(download_token=token).first()
+    if job is None or job.status != 'done' or not job.result_path or jobs.download_expired(job) \
+            or not os.path.exists(job.result_path):
+        return jsonify({'success': False, 'message': '다운로드 링크가 만료되었거나 올바르지 않습니다.'}), 404
+
+    return send_file(job.result_path, as_attachment=True, download_name=job.result_name)
+
+
+@jobs_bp.route('/krc-coordinates', methods=['POST'])
+@admin_required
+def queue_krc_coordinates(current_user):
+    """Queue a KRC coordinate import (admin only)"""
+    data = request.get_json(silent=True) or {}
+    try:
+        min_score = float(data.get('minScore', 0.6))
+    except (TypeError, ValueError):
+        min_score = None
+    if min_score is None or not 0 < min_score <= 1:
+        return jsonify({
+            'success': False,
+            'message': '입력 데이터 검증 실패',
+            'errors': ['minScore는 0보다 크고 1 이하인 숫자여야 합니다.']
+        }), 400
+
+    job = jobs.enqueue('krc_coordinates', {
+        'overwrite': bool(data.get('overwrite', False)),
+        'minScore': min_score
+    }, user_id=current_user.id)
+    db.session.commit()
+
+    return job_accepted(job, 'KRC 좌표 가져오기 작업이 등록되었습니다.')
+
+
+@jobs.handler('krc_coordinates')
+def run_krc_coordinates(job):
+    # the script imports the app module; only workers (which already did) run this
+    from scripts.import_krc_coordinates import import_coordinates_from_krc
+
+    job.progress(5, 'KRC 데이터 매칭 준비 중')
+    result = import_coordinates_from_krc(
+        overwrite=job.params.get('overwrite', False),
+        min_score=job.params.get('minScore', 0.6),
+        progress=job.progress
+    )
+    if result is None:
+        raise FileNotFoundError('KRC 데이터 디렉토리를 찾을 수 없습니다.')
+    return result
@@ -2,10 +2,11 @@
 GBMS - Offices Routes
 글로벌사업처 해외사업관리시스템 - 해외사무소관리 API
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
 from models import db, Office, ActivityLog
 from routes.auth import token_required
+from services import response_cache, spatial_index, delta_sync
 
 offices_bp = Blueprint('offices', __name__)
 
@@ -13,7 +14,12 @@ offices_bp = Blueprint('offices', __name__)
 @offices_bp.route('', methods=['GET'])
 @token_required
 def get_offices(current_user):
-    """Get all offices"""
+    """Get all offices (cached until the next office write)"""
+    return response_cache.cached_json('offices.list', ('offices',), build_office_list)
+
+
+def build_office_list():
+    """해외사무소 목록 (요청 파라미터 기준, 응답 캐시에서 호출)"""
     status = request.args.get('status')
     office_type = request.args.get('type')
     region = request.args.get('region')
@@ -31,10 +37,10 @@ def get_offices(current_user):
     
     offices = query.order_by(Office.name).all()
     
-    return jsonify({
+    return {
         'success': True,
         'data': [o.to_dict() for o in offices]
-    })
+    }
 
 
 @offices_bp.route('/<int:office_id>', methods=['GET'])
@@ -49,6 +55,77 @@ def get_office(current_user, office_id):
     })
 
 
+@offices_bp.route('/<int:office_id>/nearby-projects', methods=['GET'])
+@token_required
+def get_nearby_projects(current_user, office_id):
+    """Projects (regular + consulting) within ?radius= km of the office, nearest first"""
+    office = Office.query.get_or_404(office_id)
+    
+    if not office.latitude or not office.longitude:
+        return jsonify({'success': False, 'message': '사무소 좌표가 등록되어 있지 않습니다.'}), 400
+    
+    config = current_app.config
+    radius = request.args.get('radius', config['OFFICE_NEARBY_DEFAULT_KM'], type=float)
+    if radius <= 0 or radius > config['OFFICE_NEARBY_MAX_KM']:
+        return jsonify({
+            'success': False,
+            'message': f"반경은 0보다 크고 {config['OFFICE_NEARBY_MAX_KM']}km 이하여야 합니다."
+        }), 400
+    
+    kinds = ('project', 'consulting')
+    if request.args.get('source') in kinds:
+        kinds = (request.args['source'],)
+    
+    projects = spatial_index.nearby(
+        float(office.latitude), float(office.longitude), radius,
+        kinds=kinds, limit=request.args.get('limit', type=int)
+    )
+    
+    return jsonify({
+        'success': True,
+        'data': projects,
+        'count': len(projects),
+        'office': office.to_dict(),
+        'radiusKm': radius
+    })
+
+
+def parse_coordinates(data):
+    """위도/경도 검증 -> ({'latitude'/'longitude': float or None}, errors)
+
+    Only keys present in data are returned; empty values become NULL.
+    """
+    values = {}
+    errors = []
+    for key, limit, label in (('latitude', 90, '위도'), ('longitude', 180, '경도')):
+        if key not in data:
+            continue
+        raw = data[key]
+        if raw is None or (isinstance(raw, str) and not raw.strip()):
+            values[key] = None
+            continue
+        try:
+            if isinstance(raw, bool):
+                raise TypeError(raw)
+            value = float(raw)
+        except (ValueError, TypeError):
+            errors.append(f'{label}는 숫자여야 합니다.')
+            continue
+        if not -limit <= value <= limit:  # NaN fails too
+            errors.append(f'{label}는 -{limit}도에서 {limit}도 사이여야 합니다.')
+            continue
+        values[key] = value
+    return values, errors
+
+
+def invalid_data_response(errors):
+    return jsonify({
+        'success': False,
+        'message': '입력 데이터 검증 실패',
+        'errors': errors
+    }), 400
+
+
 @offices_bp.route('', methods=['POST'])
 @token_required
 def create_office(current_user):
@@ -58,6 +135,10 @@ def create_office(current_user):
     if not data.get('name') or not data.get('country'):
         return jsonify({'success': False, 'message': '사무소명과 국가는 필수입니다.'}), 400
     
+    coordinates, errors = parse_coordinates(data)
+    if errors:
+        return invalid_data_response(errors)
+    
     office = Office(
         name=data['name'],
         country=data['country'],
@@ -65,6 +146,8 @@ def create_office(current_user):
         region=data.get('region'),
         city=data.get('city'),
         address=data.get('address'),
+        latitude=coordinates.get('latitude'),
+        longitude=coordinates.get('longitude'),
         office_type=data.get('officeType', 'regular'),
         status=data.get('status', 'active'),
         contact_person=data.get('contactPerson'),
@@ -103,6 +186,10 @@ def update_office(current_user, office_id):
     office = Office.query.get_or_404(office_id)
     data = request.get_json()
     
+    coordinates, errors = parse_coordinates(data)
+    if errors:
+        return invalid_data_response(errors)
+    
     if 'name' in data:
         office.name = data['name']
     if 'country' in data:
@@ -115,6 +202,10 @@ def update_office(current_user, office_id):
         office.city = data['city']
     if 'address' in data:
         office.address = data['address']
+    if 'latitude' in coordinates:
+        office.latitude = coordinates['latitude']
+    if 'longitude' in coordinates:
+        office.longitude = coordinates['longitude']
     if 'officeType' in data:
         office.office_type = data['officeType']
     if 'status' in data:
@@ -147,6 +238,7 @@ def delete_office(current_user, office_id):
         return jsonify({'success': False, 'message': '삭제 권한이 없습니다.'}), 403
     
     db.session.delete(office)
+    delta_sync.record_deletes(Office.__tablename__, [office_id])
     db.session.commit()
     
     return jsonify({
@@ -4,28 +4,25 @@ GBMS - Projects Routes
 """
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+from werkzeug.datastructures import MultiDict
 from models import db, Project, ProjectPhase, ProjectPersonnel, ActivityLog
 from routes.auth import token_required
+from services import delta_sync, bulk_update, user_directory
 
 projects_bp = Blueprint('projects', __name__)
 
 
-@projects_bp.route('', methods=['GET'])
-@token_required
-def get_projects(current_user):
-    """Get all projects with filters"""
-    # Get query parameters
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
-    project_type = request.args.get('type')
-    department = request.args.get('department')
-    status = request.args.get('status')
-    country = request.args.get('country')
-    year = request.args.get('year', type=int)
-    search = request.args.get('search')
-    
-    # Build query
-    query = Project.query
+PROJECT_FILTER_ARGS = ('type', 'department', 'status', 'country', 'year', 'search')
+
+
+def filter_projects(query, args):
+    """목록 필터 (type, department, status, country, year, search)"""
+    project_type = args.get('type')
+    department = args.get('department')
+    status = args.get('status')
+    country = args.get('country')
+    year = args.get('year', type=int)
+    search = args.get('search')
     
     if project_type:
         query = query.filter(Project.project_type == project_type)
@@ -51,6 +48,39 @@ def get_projects(current_user):
             )
         )
     
+    return query
+
+
+@projects_bp.route('', methods=['GET'])
+@token_required
+def get_projects(current_user):
+    """Get all projects with filters
+
+    ?since=<version> returns the projects changed since that response's
+    version (no paging) and the ids deleted or no longer matching.
+    """
+    # Get query parameters
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    version = delta_sync.new_version()
+    
+    try:
+        since = delta_sync.requested_since()
+    except delta_sync.InvalidVersion:
+        return jsonify({'success': False, 'message': '유효하지 않은 버전입니다.'}), 400
+    
+    query = filter_projects(Project.query, request.args)
+    
+    if since is not None:
+        projects, deleted_ids = delta_sync.delta(Project, query, since)
+        return jsonify({
+            'success': True,
+            'data': [p.to_dict() for p in projects],
+            'deleted': deleted_ids,
+            'version': version,
+            'full': False
+        })
+    
     # Order by updated_at descending
     query = query.order_by(Project.updated_at.desc())
     
@@ -62,7 +92,9 @@ def get_projects(current_user):
         'data': [p.to_dict() for p in pagination.items],
         'total': pagination.total,
         'pages': pagination.pages,
-        'currentPage': page
+        'currentPage': page,
+        'version': version,
+        'full': True
     })
 
 
@@ -231,6 +263,105 @@ def update_project(current_user, project_id):
     })
 
 
+PROJECT_BULK_FIELDS = {
+    'department': 'department',
+    'status': 'status',
+    'progress': 'progress',
+    'managerId': 'manager_id',
+    'region': 'region',
+    'client': 'client',
+    'partner': 'partner',
+    'fundingSource': 'funding_source',
+}
+
+PROJECT_STATUSES = ('planning', 'bidding', 'contracted', 'in_progress', 'completed', 'suspended', 'cancelled')
+PROJECT_DEPARTMENTS = ('gad', 'gb', 'aidc')  # 글로벌농업개발부, 글로벌사업부, 농식품국제개발협력센터
+
+
+def validate_bulk_changes(changes):
+    """일괄 수정 값 검증 -> 오류 메시지 목록"""
+    errors = []
+    unknown = [field for field in changes if field not in PROJECT_BULK_FIELDS]
+    if unknown:
+        errors.append(f'일괄 수정할 수 없는 항목입니다: {", ".join(unknown)}')
+    
+    if 'department' in changes and not changes['department']:
+        errors.append('부서는 비워둘 수 없습니다.')
+    elif 'department' in changes and changes['department'] not in PROJECT_DEPARTMENTS:
+        errors.append(f'부서는 {", ".join(PROJECT_DEPARTMENTS)} 중 하나여야 합니다.')
+    
+    if 'status' in changes and changes['status'] not in PROJECT_STATUSES:
+        errors.append(f'상태는 {", ".join(PROJECT_STATUSES)} 중 하나여야 합니다.')
+    
+    if 'progress' in changes:
+        progress = changes['progress']
+        if isinstance(progress, bool) or not isinstance(progress, int) or not 0 <= progress <= 100:
+            errors.append('진행률은 0에서 100 사이의 정수여야 합니다.')
+    
+    if changes.get('managerId') is not None and not user_directory.get(changes['managerId']):
+        errors.append('담당자를 찾을 수 없습니다.')
+    
+    return errors
+
+
+@projects_bp.route('/bulk-update', methods=['PATCH'])
+@token_required
+def bulk_update_projects(current_user):
+    """Apply the same field changes to many projects (department reassignment, year-end status rollover)
+
+    Body: {"ids": [...]} or {"filters": {...}} (list endpoint filters), and
+    {"changes": {"status": "completed", "progress": 100}}.
+    """
+    data = request.get_json(silent=True) or {}
+    ids, filters, error = bulk_update.requested_target(data, PROJECT_FILTER_ARGS)
+    if error:
+        return jsonify({'success': False, 'message': error}), 400
+    
+    changes = data.get('changes')
+    if not isinstance(changes, dict) or not changes:
+        return jsonify({'success': False, 'message': '수정할 데이터가 없습니다.'}), 400
+    
+    errors = validate_bulk_changes(changes)
+    if errors:
+        return jsonify({'success': False, 'message': '입력 데이터 검증 실패', 'errors': errors}), 400
+    
+    values = {PROJECT_BULK_FIELDS[field]: value for field, value in changes.items()}
+    
+    try:
+        query = filter_projects(Project.query, MultiDict(filters)) if filters else None
+        updated = bulk_update.update_rows(Project, values, ids=ids, query=query)
+        
+        if not updated:
+            db.session.rollback()
+            return jsonify({'success': False, 'message': '수정할 사업을 찾을 수 없습니다.'}), 404
+        
+        # Log activity (one entry for the whole batch)
+        summary = ', '.join(f'{field}={value}' for field, value in changes.items())
+        log = ActivityLog(
+            user_id=current_user.id,
+            action='bulk_update',
+            entity_type='project',
+            description=f'사업 {updated}건 일괄 수정: {summary}',
+            ip_address=request.remote_addr
+        )
+        db.session.add(log)
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'{updated}개의 사업이 수정되었습니다.',
+            'data': {'updated': updated}
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'일괄 수정 중 오류가 발생했습니다: {str(e)}'
+        }), 500
+
+
 @projects_bp.route('/<int:project_id>', methods=['DELETE'])
 @token_required
 def delete_project(current_user, project_id):
@@ -255,6 +386,7 @@ def delete_project(current_user, project_id):
     db.session.add(log)
     
     db.session.delete(project)
+    delta_sync.record_deletes(Project.__tablename__, [project_id])
     db.session.commit()
     
     return jsonify({
@@ -2,9 +2,11 @@
 GBMS - Users Routes
 글로벌사업처 해외사업관리시스템 - 사용자관리 API
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from models import db, User, ActivityLog
-from routes.auth import token_required, admin_required
+from routes.auth import token_required, admin_required, hasher_busy
+from services import password_hasher, token_revocation, user_directory
+from services.password_hasher import HasherBusy
 
 users_bp = Blueprint('users', __name__)
 
@@ -16,31 +18,26 @@ def get_users(current_user):
     department = request.args.get('department')
     is_active = request.args.get('is_active', type=bool)
     
-    query = User.query
-    
-    if department:
-        query = query.filter(User.department == department)
-    
-    if is_active is not None:
-        query = query.filter(User.is_active == is_active)
-    
-    users = query.order_by(User.name).all()
-    
-    return jsonify({
+    # Served from the in-memory directory; the ETag changes whenever any user does
+    response = jsonify({
         'success': True,
-        'data': [u.to_dict() for u in users]
+        'data': user_directory.users(department, is_active)
     })
+    response.set_etag(user_directory.version())
+    return response.make_conditional(request)
 
 
 @users_bp.route('/<int:user_id>', methods=['GET'])
 @token_required
 def get_user(current_user, user_id):
     """Get single user by ID"""
-    user = User.query.get_or_404(user_id)
+    user = user_directory.get(user_id)
+    if user is None:
+        abort(404)
     
     return jsonify({
         'success': True,
-        'data': user.to_dict()
+        'data': user
     })
 
 
@@ -69,7 +66,10 @@ def create_user(current_user):
         position=data.get('position'),
         is_active=data.get('isActive', True)
     )
-    user.set_password(data['password'])
+    try:
+        password_hasher.set_password(user, data['password'])
+    except HasherBusy:
+        return hasher_busy()
     
     db.session.add(user)
     db.session.commit()
@@ -87,6 +87,7 @@ def update_user(current_user, user_id):
     """Update user (admin only)"""
     user = User.query.get_or_404(user_id)
     data = request.get_json()
+    claims_before = (user.role, user.department, user.is_active)
     
     if 'name' in data:
         user.name = data['name']
@@ -103,6 +104,10 @@ def update_user(current_user, user_id):
     if 'isActive' in data:
         user.is_active = data['isActive']
     
+    if (user.role, user.department, user.is_active) != claims_before:
+        # 토큰에 담긴 권한 정보가 바뀌었으므로 기존 토큰을 폐기
+        token_revocation.revoke_user(user.id)
+    
     db.session.commit()
     
     return jsonify({
@@ -122,7 +127,11 @@ def reset_password(current_user, user_id):
     if not data.get('newPassword'):
         return jsonify({'success': False, 'message': '새 비밀번호를 입력해주세요.'}), 400
     
-    user.set_password(data['newPassword'])
+    try:
+        password_hasher.set_password(user, data['newPassword'])
+    except HasherBusy:
+        return hasher_busy()
+    token_revocation.revoke_user(user.id)
     db.session.commit()
     
     return jsonify({
@@ -140,6 +149,7 @@ def delete_user(current_user, user_id):
     if user.id == current_user.id:
         return jsonify({'success': False, 'message': '자기 자신은 삭제할 수 없습니다.'}), 400
     
+    token_revocation.revoke_user(user.id)
     db.session.delete(user)
     db.session.commit()
     
@@ -0,0 +1,71 @@
+"""
+GBMS - Backfill Consulting Project Periods
+해외기술용역 착수일/준공일 문자열('72-10)을 DATE 컬럼(start_on/end_on)으로 채우기
+
+새로 저장되는 프로젝트는 모델 이벤트에서 자동으로 채워지므로, 컬럼 추가 이전에
+만들어진 데이터베이스에서 한 번 실행하면 됩니다.
+
+Run with: python scripts/backfill_consulting_periods.py [--all]
+"""
+import os
+import sys
+import argparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from models import db, ConsultingProject
+from services.periods import parse_period_point
+
+BATCH_SIZE = 1000
+
+
+def backfill_consulting_periods(recompute_all=False):
+    """start_on/end_on 이 비어 있는 행(또는 전체)을 다시 계산하여 일괄 UPDATE
+
+    Returns (updated, unparsed)
+    """
+    query = db.select(
+        ConsultingProject.id, ConsultingProject.start_date, ConsultingProject.end_date
+    )
+    if not recompute_all:
+        query = query.where(db.or_(
+            db.and_(ConsultingProject.start_on.is_(None), ConsultingProject.start_date.isnot(None)),
+            db.and_(ConsultingProject.end_on.is_(None), ConsultingProject.end_date.isnot(None))
+        ))
+
+    updates = []
+    unparsed = 0
+    for project_id, start_date, end_date in db.session.execute(query):
+        start_on = parse_period_point(start_date)
+        end_on = parse_period_point(end_date, end=True)
+        if (start_date and not start_on) or (end_date and not end_on):
+            unparsed += 1
+        updates.append({'id': project_id, 'start_on': start_on, 'end_on': end_on})
+
+    for start in range(0, len(updates), BATCH_SIZE):
+        db.session.execute(db.update(ConsultingProject), updates[start:start + BATCH_SIZE])
+    db.session.commit()
+
+    return len(updates), unparsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='해외기술용역 사업기간 DATE 컬럼 채우기')
+    parser.add_argument('--all', action='store_true', help='이미 채워진 행도 다시 계산')
+    args = parser.parse_args()
+
+    with app.app_context():
+        updated, unparsed = backfill_consulting_periods(recompute_all=args.all)
+        print(f"✓ 갱신: {updated}개")
+        if unparsed:
+            print(f"⚠ 해석할 수 없는 날짜 형식: {unparsed}개")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("해외기술용역 사업기간 정규화")
+    print("=" * 60)
+    main()
+    print("=" * 60)
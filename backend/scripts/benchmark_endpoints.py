@@ -0,0 +1,331 @@
+"""
+GBMS - Endpoint Benchmark
+주요 API 엔드포인트 부하 측정 (지연시간 백분위수, 처리량, 쿼리 수, 메모리)
+
+가상 데이터(scripts/generate_sample_data.py)로 만든 벤치마크 전용 데이터베이스에
+앱을 띄우고, 로컬 스레드 풀로 엔드포인트별 동시 요청을 보낸 뒤 결과를 JSON 으로
+저장합니다. --compare 로 이전 결과와 비교할 수 있습니다.
+
+Run with:
+    python scripts/benchmark_endpoints.py [--projects N] [--consulting N] [--executions N]
+        [--db PATH] [--reuse] [--concurrency N] [--requests N] [--only NAME ...]
+        [--output PATH] [--compare PATH]
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import re
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+import statistics
+import urllib.request
+import urllib.error
+from io import BytesIO
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, 'database', 'benchmarks')
+
+# Add parent directory to path
+sys.path.insert(0, BACKEND_DIR)
+
+# (이름, 메서드, 경로, 요청 수 배율) - 무거운 엔드포인트는 요청 수를 줄임
+ENDPOINTS = [
+    ('gis_projects', 'GET', '/api/gis/projects', 0.25),
+    ('gis_stats', 'GET', '/api/gis/stats', 1),
+    ('dashboard_overview', 'GET', '/api/dashboard/overview', 1),
+    ('consulting_list', 'GET', '/api/consulting?page=1&per_page=20', 1),
+    ('consulting_search', 'GET', '/api/consulting?search=%EA%B4%80%EA%B0%9C&per_page=20', 1),
+    ('consulting_export', 'GET', '/api/consulting/export?year=2020', 0.1),
+    ('consulting_upload', 'POST', '/api/consulting/upload', 0.1),
+    ('projects_list', 'GET', '/api/projects?page=1&per_page=20', 1),
+    ('budget_stats', 'GET', '/api/budgets/stats', 1),
+]
+
+UPLOAD_ROWS = 50
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def percentile(values, pct):
+    """선형 보간 백분위수 (values 는 정렬된 리스트)"""
+    if not values:
+        return None
+    k = (len(values) - 1) * pct / 100
+    low = int(k)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (k - low)
+
+
+def current_rss_kb():
+    """현재 프로세스 RSS (KB)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class RssSampler:
+    """측정 구간 동안 RSS 최대값을 주기적으로 기록"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss_kb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = current_rss_kb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_kb())
+
+
+def parse_server_timing(header):
+    """Server-Timing 헤더(services/sql_profiler) -> (쿼리 수, DB 시간 ms)"""
+    match = SERVER_TIMING_DB.search(header or '')
+    if not match:
+        return None, None
+    return int(match.group(2)), float(match.group(1))
+
+
+def upload_workbook():
+    """중복 검사에 걸리지 않도록 매번 다른 사업명으로 업로드용 Excel 생성"""
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['번호', '수주년도', '진행여부', '국가별', 'X', 'Y', '영문사업명', '국문사업명',
+               '사업형태', '착수일', '준공일', '용역비(공사)(백만원)', '발주처'])
+    tag = uuid.uuid4().hex[:8]
+    for i in range(UPLOAD_ROWS):
+        ws.append([i + 1, 2024, '진행중', '베트남', 107.8, 16.0, f'Bench {tag} {i}',
+                   f'벤치마크 {tag} {i}', '기술자문', "'24-01", "'25-12", 120.5, 'KOICA'])
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def multipart_body(filename, content):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        'Content-Type: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet\r\n\r\n'
+    ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def send(base_url, method, path, token):
+    """요청 1건 -> (경과 시간 ms, 상태 코드, 응답 바이트 수, 쿼리 수, DB 시간 ms)"""
+    headers = {'Authorization': f'Bearer {token}'}
+    data = None
+    if method == 'POST':
+        data, headers['Content-Type'] = multipart_body('bench.xlsx', upload_workbook())
+
+    req = urllib.request.Request(base_url + path, data=data, headers=headers, method=method)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=300) as resp:
+            body = resp.read()
+            status, response_headers = resp.status, resp.headers
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        status, response_headers = e.code, e.headers
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return (elapsed_ms, status, len(body)) + parse_server_timing(response_headers.get('Server-Timing'))
+
+
+def run_endpoint(base_url, token, endpoint, requests, concurrency, warmup):
+    name, method, path, _ = endpoint
+    for _ in range(warmup):
+        send(base_url, method, path, token)
+
+    with RssSampler() as rss, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(lambda _: send(base_url, method, path, token), range(requests)))
+        wall = time.perf_counter() - started
+
+    latencies = sorted(r[0] for r in results)
+    errors = sum(1 for r in results if r[1] >= 400)
+    queries = [r[3] for r in results if r[3] is not None]
+    db_times = sorted(r[4] for r in results if r[4] is not None)
+    return {
+        'method': method,
+        'path': path,
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(statistics.fmean(latencies), 2),
+        'max_ms': round(latencies[-1], 2),
+        'throughput_rps': round(requests / wall, 2),
+        'queries_per_request': round(statistics.fmean(queries), 2) if queries else None,
+        'db_p50_ms': round(percentile(db_times, 50), 2) if db_times else None,
+        'db_p95_ms': round(percentile(db_times, 95), 2) if db_times else None,
+        'response_bytes': results[-1][2],
+        'peak_rss_kb': rss.peak,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    header = (f"{'endpoint':<20}{'p50':>9}{'p95':>9}{'p99':>9}{'db p95':>9}{'rps':>9}"
+              f"{'q/req':>8}{'rss MB':>8}{'err':>5}")
+    if baseline:
+        header += f"{'Δp95':>9}"
+    print(header)
+    print('-' * len(header))
+    for name, r in results.items():
+        line = (f"{name:<20}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+                f"{r['db_p95_ms'] or 0:>9.1f}{r['throughput_rps']:>9.1f}{r['queries_per_request'] or 0:>8.1f}"
+                f"{r['peak_rss_kb'] / 1024:>8.0f}{r['errors']:>5}")
+        previous = (baseline or {}).get(name)
+        if previous:
+            change = (r['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100 if previous['p95_ms'] else 0
+            line += f"{change:>+8.0f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='주요 API 엔드포인트 벤치마크')
+    parser.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'gbms_bench.db'),
+                        help='벤치마크용 SQLite 파일 (운영 DB 를 지정하지 마세요)')
+    parser.add_argument('--reuse', action='store_true', help='기존 벤치마크 DB 를 그대로 사용')
+    parser.add_argument('--projects', type=int, default=10000)
+    parser.add_argument('--consulting', type=int, default=5000)
+    parser.add_argument('--executions', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수')
+    parser.add_argument('--requests', type=int, default=200, help='엔드포인트별 요청 수 (무거운 엔드포인트는 축소)')
+    parser.add_argument('--warmup', type=int, default=3, help='측정 전 예열 요청 수')
+    parser.add_argument('--only', nargs='*', help='측정할 엔드포인트 이름')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: database/benchmarks/<시각>-<커밋>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    db_path = os.path.abspath(args.db)
+    if not args.reuse and os.path.exists(db_path):
+        os.remove(db_path)
+
+    # app import 전에 설정해야 config 에 반영됨
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ.setdefault('FLASK_ENV', 'production')
+    # 모든 요청에 Server-Timing 헤더(쿼리 수, DB 시간)를 붙이도록 샘플링 100%
+    os.environ['SQL_PROFILE_SAMPLE_RATE'] = '1'
+
+    from werkzeug.serving import make_server
+    from app import app
+    from models import db, User
+    from scripts.generate_sample_data import generate
+
+    app.config['UPLOAD_FOLDER'] = os.path.join(tempfile.gettempdir(), 'gbms_bench_uploads')
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+    with app.app_context():
+        if not User.query.filter_by(user_id='admin').first():
+            admin = User(user_id='admin', name='관리자', department='gad', role='admin')
+            admin.set_password('admin123')
+            db.session.add(admin)
+            db.session.commit()
+
+        if not args.reuse:
+            print(f"📦 가상 데이터 생성: 사업 {args.projects}, 해외기술용역 {args.consulting}, "
+                  f"집행내역 {args.executions}")
+            generate(projects=args.projects, consulting=args.consulting, executions=args.executions,
+                     seed=args.seed, progress=lambda message: None)
+        dataset = {
+            name: db.session.execute(db.text(f'SELECT COUNT(*) FROM {table}')).scalar()
+            for name, table in [('projects', 'projects'), ('consulting', 'consulting_projects'),
+                                ('executions', 'budget_executions')]
+        }
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # 요청별 접근 로그 생략
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    login = urllib.request.Request(
+        base_url + '/api/auth/login',
+        data=json.dumps({'userId': 'admin', 'password': 'admin123'}).encode(),
+        headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    with urllib.request.urlopen(login) as resp:
+        token = json.loads(resp.read())['token']
+
+    results = {}
+    for endpoint in ENDPOINTS:
+        if args.only and endpoint[0] not in args.only:
+            continue
+        requests = max(args.concurrency, int(args.requests * endpoint[3]))
+        print(f"⏳ {endpoint[0]} ({requests}회, 동시 {args.concurrency})")
+        results[endpoint[0]] = run_endpoint(base_url, token, endpoint, requests,
+                                            args.concurrency, args.warmup)
+
+    server.shutdown()
+
+    revision = git_revision()
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': revision,
+            'python': sys.version.split()[0],
+            'dataset': dataset,
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+        },
+        'endpoints': results,
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{revision or 'unknown'}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['endpoints']
+
+    print()
+    print_results(results, baseline)
+    print(f"\n💾 결과 저장: {output}")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("GBMS 엔드포인트 벤치마크")
+    print("=" * 60)
+    main()
+    print("=" * 60)
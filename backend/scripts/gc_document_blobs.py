@@ -0,0 +1,63 @@
+"""
+GBMS - Document Blob Garbage Collection
+참조되지 않는 문서 파일(blob) 정리
+
+Run with: python scripts/gc_document_blobs.py [--dry-run] [--grace SECONDS] [--adopt-legacy]
+"""
+import os
+import sys
+import argparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from models import Document
+from services import blob_store
+
+
+def adopt_legacy_documents():
+    """기존 방식(uploads/<project_id>/<timestamp>_<filename>)으로 저장된 파일을 blob 저장소로 이전"""
+    adopted = 0
+    missing = 0
+
+    legacy_docs = Document.query.filter(Document.content_hash.is_(None)).all()
+    for document in legacy_docs:
+        if not os.path.exists(document.file_path):
+            print(f"  ⚠ 파일 없음: {document.file_path} (문서 {document.id})")
+            missing += 1
+            continue
+
+        blob_store.adopt_file(document)
+        adopted += 1
+
+    print(f"✓ 기존 파일 이전: {adopted}개 (파일 없음: {missing}개)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='참조되지 않는 문서 blob 정리')
+    parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상만 출력')
+    parser.add_argument('--grace', type=int, default=None,
+                        help='이 시간(초) 이내에 수정된 파일은 유지 (기본: BLOB_GC_GRACE_SECONDS)')
+    parser.add_argument('--adopt-legacy', action='store_true',
+                        help='content_hash가 없는 기존 문서 파일을 blob 저장소로 이전')
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.adopt_legacy and not args.dry_run:
+            adopt_legacy_documents()
+
+        stats = blob_store.collect_garbage(grace_seconds=args.grace, dry_run=args.dry_run)
+
+        label = '삭제 대상' if args.dry_run else '삭제'
+        print(f"📂 검사한 파일: {stats['scanned']}개")
+        print(f"🗑️  {label}: {stats['removed']}개 ({stats['freed_bytes'] / 1024 / 1024:.1f}MB)")
+        print(f"⏳ 최근 파일 유지: {stats['kept_recent']}개")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("문서 blob 정리")
+    print("=" * 60)
+    main()
+    print("=" * 60)
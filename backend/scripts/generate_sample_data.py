@@ -0,0 +1,351 @@
+"""
+GBMS - Synthetic Sample Data Generator
+부하 테스트용 대량 샘플 데이터 생성
+
+국가/좌표/연도/예산 분포를 실제 사업 데이터와 비슷하게 맞춘 가상 데이터를
+batch 단위 bulk INSERT 로 생성합니다. 기존 데이터에 추가되므로 벤치마크용
+데이터베이스를 따로 지정해서 실행하세요.
+
+Run with:
+    DATABASE_URL=sqlite:////tmp/bench.db python scripts/generate_sample_data.py \\
+        --projects 100000 --consulting 50000 --executions 1000000
+"""
+import os
+import sys
+import math
+import time
+import random
+import argparse
+from datetime import date, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The development config echoes and profiles every SQL statement, which would
+# print millions of INSERTs; the engine is created when app is imported.
+os.environ.setdefault('FLASK_ENV', 'production')
+
+from werkzeug.security import generate_password_hash
+from app import app
+from models import db, User, Project, Budget, BudgetExecution, ConsultingProject
+from services.periods import parse_period_point
+
+DEFAULT_BATCH_SIZE = 5000
+
+# (국가, 국가코드, 지역, 위도, 경도, 좌표 분산(도), 가중치)
+# 가중치는 KRC 해외사업 실적의 국가별 비중을 대략적으로 반영
+COUNTRIES = [
+    ('캄보디아', 'KH', '아시아', 12.5, 104.9, 1.5, 9),
+    ('베트남', 'VN', '아시아', 16.0, 107.8, 3.0, 9),
+    ('필리핀', 'PH', '아시아', 12.9, 121.8, 2.5, 8),
+    ('인도네시아', 'ID', '아시아', -2.5, 115.0, 4.0, 8),
+    ('라오스', 'LA', '아시아', 18.2, 103.9, 1.8, 6),
+    ('미얀마', 'MM', '아시아', 20.0, 96.0, 2.5, 5),
+    ('몽골', 'MN', '아시아', 47.5, 104.0, 3.5, 4),
+    ('네팔', 'NP', '아시아', 28.2, 84.1, 1.2, 3),
+    ('방글라데시', 'BD', '아시아', 23.7, 90.4, 1.0, 3),
+    ('스리랑카', 'LK', '아시아', 7.9, 80.8, 0.8, 3),
+    ('우즈베키스탄', 'UZ', '중앙아시아', 41.4, 64.6, 2.5, 5),
+    ('키르기스스탄', 'KG', '중앙아시아', 41.2, 74.8, 1.5, 2),
+    ('카자흐스탄', 'KZ', '중앙아시아', 48.0, 67.0, 5.0, 2),
+    ('탄자니아', 'TZ', '아프리카', -6.4, 34.9, 3.0, 4),
+    ('에티오피아', 'ET', '아프리카', 9.1, 40.5, 3.0, 4),
+    ('케냐', 'KE', '아프리카', 0.0, 37.9, 2.5, 3),
+    ('우간다', 'UG', '아프리카', 1.4, 32.3, 1.5, 3),
+    ('가나', 'GH', '아프리카', 7.9, -1.0, 1.5, 2),
+    ('세네갈', 'SN', '아프리카', 14.5, -14.5, 1.5, 2),
+    ('르완다', 'RW', '아프리카', -1.9, 29.9, 0.5, 2),
+    ('이집트', 'EG', '중동', 26.8, 30.8, 2.5, 2),
+    ('이라크', 'IQ', '중동', 33.2, 43.7, 2.0, 1),
+    ('파라과이', 'PY', '중남미', -23.4, -58.4, 2.0, 2),
+    ('페루', 'PE', '중남미', -9.2, -75.0, 3.5, 2),
+    ('볼리비아', 'BO', '중남미', -16.3, -63.6, 3.0, 2),
+    ('에콰도르', 'EC', '중남미', -1.8, -78.2, 1.5, 1),
+    ('우크라이나', 'UA', '유럽', 48.4, 31.2, 3.0, 1),
+]
+
+# (사업유형, 담당부서, 가중치)
+PROJECT_TYPES = [
+    ('consulting', 'gb', 40),
+    ('oda_bilateral', 'aidc', 30),
+    ('oda_multilateral', 'aidc', 12),
+    ('k_rice_belt', 'aidc', 10),
+    ('investment', 'gb', 8),
+]
+
+BUDGET_CATEGORIES = ['personnel', 'travel', 'equipment', 'operating', 'subcontract']
+BUDGET_SHARES = [0.35, 0.10, 0.20, 0.15, 0.20]
+
+CLIENTS = ['KOICA', '농림축산식품부', 'ADB', 'World Bank', 'FAO', 'AfDB', 'IFAD',
+           '한국농어촌공사', '현지 정부', 'EDCF', 'IDB', 'JICA']
+CONSULTING_TYPES = ['타당성조사', '기본설계', '실시설계', '시공감리', '기술자문', '마스터플랜']
+WORK_TITLES = ['관개시설 현대화', '농업용수 관리', '농촌종합개발', '배수개선', '저수지 개보수',
+               '스마트팜 시범단지', '벼 생산성 향상', '농촌도로 정비', '수리시설 복구', '농산물 유통센터']
+WORK_TITLES_EN = ['Irrigation Modernization', 'Agricultural Water Management',
+                  'Integrated Rural Development', 'Drainage Improvement', 'Reservoir Rehabilitation',
+                  'Smart Farm Pilot', 'Rice Productivity Enhancement', 'Rural Road Improvement',
+                  'Irrigation Facility Restoration', 'Agricultural Distribution Center']
+
+
+class Generator:
+    """시드 고정 난수로 행(dict)을 만드는 생성기"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.country_weights = [c[6] for c in COUNTRIES]
+        self.type_weights = [t[2] for t in PROJECT_TYPES]
+        self.today = date.today()
+
+    def country(self):
+        return self.rng.choices(COUNTRIES, weights=self.country_weights)[0]
+
+    def coordinates(self, country):
+        """국가 중심점 주변 정규분포 (소수점 7자리)"""
+        _, _, _, lat, lng, spread, _ = country
+        return (
+            round(max(-89.9, min(89.9, self.rng.gauss(lat, spread / 2))), 7),
+            round(max(-179.9, min(179.9, self.rng.gauss(lng, spread / 2))), 7),
+        )
+
+    def year(self, low, high):
+        """최근 연도로 갈수록 사업 수가 많아지는 분포"""
+        return int(low + (high - low) * math.sqrt(self.rng.random()))
+
+    def amount(self, median, sigma=1.0):
+        """사업비는 로그정규분포 (소수의 대형 사업)"""
+        return round(self.rng.lognormvariate(math.log(median), sigma), -3)
+
+    def title(self, country):
+        index = self.rng.randrange(len(WORK_TITLES))
+        return f'{country[0]} {WORK_TITLES[index]} 사업', f'{WORK_TITLES_EN[index]} Project'
+
+    def project(self, project_id, user_ids):
+        country = self.country()
+        project_type, department, _ = self.rng.choices(PROJECT_TYPES, weights=self.type_weights)[0]
+        lat, lng = self.coordinates(country)
+        title, title_en = self.title(country)
+
+        start = date(self.year(2000, self.today.year + 1), self.rng.randint(1, 12), 1)
+        months = self.rng.choice([6, 12, 18, 24, 36, 48, 60])
+        end = start + timedelta(days=months * 30)
+        if start > self.today:
+            status, progress = 'planning', 0
+        elif end < self.today:
+            status, progress = 'completed', 100
+        else:
+            status = 'in_progress'
+            progress = min(99, int((self.today - start).days / max(1, (end - start).days) * 100))
+
+        return {
+            'id': project_id,
+            'code': f'SYN-{project_id:08d}',
+            'title': title,
+            'title_en': title_en,
+            'project_type': project_type,
+            'country': country[0],
+            'country_code': country[1],
+            'region': country[2],
+            'latitude': lat,
+            'longitude': lng,
+            'department': department,
+            'manager_id': self.rng.choice(user_ids),
+            'description': f'{country[0]} {project_type} 가상 사업',
+            'start_date': start,
+            'end_date': end,
+            'duration_months': months,
+            'budget_total': self.amount(1_500_000_000),
+            'currency': 'KRW',
+            'status': status,
+            'progress': progress,
+            'client': self.rng.choice(CLIENTS),
+            'created_by': self.rng.choice(user_ids),
+        }
+
+    def budgets(self, project, next_id):
+        """사업기간의 연도별 x 비목별 예산"""
+        rows = []
+        years = list(range(project['start_date'].year, project['end_date'].year + 1))
+        yearly = float(project['budget_total']) / len(years)
+        for year in years:
+            for category, share in zip(BUDGET_CATEGORIES, BUDGET_SHARES):
+                planned = round(yearly * share, -3)
+                if project['status'] == 'planning' or year > self.today.year:
+                    executed = 0
+                else:
+                    executed = round(planned * self.rng.uniform(0.4, 1.0), -3)
+                rows.append({
+                    'id': next_id,
+                    'project_id': project['id'],
+                    'year': year,
+                    'category': category,
+                    'amount_planned': planned,
+                    'amount_executed': executed,
+                    'amount_remaining': planned - executed,
+                })
+                next_id += 1
+        return rows
+
+    def execution(self, budget, user_ids):
+        day = date(budget['year'], 1, 1) + timedelta(days=self.rng.randrange(365))
+        return {
+            'budget_id': budget['id'],
+            'execution_date': min(day, self.today),
+            'amount': self.amount(5_000_000, sigma=1.2),
+            'description': f"{budget['category']} 집행",
+            'voucher_no': f"V{budget['year']}-{self.rng.randrange(10**7):07d}",
+            'created_by': self.rng.choice(user_ids),
+        }
+
+    def consulting(self, user_ids):
+        country = self.country()
+        lat, lng = self.coordinates(country)
+        title, title_en = self.title(country)
+        contract_year = self.year(1972, self.today.year + 1)
+        start = (contract_year % 100, self.rng.randint(1, 12))
+        end_year = min(contract_year + self.rng.choice([0, 1, 1, 2, 3, 4]), 2099)
+        end = (end_year % 100, self.rng.randint(1, 12))
+        start_date = f"'{start[0]:02d}-{start[1]:02d}"
+        end_date = f"'{end[0]:02d}-{end[1]:02d}"
+
+        return {
+            'contract_year': contract_year,
+            'status': '진행중' if end_year >= self.today.year else '준공',
+            'country': country[0],
+            'latitude': lat,
+            'longitude': lng,
+            'title_en': title_en,
+            'title_kr': title,
+            'project_type': self.rng.choice(CONSULTING_TYPES),
+            'start_date': start_date,
+            'end_date': end_date,
+            # bulk INSERT 는 모델 이벤트를 거치지 않으므로 정규화 컬럼을 직접 채움
+            'start_on': parse_period_point(start_date),
+            'end_on': parse_period_point(end_date, end=True),
+            'budget': round(self.rng.lognormvariate(math.log(800), 1.1), 2),
+            'client': self.rng.choice(CLIENTS),
+            'created_by': self.rng.choice(user_ids),
+        }
+
+
+def next_id(model):
+    return (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+
+
+def bulk_insert(model, rows, batch_size):
+    """ORM bulk INSERT (executemany) 후 batch 단위 커밋"""
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(db.insert(model), rows[start:start + batch_size])
+        db.session.commit()
+
+
+def generate_users(count):
+    """담당자/작성자로 쓸 가상 사용자 (비밀번호 해시는 한 번만 계산)"""
+    password_hash = generate_password_hash('user123')
+    start = next_id(User)
+    departments = ['gb', 'aidc', 'gad']
+    rows = [{
+        'id': start + i,
+        'user_id': f'syn{start + i:06d}',
+        'name': f'가상사용자{start + i}',
+        'email': f'syn{start + i:06d}@krc.co.kr',
+        'department': departments[i % len(departments)],
+        'role': 'user',
+        'position': '주임',
+        'password_hash': password_hash,
+        'is_active': True,
+    } for i in range(count)]
+    bulk_insert(User, rows, DEFAULT_BATCH_SIZE)
+    return [row['id'] for row in rows]
+
+
+def generate(projects=0, consulting=0, executions=0, users=50, seed=42,
+             batch_size=DEFAULT_BATCH_SIZE, progress=print):
+    """가상 데이터 생성 (app context 안에서 호출). Returns 테이블별 생성 건수"""
+    gen = Generator(seed)
+    counts = {'users': 0, 'projects': 0, 'budgets': 0, 'executions': 0, 'consulting': 0}
+
+    user_ids = generate_users(users) if users else []
+    user_ids = user_ids or [uid for (uid,) in db.session.query(User.id).limit(100)] or [None]
+    counts['users'] = users
+
+    budgets = []
+    project_id = next_id(Project)
+    budget_id = next_id(Budget)
+    for start in range(0, projects, batch_size):
+        project_rows = [gen.project(project_id + i, user_ids)
+                        for i in range(start, min(start + batch_size, projects))]
+        budget_rows = []
+        for row in project_rows:
+            rows = gen.budgets(row, budget_id)
+            budget_id += len(rows)
+            budget_rows.extend(rows)
+
+        db.session.execute(db.insert(Project), project_rows)
+        bulk_insert(Budget, budget_rows, batch_size)
+        counts['projects'] += len(project_rows)
+        counts['budgets'] += len(budget_rows)
+        # 집행내역 대상: 집행이 있는 예산만 (id/연도/비목만 보관)
+        budgets.extend({'id': b['id'], 'year': b['year'], 'category': b['category']}
+                       for b in budget_rows if b['amount_executed'])
+        progress(f"  ⏳ 사업 {counts['projects']}/{projects}")
+
+    if executions:
+        if not budgets:
+            budgets = [{'id': b.id, 'year': b.year, 'category': b.category}
+                       for b in Budget.query.filter(Budget.amount_executed > 0).limit(100000)]
+        if not budgets:
+            progress("  ⚠ 집행 대상 예산이 없어 집행내역을 건너뜁니다.")
+        else:
+            for start in range(0, executions, batch_size):
+                count = min(batch_size, executions - start)
+                rows = [gen.execution(gen.rng.choice(budgets), user_ids) for _ in range(count)]
+                bulk_insert(BudgetExecution, rows, batch_size)
+                counts['executions'] += count
+                progress(f"  ⏳ 집행내역 {counts['executions']}/{executions}")
+
+    for start in range(0, consulting, batch_size):
+        count = min(batch_size, consulting - start)
+        rows = [gen.consulting(user_ids) for _ in range(count)]
+        bulk_insert(ConsultingProject, rows, batch_size)
+        counts['consulting'] += count
+        progress(f"  ⏳ 해외기술용역 {counts['consulting']}/{consulting}")
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부하 테스트용 가상 데이터 생성')
+    parser.add_argument('--projects', type=int, default=1000, help='사업(projects) 수')
+    parser.add_argument('--consulting', type=int, default=1000, help='해외기술용역 프로젝트 수')
+    parser.add_argument('--executions', type=int, default=10000, help='예산 집행내역 수')
+    parser.add_argument('--users', type=int, default=50, help='가상 사용자 수')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드 (같은 시드 = 같은 데이터)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='INSERT batch 크기')
+    args = parser.parse_args()
+
+    with app.app_context():
+        print(f"📂 데이터베이스: {app.config['SQLALCHEMY_DATABASE_URI']}")
+        started = time.perf_counter()
+        counts = generate(
+            projects=args.projects,
+            consulting=args.consulting,
+            executions=args.executions,
+            users=args.users,
+            seed=args.seed,
+            batch_size=args.batch_size,
+        )
+        elapsed = time.perf_counter() - started
+
+        print(f"✓ 사용자: {counts['users']}명")
+        print(f"✓ 사업: {counts['projects']}개 (예산 {counts['budgets']}건)")
+        print(f"✓ 집행내역: {counts['executions']}건")
+        print(f"✓ 해외기술용역: {counts['consulting']}개")
+        print(f"⏱  {elapsed:.1f}초")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("부하 테스트용 가상 데이터 생성")
+    print("=" * 60)
+    main()
+    print("=" * 60)
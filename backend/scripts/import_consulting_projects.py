@@ -2,10 +2,20 @@
 GBMS - Import Consulting Projects from Excel
 해외기술용역 프로젝트 데이터를 Excel에서 가져오기
 
-Run with: python scripts/import_consulting_projects.py
+읽은 시트는 워크북 해시를 키로 Parquet(pyarrow가 없으면 pickle) 캐시에 저장하여
+같은 파일을 다시 읽지 않고, 변환은 컬럼 단위로 처리합니다. 데이터는 먼저
+shadow 테이블에 적재한 뒤 하나의 트랜잭션으로 라이브 테이블에 반영하므로, 긴
+임포트 중에도 기존 테이블이 비어 보이지 않습니다. 반영은 자연키(번호, 국문사업명,
+국가)로 UPSERT하여 기존 행의 id를 유지하고, 워크북에서 사라진 행만 삭제하며
+삭제 기록(tombstone)을 남깁니다.
+
+Run with: python scripts/import_consulting_projects.py [--yes] [--no-cache]
 """
 import os
 import sys
+import argparse
+import hashlib
+from datetime import datetime
 from pathlib import Path
 
 # Add parent directory to path
@@ -13,10 +23,177 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
 from app import app
-from models import db, ConsultingProject
+from models import db, ConsultingProject, Tombstone
+from services.periods import parse_period_point
+
+SHEET_NAME = "해외기술컨설팅('72-'25)"
+CACHE_DIR = Path(__file__).parent.parent / 'database' / 'import_cache'
+SHADOW_TABLE = 'consulting_projects_shadow'
+BATCH_SIZE = 1000
+
+COLUMNS = [
+    'number', 'contract_year', 'status', 'country', 'longitude', 'latitude',
+    'title_en', 'title_kr', 'project_type', 'start_date', 'end_date', 'budget', 'client',
+    'start_on', 'end_on'
+]
+# 워크북 행과 라이브 행을 대응시키는 자연키
+KEY_COLUMNS = ['number', 'title_kr', 'country']
+
+
+def workbook_hash(path):
+    """워크북 파일의 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_workbook(path):
+    """시트 읽기: calamine 엔진(설치된 경우) 우선, 없으면 openpyxl"""
+    try:
+        return pd.read_excel(path, sheet_name=SHEET_NAME, engine='calamine')
+    except (ImportError, ValueError):
+        return pd.read_excel(path, sheet_name=SHEET_NAME)
+
+
+def load_sheet(path, use_cache=True):
+    """워크북 해시로 캐시된 DataFrame을 사용하고, 없으면 읽어서 캐시"""
+    key = workbook_hash(path)
+    try:
+        import pyarrow  # noqa: F401
+        cache_file = CACHE_DIR / f'{key}.parquet'
+        read_cache, write_cache = pd.read_parquet, pd.DataFrame.to_parquet
+    except ImportError:
+        cache_file = CACHE_DIR / f'{key}.pkl'
+        read_cache, write_cache = pd.read_pickle, pd.DataFrame.to_pickle
+
+    if use_cache and cache_file.exists():
+        print(f"⚡ 캐시 사용: {cache_file.name}")
+        return read_cache(cache_file)
+
+    df = read_workbook(path)
+
+    if use_cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # 혼합 타입 컬럼은 문자열로 통일해야 Parquet에 저장 가능
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].map(lambda v: v if pd.isna(v) else str(v))
+        write_cache(df, cache_file)
+
+    return df
+
+
+def _text(series, strip=True):
+    """NaN은 유지하고 나머지는 문자열로 변환"""
+    values = series.astype(object).where(series.isna(), series.astype(str))
+    return values.str.strip() if strip else values
+
+
+def _period(series, end=False):
+    """'72-10 형식 문자열 -> ISO 날짜 문자열 (파싱 결과는 periods 모듈에서 캐시)"""
+    def convert(value):
+        parsed = parse_period_point(value, end=end) if isinstance(value, str) else None
+        return parsed.isoformat() if parsed else None
+    return series.map(convert)
+
+
+def transform(df):
+    """Excel 컬럼 -> consulting_projects 컬럼 (행 단위 반복 없이 컬럼 단위 변환)
+
+    Returns (records DataFrame, skipped row numbers, duplicate-key row numbers)
+    """
+    required = df['국문사업명'].notna() & df['국가별'].notna()
+    skipped_rows = [idx + 2 for idx in df.index[~required]]
+    df = df[required]
+
+    out = pd.DataFrame({
+        'number': pd.to_numeric(df['번호'], errors='coerce').astype('Int64'),
+        'contract_year': pd.to_numeric(df['수주년도'], errors='coerce').astype('Int64'),
+        'status': df['진행여부'].fillna('준공'),
+        'country': _text(df['국가별']),
+        'longitude': pd.to_numeric(df['X'], errors='coerce'),
+        'latitude': pd.to_numeric(df['Y'], errors='coerce'),
+        'title_en': _text(df['영문사업명'], strip=False),
+        'title_kr': _text(df['국문사업명']),
+        'project_type': _text(df['사업형태'], strip=False),
+        'start_date': _text(df['착수일'], strip=False),
+        'end_date': _text(df['준공일'], strip=False),
+        'budget': pd.to_numeric(df['용역비(공사)(백만원)'], errors='coerce'),
+        'client': _text(df['발주처'], strip=False),
+    }, columns=COLUMNS)
+    out['start_on'] = _period(out['start_date'])
+    out['end_on'] = _period(out['end_date'], end=True)
+
+    # 자연키가 같은 행은 마지막 행만 사용
+    duplicated = out.duplicated(KEY_COLUMNS, keep='last')
+    duplicate_rows = [idx + 2 for idx in out.index[duplicated]]
+    out = out[~duplicated]
+
+    # NaN/NA -> None (SQL NULL)
+    out = out.astype(object).where(out.notna(), None)
+    return out, skipped_rows, duplicate_rows
+
 
+def load_shadow(conn, records):
+    """shadow 테이블을 만들고 batch 단위로 적재"""
+    now = datetime.utcnow().isoformat(sep=' ')
+    columns = COLUMNS + ['created_at', 'updated_at']
 
-def import_consulting_projects():
+    conn.exec_driver_sql(f'DROP TABLE IF EXISTS {SHADOW_TABLE}')
+    conn.exec_driver_sql(f'CREATE TABLE {SHADOW_TABLE} AS SELECT * FROM consulting_projects WHERE 0')
+
+    sql = f"INSERT INTO {SHADOW_TABLE} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    rows = [tuple(r) + (now, now) for r in records.itertuples(index=False, name=None)]
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.exec_driver_sql(sql, rows[start:start + BATCH_SIZE])
+        print(f"  ⏳ {min(start + BATCH_SIZE, len(rows))}/{len(rows)}개 적재 중...")
+
+
+def swap_in(conn):
+    """shadow 테이블 내용을 라이브 테이블에 반영 (자연키 UPSERT, id 유지)
+
+    Returns (inserted, updated, deleted) counts
+    """
+    same_key = ' AND '.join(f's.{c} IS c.{c}' for c in KEY_COLUMNS)
+    values = [c for c in COLUMNS if c not in KEY_COLUMNS]
+    conn.exec_driver_sql(
+        f"CREATE INDEX ix_{SHADOW_TABLE}_key ON {SHADOW_TABLE} ({', '.join(KEY_COLUMNS)})"
+    )
+
+    # 값이 바뀐 행만 갱신 (updated_at이 바뀌지 않은 행은 ?since= 증분에 포함되지 않음)
+    updated = conn.exec_driver_sql(f'''
+        UPDATE consulting_projects AS c
+        SET {', '.join(f'{col} = s.{col}' for col in values)}, updated_at = s.updated_at
+        FROM {SHADOW_TABLE} AS s
+        WHERE {same_key} AND ({' OR '.join(f's.{col} IS NOT c.{col}' for col in values)})
+    ''').rowcount
+
+    # 삭제보다 먼저 추가하여, 삭제된 행의 id가 같은 트랜잭션의 새 행에 재사용되지 않게 함
+    columns = ', '.join(COLUMNS + ['created_at', 'updated_at'])
+    inserted = conn.exec_driver_sql(f'''
+        INSERT INTO consulting_projects ({columns})
+        SELECT {columns} FROM {SHADOW_TABLE} AS s
+        WHERE NOT EXISTS (SELECT 1 FROM consulting_projects AS c WHERE {same_key})
+    ''').rowcount
+
+    removed_ids = [row[0] for row in conn.exec_driver_sql(f'''
+        DELETE FROM consulting_projects AS c
+        WHERE NOT EXISTS (SELECT 1 FROM {SHADOW_TABLE} AS s WHERE {same_key})
+        RETURNING id
+    ''')]
+    if removed_ids:
+        now = datetime.utcnow()
+        conn.execute(db.insert(Tombstone), [
+            {'entity_type': 'consulting_projects', 'entity_id': record_id, 'deleted_at': now}
+            for record_id in removed_ids
+        ])
+
+    conn.exec_driver_sql(f'DROP TABLE {SHADOW_TABLE}')
+    return inserted, updated, len(removed_ids)
+
+
+def import_consulting_projects(assume_yes=False, use_cache=True):
     """Import consulting projects from Excel file"""
 
     # Excel 파일 경로
@@ -29,114 +206,90 @@ def import_consulting_projects():
     print(f"📂 Excel 파일 로드: {excel_file}")
 
     with app.app_context():
-        # Excel 파일 읽기
-        df = pd.read_excel(excel_file, sheet_name="해외기술컨설팅('72-'25)")
+        df = load_sheet(excel_file, use_cache=use_cache)
 
         print(f"📊 총 {len(df)}개의 프로젝트 데이터를 찾았습니다.")
 
         # 기존 데이터 확인
         existing_count = ConsultingProject.query.count()
-        if existing_count > 0:
+        if existing_count > 0 and not assume_yes:
             print(f"⚠️  기존 데이터 {existing_count}개가 있습니다.")
-            response = input("기존 데이터를 삭제하고 다시 임포트하시겠습니까? (y/N): ")
-            if response.lower() == 'y':
-                ConsultingProject.query.delete()
-                db.session.commit()
-                print("✓ 기존 데이터를 삭제했습니다.")
-            else:
+            response = input("기존 데이터를 교체하여 다시 임포트하시겠습니까? (y/N): ")
+            if response.lower() != 'y':
                 print("❌ 임포트를 취소했습니다.")
                 return
 
-        # 데이터 임포트
-        imported_count = 0
-        skipped_count = 0
-
-        for idx, row in df.iterrows():
-            try:
-                # 필수 필드 검증
-                if pd.isna(row['국문사업명']) or pd.isna(row['국가별']):
-                    print(f"  ⚠ 행 {idx + 2}: 필수 필드 누락 - 건너뜀")
-                    skipped_count += 1
-                    continue
-
-                # ConsultingProject 생성
-                project = ConsultingProject(
-                    number=int(row['번호']) if pd.notna(row['번호']) else None,
-                    contract_year=int(row['수주년도']) if pd.notna(row['수주년도']) else None,
-                    status=row['진행여부'] if pd.notna(row['진행여부']) else '준공',
-                    country=row['국가별'].strip(),
-                    longitude=float(row['X']) if pd.notna(row['X']) else None,
-                    latitude=float(row['Y']) if pd.notna(row['Y']) else None,
-                    title_en=row['영문사업명'] if pd.notna(row['영문사업명']) else None,
-                    title_kr=row['국문사업명'].strip(),
-                    project_type=row['사업형태'] if pd.notna(row['사업형태']) else None,
-                    start_date=str(row['착수일']) if pd.notna(row['착수일']) else None,
-                    end_date=str(row['준공일']) if pd.notna(row['준공일']) else None,
-                    budget=float(row['용역비(공사)(백만원)']) if pd.notna(row['용역비(공사)(백만원)']) else None,
-                    client=row['발주처'] if pd.notna(row['발주처']) else None
-                )
-
-                db.session.add(project)
-                imported_count += 1
-
-                # 진행상황 표시 (10개마다)
-                if imported_count % 10 == 0:
-                    print(f"  ⏳ {imported_count}개 처리 중...")
-
-            except Exception as e:
-                print(f"  ❌ 행 {idx + 2} 처리 중 오류: {e}")
-                skipped_count += 1
-                continue
-
-        # 데이터베이스에 저장
-        try:
-            db.session.commit()
-            print(f"\n✅ 임포트 완료!")
-            print(f"  - 성공: {imported_count}개")
-            print(f"  - 건너뜀: {skipped_count}개")
-            print(f"  - 총: {imported_count + skipped_count}개")
-
-            # 통계 출력
-            print("\n📊 임포트 통계:")
-
-            # 국가별 통계
-            country_stats = db.session.query(
-                ConsultingProject.country,
-                db.func.count(ConsultingProject.id)
-            ).group_by(ConsultingProject.country).order_by(
-                db.func.count(ConsultingProject.id).desc()
-            ).limit(10).all()
-
-            print("\n  국가별 프로젝트 수 (상위 10개):")
-            for country, count in country_stats:
-                print(f"    - {country}: {count}개")
-
-            # 상태별 통계
-            status_stats = db.session.query(
-                ConsultingProject.status,
-                db.func.count(ConsultingProject.id)
-            ).group_by(ConsultingProject.status).all()
-
-            print("\n  상태별 프로젝트 수:")
-            for status, count in status_stats:
-                print(f"    - {status}: {count}개")
-
-            # 좌표가 있는 프로젝트 수
-            coords_count = ConsultingProject.query.filter(
-                ConsultingProject.latitude.isnot(None),
-                ConsultingProject.longitude.isnot(None)
-            ).count()
+        records, skipped_rows, duplicate_rows = transform(df)
+        for row_number in skipped_rows:
+            print(f"  ⚠ 행 {row_number}: 필수 필드 누락 - 건너뜀")
+        for row_number in duplicate_rows:
+            print(f"  ⚠ 행 {row_number}: 번호/국문사업명/국가가 뒤의 행과 중복 - 건너뜀")
 
-            print(f"\n  좌표가 있는 프로젝트: {coords_count}개 ({coords_count/imported_count*100:.1f}%)")
+        imported_count = len(records)
+        skipped_count = len(skipped_rows) + len(duplicate_rows)
 
+        # shadow 테이블 적재 (라이브 테이블은 그대로 조회 가능)
+        try:
+            with db.engine.begin() as conn:
+                load_shadow(conn, records)
+            # 짧은 트랜잭션 하나로 반영
+            with db.engine.begin() as conn:
+                inserted, updated, deleted = swap_in(conn)
         except Exception as e:
-            db.session.rollback()
+            with db.engine.begin() as conn:
+                conn.exec_driver_sql(f'DROP TABLE IF EXISTS {SHADOW_TABLE}')
             print(f"\n❌ 데이터베이스 저장 중 오류 발생: {e}")
+            return
+
+        print(f"\n✅ 임포트 완료!")
+        print(f"  - 성공: {imported_count}개")
+        print(f"  - 건너뜀: {skipped_count}개")
+        print(f"  - 총: {imported_count + skipped_count}개")
+        print(f"  - 추가 {inserted}개 / 변경 {updated}개 / 삭제 {deleted}개 (나머지는 변경 없음)")
+
+        # 통계 출력
+        print("\n📊 임포트 통계:")
+
+        # 국가별 통계
+        country_stats = db.session.query(
+            ConsultingProject.country,
+            db.func.count(ConsultingProject.id)
+        ).group_by(ConsultingProject.country).order_by(
+            db.func.count(ConsultingProject.id).desc()
+        ).limit(10).all()
+
+        print("\n  국가별 프로젝트 수 (상위 10개):")
+        for country, count in country_stats:
+            print(f"    - {country}: {count}개")
+
+        # 상태별 통계
+        status_stats = db.session.query(
+            ConsultingProject.status,
+            db.func.count(ConsultingProject.id)
+        ).group_by(ConsultingProject.status).all()
+
+        print("\n  상태별 프로젝트 수:")
+        for status, count in status_stats:
+            print(f"    - {status}: {count}개")
+
+        # 좌표가 있는 프로젝트 수
+        coords_count = ConsultingProject.query.filter(
+            ConsultingProject.latitude.isnot(None),
+            ConsultingProject.longitude.isnot(None)
+        ).count()
+
+        if imported_count:
+            print(f"\n  좌표가 있는 프로젝트: {coords_count}개 ({coords_count/imported_count*100:.1f}%)")
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='해외기술용역 프로젝트 Excel 임포트')
+    parser.add_argument('--yes', action='store_true', help='기존 데이터 교체 확인 생략')
+    parser.add_argument('--no-cache', action='store_true', help='캐시를 사용하지 않고 Excel을 다시 읽기')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("해외기술용역 프로젝트 임포트")
     print("=" * 70)
-    import_consulting_projects()
+    import_consulting_projects(assume_yes=args.yes, use_cache=not args.no_cache)
     print("=" * 70)
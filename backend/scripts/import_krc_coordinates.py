@@ -1,9 +1,15 @@
 """
 KRC JSON 파일에서 좌표 정보를 가져와서 프로젝트 데이터베이스에 추가하는 스크립트
+
+사업 목록을 한 번만 읽어 국가별 bigram 색인으로 매칭하고,
+좌표는 한 번의 일괄 UPDATE로 반영합니다.
+
+Run with: python scripts/import_krc_coordinates.py [--overwrite] [--min-score 0.6] [--report report.csv]
 """
 import os
 import sys
-import json
+import csv
+import argparse
 from pathlib import Path
 
 # 프로젝트 루트 디렉토리 추가
@@ -11,6 +17,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import app
 from models import db, Project
+from services.coordinate_matcher import CoordinateMatcher
+from services.json_stream import iter_json_array, prefetch
 
 # 국가명 매핑 (KRC JSON의 국가명과 DB의 국가명이 다를 수 있음)
 COUNTRY_MAPPING = {
@@ -24,8 +32,79 @@ COUNTRY_MAPPING = {
 }
 
 
-def import_coordinates_from_krc():
-    """KRC JSON 파일에서 좌표를 가져와 프로젝트에 추가"""
+def load_items(path):
+    """KRC JSON 파일의 항목을 하나씩 읽기 (파일 전체를 메모리에 올리지 않음)"""
+    return prefetch(iter_json_array(path))
+
+
+def build_matcher(min_score):
+    """모든 사업을 한 번에 읽어 매칭 색인 생성"""
+    rows = db.session.query(
+        Project.id, Project.country, Project.title, Project.description,
+        Project.latitude, Project.longitude
+    ).all()
+
+    matcher = CoordinateMatcher(
+        ((r.id, r.country, [r.title, r.description]) for r in rows),
+        min_score=min_score
+    )
+    coordinates = {r.id: (r.latitude, r.longitude) for r in rows}
+    return matcher, coordinates
+
+
+def match_items(matcher, items, source, results):
+    """JSON 항목을 사업에 매칭하여 results에 누적"""
+    for item in items:
+        country = (item.get('name') or '').strip()
+        country = COUNTRY_MAPPING.get(country, country)
+        lat = item.get('lat')
+        lng = item.get('lng')
+        description = (item.get('description') or '').strip()
+
+        if not country or not lat or not lng:
+            continue
+
+        result = matcher.match(country, description)
+        record = {
+            'source': source,
+            'country': country,
+            'description': description,
+            'lat': float(lat),
+            'lng': float(lng),
+            'result': result
+        }
+
+        if result.status == 'matched':
+            # 같은 사업에 여러 항목이 매칭되면 점수가 높은 항목을 사용
+            previous = results['matched'].get(result.project_id)
+            if previous is None or previous['result'].score < result.score:
+                if previous is not None:
+                    results['duplicate'].append(previous)
+                results['matched'][result.project_id] = record
+            else:
+                results['duplicate'].append(record)
+        else:
+            results[result.status].append(record)
+
+
+def write_report(path, results):
+    """애매한/매칭 실패 항목을 CSV로 저장"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['status', 'source', 'country', 'description', 'score', 'candidates'])
+        for status in ('ambiguous', 'unmatched', 'duplicate'):
+            for record in results[status]:
+                result = record['result']
+                candidates = ' '.join(f'{pid}:{score:.2f}' for pid, score in result.candidates)
+                writer.writerow([status, record['source'], record['country'], record['description'],
+                                 f'{result.score:.2f}', candidates])
+
+
+def import_coordinates_from_krc(overwrite=False, min_score=0.6, report_path=None, progress=None):
+    """KRC JSON 파일에서 좌표를 가져와 프로젝트에 추가 (결과 건수 반환, 백그라운드 작업에서도 사용)
+
+    progress(percent, message, **counts) 가 주어지면 파일마다 호출됩니다.
+    """
     
     with app.app_context():
         # KRC 디렉토리 경로
@@ -33,105 +112,54 @@ def import_coordinates_from_krc():
         
         if not krc_dir.exists():
             print(f"❌ KRC 데이터 디렉토리를 찾을 수 없습니다: {krc_dir}")
-            return
-        
-        # ODA 데이터 로드
-        oda_file = krc_dir / 'global_oda.json'
-        consulting_file = krc_dir / 'global_consulting.json'
-        
-        updated_count = 0
-        created_count = 0
-        
-        # ODA 프로젝트 처리
-        if oda_file.exists():
-            print(f"📂 ODA 데이터 로드: {oda_file}")
-            with open(oda_file, 'r', encoding='utf-8') as f:
-                oda_data = json.load(f)
-            
-            for item in oda_data:
-                country = item.get('name', '').strip()
-                lat = item.get('lat')
-                lng = item.get('lng')
-                description = item.get('description', '').strip()
-                
-                if not country or not lat or not lng:
-                    continue
-                
-                # 프로젝트 찾기 (국가명과 사업명으로 매칭)
-                project = Project.query.filter(
-                    Project.country == country
-                ).filter(
-                    db.or_(
-                        Project.title.ilike(f'%{description[:20]}%'),
-                        Project.description.ilike(f'%{description[:20]}%')
-                    )
-                ).first()
-                
-                if project:
-                    # 기존 프로젝트에 좌표 추가
-                    if not project.latitude or not project.longitude:
-                        project.latitude = float(lat)
-                        project.longitude = float(lng)
-                        updated_count += 1
-                        print(f"  ✓ 업데이트: {project.title} ({country})")
-                else:
-                    # 프로젝트가 없으면 생성 (선택사항)
-                    # 주석 처리: 필요시 활성화
-                    # project = Project(
-                    #     code=f"ODA-{item.get('number', 'UNK')}",
-                    #     title=description,
-                    #     country=country,
-                    #     latitude=float(lat),
-                    #     longitude=float(lng),
-                    #     project_type='oda_bilateral',
-                    #     department='aidc',
-                    #     budget_total=item.get('budget', 0) * 1000000,
-                    #     status='in_progress'
-                    # )
-                    # db.session.add(project)
-                    # created_count += 1
-                    print(f"  ⚠ 찾을 수 없음: {description} ({country})")
-        
-        # Consulting 프로젝트 처리
-        if consulting_file.exists():
-            print(f"\n📂 Consulting 데이터 로드: {consulting_file}")
-            with open(consulting_file, 'r', encoding='utf-8') as f:
-                consulting_data = json.load(f)
-            
-            for item in consulting_data:
-                country = item.get('name', '').strip()
-                lat = item.get('lat')
-                lng = item.get('lng')
-                description = item.get('description', '').strip()
-                
-                if not country or not lat or not lng:
-                    continue
-                
-                # 프로젝트 찾기
-                project = Project.query.filter(
-                    Project.country == country
-                ).filter(
-                    db.or_(
-                        Project.title.ilike(f'%{description[:20]}%'),
-                        Project.description.ilike(f'%{description[:20]}%')
-                    )
-                ).first()
-                
-                if project:
-                    if not project.latitude or not project.longitude:
-                        project.latitude = float(lat)
-                        project.longitude = float(lng)
-                        updated_count += 1
-                        print(f"  ✓ 업데이트: {project.title} ({country})")
-                else:
-                    print(f"  ⚠ 찾을 수 없음: {description} ({country})")
-        
-        # 변경사항 저장
-        if updated_count > 0:
+            return None
+
+        matcher, coordinates = build_matcher(min_score)
+        results = {'matched': {}, 'ambiguous': [], 'unmatched': [], 'duplicate': []}
+
+        sources = (('oda', 'global_oda.json'), ('consulting', 'global_consulting.json'))
+        for position, (source, filename) in enumerate(sources):
+            path = krc_dir / filename
+            if progress:
+                progress(10 + position * 80 // len(sources), f'{filename} 매칭 중')
+            if path.exists():
+                print(f"📂 {source} 데이터 로드: {path}")
+                match_items(matcher, load_items(path), source, results)
+            if progress:
+                progress(10 + (position + 1) * 80 // len(sources), f'{filename} 매칭 완료',
+                         matched=len(results['matched']), ambiguous=len(results['ambiguous']),
+                         unmatched=len(results['unmatched']))
+
+        # 좌표 변경이 필요한 사업만 일괄 UPDATE
+        updates = []
+        for project_id, record in results['matched'].items():
+            lat, lng = coordinates[project_id]
+            if lat and lng and not overwrite:
+                continue
+            if lat is not None and lng is not None and \
+                    (float(lat), float(lng)) == (record['lat'], record['lng']):
+                continue
+            updates.append({'id': project_id, 'latitude': record['lat'], 'longitude': record['lng']})
+
+        if updates:
+            db.session.execute(db.update(Project), updates)
             db.session.commit()
-            print(f"\n✅ {updated_count}개의 프로젝트에 좌표를 추가했습니다.")
+            print(f"\n✅ {len(updates)}개의 프로젝트에 좌표를 반영했습니다.")
         else:
             print("\nℹ 업데이트할 프로젝트가 없습니다.")
+
+        print(f"  - 매칭: {len(results['matched'])}개")
+        print(f"  - 애매함: {len(results['ambiguous'])}개")
+        print(f"  - 찾을 수 없음: {len(results['unmatched'])}개")
+        print(f"  - 중복 매칭: {len(results['duplicate'])}개")
+
+        for record in results['ambiguous'][:20]:
+            candidates = ', '.join(f'#{pid}({score:.2f})' for pid, score in record['result'].candidates)
+            print(f"  ⚠ 애매함: {record['description']} ({record['country']}) → {candidates}")
+
+        if report_path:
+            write_report(report_path, results)
+            print(f"\n📝 매칭 보고서 저장: {report_path}")
         
         # 좌표가 있는 프로젝트 수 확인
         projects_with_coords = Project.query.filter(
@@ -143,11 +171,25 @@ def import_coordinates_from_krc():
         
         print(f"\n📊 현재 좌표가 있는 프로젝트 수: {projects_with_coords}")
 
+        return {
+            'updated': len(updates),
+            'matched': len(results['matched']),
+            'ambiguous': len(results['ambiguous']),
+            'unmatched': len(results['unmatched']),
+            'duplicate': len(results['duplicate']),
+            'withCoordinates': projects_with_coords
+        }
+
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='KRC 좌표 정보 가져오기')
+    parser.add_argument('--overwrite', action='store_true', help='이미 좌표가 있는 사업도 KRC 좌표로 갱신')
+    parser.add_argument('--min-score', type=float, default=0.6, help='매칭 최소 유사도 (0~1)')
+    parser.add_argument('--report', help='애매한/실패 항목 CSV 보고서 경로')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("KRC 좌표 정보 가져오기")
     print("=" * 60)
-    import_coordinates_from_krc()
+    import_coordinates_from_krc(overwrite=args.overwrite, min_score=args.min_score, report_path=args.report)
     print("=" * 60)
-
@@ -0,0 +1,25 @@
+"""
+GBMS - Rebuild Document Search Index
+문서 본문 검색 색인 재생성
+
+Run with: python scripts/reindex_documents.py
+"""
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from services import document_index
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("문서 검색 색인 재생성")
+    print("=" * 60)
+    with app.app_context():
+        indexed, skipped = document_index.rebuild()
+        print(f"✅ 본문 색인: {indexed}개")
+        print(f"ℹ 본문 없음(제목/파일명만 색인): {skipped}개")
+    print("=" * 60)
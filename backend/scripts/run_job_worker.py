@@ -0,0 +1,60 @@
+"""
+GBMS - Background Job Worker
+백그라운드 작업(엑셀 업로드/내보내기, 일괄 삭제, KRC 가져오기) 처리
+
+jobs 테이블의 대기 작업을 작업자 프로세스들이 하나씩 가져가 실행합니다.
+웹 서버와 별도로 실행해 두어야 202 로 접수된 작업이 처리됩니다.
+
+Run with: python scripts/run_job_worker.py [--workers 2] [--once]
+"""
+import os
+import sys
+import socket
+import logging
+import argparse
+import multiprocessing
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from services import jobs
+
+
+def worker_main(index, once):
+    logging.basicConfig(level=logging.INFO, format=f'%(asctime)s [worker {index}] %(message)s')
+    with app.app_context():
+        jobs.work(f'{socket.gethostname()}:{os.getpid()}', once=once)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='백그라운드 작업 처리')
+    parser.add_argument('--workers', type=int, default=app.config['JOB_WORKERS'], help='작업자 프로세스 수')
+    parser.add_argument('--once', action='store_true', help='대기 작업을 모두 처리하면 종료')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"백그라운드 작업 처리 (작업자 {args.workers}개)")
+    print("=" * 60)
+
+    if args.workers <= 1:
+        worker_main(0, args.once)
+    else:
+        # spawn, not fork: importing the app can still start threads (the
+        # slow-query log writer), and a forked child could inherit a lock one
+        # of them was holding
+        context = multiprocessing.get_context('spawn')
+        processes = [
+            context.Process(target=worker_main, args=(index, args.once), name=f'job-worker-{index}')
+            for index in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+
+    print("=" * 60)
@@ -0,0 +1,146 @@
+"""
+GBMS - Activity Writer
+글로벌사업처 해외사업관리시스템 - 로그인/로그아웃 기록 일괄 저장
+
+Login and logout used to update users.last_login and insert an ActivityLog
+row in the request. That made every login a SQLite write transaction,
+competing with business writes during the morning peak.
+
+The routes now only append to in-memory buffers here. last_login keeps only
+the latest time per user. A background thread writes the buffers in one
+transaction every ACTIVITY_FLUSH_INTERVAL seconds, or sooner once
+ACTIVITY_FLUSH_MAX_EVENTS events are waiting. ActivityLog rows keep the
+time of the event, not of the flush.
+
+If a flush fails the rows go back into the buffer for the next attempt. The
+buffer holds at most ACTIVITY_BUFFER_LIMIT events; beyond that the oldest
+are dropped. Whatever is still buffered is written at interpreter exit, so
+only a hard kill loses up to one interval of login history. With
+ACTIVITY_FLUSH_INTERVAL = 0, or in a process that did not start the writer
+(only the serving process does, via app.init_background), everything is
+written inline, as before.
+"""
+import atexit
+import logging
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import bindparam
+from models import db, User, ActivityLog
+
+log = logging.getLogger(__name__)
+
+_last_logins = {}  # user id -> latest login time
+_events = []  # activity_logs rows (dicts)
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_worker = None
+
+
+# ---------------------------------------------------------------------------
+# Recording (request thread)
+# ---------------------------------------------------------------------------
+
+def _record(user, action, ip_address, login=False):
+    now = datetime.utcnow()
+    verb = '로그인' if action == 'login' else '로그아웃'
+    row = {
+        'user_id': user.id,
+        'action': action,
+        'entity_type': 'user',
+        'entity_id': user.id,
+        'description': f'{user.name}님이 {verb}했습니다.',
+        'ip_address': ip_address,
+        'created_at': now,
+    }
+
+    config = current_app.config
+    with _lock:
+        if login:
+            _last_logins[user.id] = now
+        _events.append(row)
+        overflow = len(_events) - config['ACTIVITY_BUFFER_LIMIT']
+        if overflow > 0:
+            del _events[:overflow]
+        pending = len(_events)
+
+    if _worker is None:
+        flush()
+    elif pending >= config['ACTIVITY_FLUSH_MAX_EVENTS']:
+        _wakeup.set()
+
+
+def record_login(user, ip_address):
+    _record(user, 'login', ip_address, login=True)
+
+
+def record_logout(user, ip_address):
+    _record(user, 'logout', ip_address)
+
+
+# ---------------------------------------------------------------------------
+# Flushing
+# ---------------------------------------------------------------------------
+
+def _requeue(last_logins, events):
+    with _lock:
+        for user_id, when in last_logins.items():
+            if _last_logins.get(user_id, when) <= when:
+                _last_logins[user_id] = when
+        _events[:0] = events
+        overflow = len(_events) - current_app.config['ACTIVITY_BUFFER_LIMIT']
+        if overflow > 0:
+            del _events[:overflow]
+
+
+def flush():
+    """Write buffered rows in one transaction (needs an app context). Returns the event count."""
+    global _last_logins, _events
+    with _lock:
+        last_logins, events = _last_logins, _events
+        _last_logins, _events = {}, []
+
+    if not last_logins and not events:
+        return 0
+
+    users = User.__table__
+    try:
+        if last_logins:
+            db.session.execute(
+                users.update().where(users.c.id == bindparam('uid')).values(last_login=bindparam('ts')),
+                [{'uid': user_id, 'ts': when} for user_id, when in last_logins.items()]
+            )
+        if events:
+            db.session.execute(db.insert(ActivityLog), events)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        _requeue(last_logins, events)
+        log.exception('Failed to write %d buffered activity events', len(events))
+        return 0
+    return len(events)
+
+
+def _run(app):
+    interval = app.config['ACTIVITY_FLUSH_INTERVAL']
+    while True:
+        _wakeup.wait(interval)
+        _wakeup.clear()
+        with app.app_context():
+            flush()
+
+
+def _flush_at_exit(app):
+    with app.app_context():
+        flush()
+
+
+def start_writer(app):
+    """Start the background flush thread (no-op when writing inline)"""
+    global _worker
+    if _worker is not None or app.config['ACTIVITY_FLUSH_INTERVAL'] <= 0:
+        return
+
+    _worker = threading.Thread(target=_run, args=(app,), name='activity-writer', daemon=True)
+    _worker.start()
+    atexit.register(_flush_at_exit, app)
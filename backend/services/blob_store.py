@@ -0,0 +1,156 @@
+"""
+GBMS - Content-addressed Blob Store
+글로벌사업처 해외사업관리시스템 - 문서 파일 저장소
+
+Uploaded files are stored once per SHA-256 digest in a sharded layout
+(<BLOB_FOLDER>/ab/cd/abcd...). Document rows point at a blob through
+Document.content_hash, so the number of rows sharing a hash is the blob's
+reference count.
+"""
+import hashlib
+import os
+import tempfile
+import time
+from flask import current_app
+from models import db, Document
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def blob_root():
+    return current_app.config['BLOB_FOLDER']
+
+
+def blob_path(content_hash, root=None):
+    """Sharded path of a blob: <root>/<hash[0:2]>/<hash[2:4]>/<hash>"""
+    root = root or blob_root()
+    return os.path.join(root, content_hash[:2], content_hash[2:4], content_hash)
+
+
+def store_stream(stream, root=None):
+    """Hash and write a file stream in a single pass.
+
+    The stream is copied to a temp file while being hashed, then renamed into
+    place. If a blob with the same digest already exists the temp file is
+    dropped and the existing blob is reused.
+
+    Returns (content_hash, path, size).
+    """
+    root = root or blob_root()
+    tmp_dir = os.path.join(root, 'tmp')
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        content_hash = digest.hexdigest()
+        path = blob_path(content_hash, root)
+
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            # Refresh mtime so a concurrent GC run treats the blob as in use
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return content_hash, path, size
+
+
+def reference_count(content_hash):
+    """Number of documents referencing a blob"""
+    return Document.query.filter(Document.content_hash == content_hash).count()
+
+
+def _is_recent(path, grace_seconds):
+    try:
+        return time.time() - os.path.getmtime(path) < grace_seconds
+    except OSError:
+        return False
+
+
+def release(content_hash):
+    """Remove a blob once no document references it.
+
+    Blobs touched within the GC grace period are kept, since an upload of the
+    same content may be about to reference them; the GC job removes them later.
+    """
+    if reference_count(content_hash) > 0:
+        return False
+
+    path = blob_path(content_hash)
+    if not os.path.exists(path) or _is_recent(path, current_app.config['BLOB_GC_GRACE_SECONDS']):
+        return False
+
+    os.remove(path)
+    return True
+
+
+def adopt_file(document):
+    """Move a legacy upload (uploads/<project_id>/<timestamp>_<name>) into the store"""
+    with open(document.file_path, 'rb') as f:
+        content_hash, path, size = store_stream(f)
+
+    legacy_path = document.file_path
+    document.content_hash = content_hash
+    document.file_path = path
+    document.file_size = size
+    db.session.commit()
+
+    os.remove(legacy_path)
+    return content_hash
+
+
+def collect_garbage(grace_seconds=None, dry_run=False):
+    """Delete blobs (and stale temp files) that no document references.
+
+    Returns a stats dict: scanned, removed, freed_bytes, kept_recent.
+    """
+    root = blob_root()
+    if grace_seconds is None:
+        grace_seconds = current_app.config['BLOB_GC_GRACE_SECONDS']
+
+    referenced = {
+        h for (h,) in db.session.query(Document.content_hash).filter(
+            Document.content_hash.isnot(None)
+        ).distinct()
+    }
+
+    stats = {'scanned': 0, 'removed': 0, 'freed_bytes': 0, 'kept_recent': 0}
+    if not os.path.isdir(root):
+        return stats
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        is_tmp = os.path.relpath(dirpath, root).split(os.sep)[0] == 'tmp'
+
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            stats['scanned'] += 1
+
+            if not is_tmp and name in referenced:
+                continue
+
+            if _is_recent(path, grace_seconds):
+                stats['kept_recent'] += 1
+                continue
+
+            stats['removed'] += 1
+            stats['freed_bytes'] += os.path.getsize(path)
+            if not dry_run:
+                os.remove(path)
+
+    return stats
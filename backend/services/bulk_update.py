@@ -0,0 +1,61 @@
+"""
+GBMS - Bulk Update
+글로벌사업처 해외사업관리시스템 - 일괄 수정 (집합 단위 UPDATE)
+
+Bulk endpoints take their targets in the request body as either
+{"ids": [...]} or {"filters": {...}} with the same keys as the list
+endpoint. update_rows() applies one set of column values to all targets
+with UPDATE statements instead of loading and saving each row: id lists
+are bound in chunks of BULK_UPDATE_CHUNK (SQLite's parameter limit), and
+filters become a single UPDATE ... WHERE id IN (SELECT ...). All statements
+run in the caller's transaction.
+"""
+from datetime import datetime
+from flask import current_app
+from models import db
+
+
+def requested_target(data, filter_keys):
+    """Body -> (ids, filters, error message). filters keeps only filter_keys with a value.
+
+    An empty filter is an error, so a request can never address every row.
+    """
+    if 'filters' in data:
+        if not isinstance(data['filters'], dict):
+            return None, None, '유효한 필터가 아닙니다.'
+        filters = {key: value for key, value in data['filters'].items()
+                   if key in filter_keys and value not in (None, '')}
+        if not filters:
+            return None, None, '대상 조건(필터)을 하나 이상 지정해야 합니다.'
+        return None, filters, None
+
+    if 'ids' in data:
+        ids = data['ids']
+        if not isinstance(ids, list) or len(ids) == 0:
+            return None, None, '유효한 ID 목록이 아닙니다.'
+        try:
+            return sorted({int(record_id) for record_id in ids}), None, None
+        except (ValueError, TypeError):
+            return None, None, '유효한 ID 목록이 아닙니다.'
+
+    return None, None, '대상 프로젝트 ID 목록이 없습니다.'
+
+
+def update_rows(model, values, ids=None, query=None):
+    """Set values on the rows with ids, or on the rows of query; updated_at is set too.
+
+    Returns the number of rows matched (caller commits).
+    """
+    values = dict(values, updated_at=datetime.utcnow())
+    statement = db.update(model).values(values).execution_options(synchronize_session=False)
+
+    if ids is None:
+        id_select = query.with_entities(model.id).statement
+        return db.session.execute(statement.where(model.id.in_(id_select))).rowcount
+
+    chunk_size = current_app.config['BULK_UPDATE_CHUNK']
+    updated = 0
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        updated += db.session.execute(statement.where(model.id.in_(chunk))).rowcount
+    return updated
@@ -0,0 +1,356 @@
+"""
+GBMS - Change Feed
+글로벌사업처 해외사업관리시스템 - 변경 사항 실시간 전달 (SSE / long-poll)
+
+Committed writes to registered models are published as compact deltas:
+
+    {"cursor": "<epoch>:<seq>", "entity": "project", "op": "upsert", "id": 12, "data": {...}, "at": "..."}
+
+op is 'upsert' (data is the serialized row), 'delete' (data is the row as
+it was) or 'invalidate' (id is None). 'invalidate' comes from a bulk
+UPDATE/DELETE statement, where the affected rows are unknown; clients
+reload that entity. Rows are serialized at flush time with the function
+registered for the model, and published only if the transaction commits.
+
+Delivery is an in-process pub/sub. Each subscriber has a bounded queue. A
+subscriber that falls behind is told to resync instead of blocking
+publishers. The last CHANGE_FEED_BACKLOG deltas are kept, so a client that
+reconnects with its last cursor gets what it missed. When that is no longer
+possible (backlog exceeded, different process or restart: the epoch
+changed), the client gets 'resync' and reloads the full endpoint once.
+
+Some writes never pass through the hooks here: ORM insert statements, raw
+SQL, and everything done by other processes (job workers, import scripts).
+check_unpublished() runs at most once per CHANGE_FEED_HEARTBEAT (the
+streams call it as they wait) and publishes 'invalidate' for an entity whose
+table moved without a delta. It compares the change_tracking version with
+the commits this feed published, and the table's row count and newest
+updated_at (max id for tables without one) with what those commits could
+explain. Those queries only run when PRAGMA data_version (read on a
+connection of its own) shows that some connection committed since the last
+check, so an idle database costs one pragma per heartbeat.
+"""
+import time
+import sqlite3
+import uuid
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from models import db
+from services import metrics, change_tracking
+
+EPOCH = uuid.uuid4().hex[:8]
+
+_serializers = {}  # model class -> (entity, serializer)
+_entities_by_table = {}  # table name -> entity
+_models_by_table = {}  # table name -> model class
+_subscribers = set()
+_backlog = deque(maxlen=1000)
+_lock = threading.Lock()
+_seq = 0
+_installed = False
+
+# check_unpublished() state
+_committed = {}  # table -> what commits since the last check published (see _committed_entry)
+_baseline = {}  # table -> (change_tracking version, row count, newest stamp) at the last check
+_check_lock = threading.Lock()
+_last_check = None
+_watch = None  # connection used only for PRAGMA data_version
+_data_version = None
+
+
+class FeedFull(Exception):
+    """CHANGE_FEED_MAX_CLIENTS subscribers are already connected"""
+
+
+def register(model, entity, serializer):
+    """Publish committed writes to model as entity deltas, serialized with serializer(row)"""
+    _serializers[model] = (entity, serializer)
+    _entities_by_table[model.__tablename__] = entity
+    _models_by_table[model.__tablename__] = model
+
+
+# ---------------------------------------------------------------------------
+# Capturing writes
+# ---------------------------------------------------------------------------
+
+def _pending(session):
+    return session.info.setdefault('feed_pending', {})
+
+
+def _committed_entry():
+    return {'commits': 0, 'rows': 0, 'stamp': None, 'bulk': False}
+
+
+def _touched(session, table):
+    """Per-table effect of this session's flushes: net rows, newest stamp, bulk statements"""
+    return session.info.setdefault('feed_tables', {}).setdefault(table, _committed_entry())
+
+
+def _stamp(obj):
+    """updated_at, or the id for models without one (compared with the table's max)"""
+    return getattr(obj, 'updated_at', None) if hasattr(type(obj), 'updated_at') else obj.id
+
+
+def _newer(a, b):
+    return b if a is None or (b is not None and b > a) else a
+
+
+def _serialize(serializer, obj):
+    try:
+        return serializer(obj)
+    except Exception:
+        current_app.logger.exception('change feed: could not serialize %r', obj)
+        return None
+
+
+def _after_flush(session, flush_context):
+    pending = _pending(session)
+    for obj in (*session.new, *session.dirty):
+        entry = _serializers.get(type(obj))
+        if entry:
+            # counted like change_tracking counts it, published only if it changed
+            touched = _touched(session, obj.__tablename__)
+            touched['rows'] += obj in session.new
+            touched['stamp'] = _newer(touched['stamp'], _stamp(obj))
+        if entry and (obj in session.new or session.is_modified(obj, include_collections=False)):
+            entity, serializer = entry
+            pending[(entity, obj.id)] = ('upsert', _serialize(serializer, obj))
+    for obj in session.deleted:
+        entry = _serializers.get(type(obj))
+        if entry:
+            _touched(session, obj.__tablename__)['rows'] -= 1
+            entity, serializer = entry
+            pending[(entity, obj.id)] = ('delete', _serialize(serializer, obj))
+
+
+def _do_orm_execute(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        entity = _entities_by_table.get(getattr(table, 'name', None))
+        if entity:
+            _pending(orm_execute_state.session)[(entity, None)] = ('invalidate', None)
+            _touched(orm_execute_state.session, table.name)['bulk'] = True
+
+
+def _after_commit(session):
+    pending = session.info.pop('feed_pending', None)
+    touched = session.info.pop('feed_tables', None)
+    if pending:
+        for (entity, record_id), (op, data) in pending.items():
+            publish(entity, op, record_id, data)
+    if touched:
+        with _lock:
+            for table, effect in touched.items():
+                committed = _committed.setdefault(table, _committed_entry())
+                committed['commits'] += 1
+                committed['rows'] += effect['rows']
+                committed['stamp'] = _newer(committed['stamp'], effect['stamp'])
+                committed['bulk'] = committed['bulk'] or effect['bulk']
+
+
+def _after_rollback(session):
+    session.info.pop('feed_pending', None)
+    session.info.pop('feed_tables', None)
+
+
+def install():
+    """Listen on all ORM sessions (idempotent)"""
+    global _installed
+    if _installed:
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'do_orm_execute', _do_orm_execute)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+    _installed = True
+
+
+# ---------------------------------------------------------------------------
+# Pub/sub
+# ---------------------------------------------------------------------------
+
+class Subscription:
+    def __init__(self, entities, max_queue):
+        self.entities = entities
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.overflowed = False
+        self.replay = []
+        self.resync = False
+
+    def wants(self, delta):
+        return not self.entities or delta['entity'] in self.entities
+
+    def offer(self, delta):
+        if self.overflowed or not self.wants(delta):
+            return
+        try:
+            self.queue.put_nowait(delta)
+        except queue.Full:
+            self.overflowed = True  # the reader sends 'resync' and closes
+
+    def get(self, timeout):
+        """Next delta, or None after timeout seconds"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+def publish(entity, op, record_id=None, data=None):
+    global _seq
+    with _lock:
+        _seq += 1
+        delta = {
+            'cursor': f'{EPOCH}:{_seq}',
+            'entity': entity,
+            'op': op,
+            'id': record_id,
+            'data': data,
+            'at': datetime.utcnow().isoformat(timespec='milliseconds') + 'Z',
+        }
+        _backlog.append((_seq, delta))
+        subscribers = list(_subscribers)
+    for subscription in subscribers:
+        subscription.offer(delta)
+    return delta
+
+
+def _parse_cursor(cursor):
+    try:
+        epoch, seq = cursor.split(':', 1)
+        return epoch, int(seq)
+    except (AttributeError, ValueError):
+        return None, None
+
+
+def subscribe(entities=None, cursor=None):
+    """Register a subscriber. With a cursor, missed deltas are put in .replay
+    (or .resync is set when they are no longer available)."""
+    config = current_app.config
+    subscription = Subscription(set(entities or ()), config['CHANGE_FEED_QUEUE_SIZE'])
+    with _lock:
+        if len(_subscribers) >= config['CHANGE_FEED_MAX_CLIENTS']:
+            raise FeedFull()
+        if _backlog.maxlen != config['CHANGE_FEED_BACKLOG']:
+            _resize_backlog(config['CHANGE_FEED_BACKLOG'])
+
+        if cursor:
+            epoch, seq = _parse_cursor(cursor)
+            oldest = _backlog[0][0] if _backlog else _seq + 1
+            if epoch != EPOCH or seq is None or seq < oldest - 1 or seq > _seq:
+                subscription.resync = True
+            else:
+                subscription.replay = [delta for delta_seq, delta in _backlog
+                                       if delta_seq > seq and subscription.wants(delta)]
+        _subscribers.add(subscription)
+    metrics.change_feed_subscribers.inc()
+    return subscription
+
+
+def unsubscribe(subscription):
+    with _lock:
+        if subscription not in _subscribers:
+            return
+        _subscribers.discard(subscription)
+    metrics.change_feed_subscribers.dec()
+
+
+def _resize_backlog(size):
+    global _backlog
+    _backlog = deque(_backlog, maxlen=size)
+
+
+def current_cursor():
+    return f'{EPOCH}:{_seq}'
+
+
+# ---------------------------------------------------------------------------
+# Writes that bypassed the hooks
+# ---------------------------------------------------------------------------
+
+def _table_stamps():
+    """table -> (row count, newest updated_at or max id), read outside the session's transaction"""
+    stamps = {}
+    with db.engine.connect() as connection:
+        for table, model in _models_by_table.items():
+            column = model.updated_at if hasattr(model, 'updated_at') else model.id
+            stamps[table] = tuple(connection.execute(select(func.count(), func.max(column)).select_from(model)).one())
+    return stamps
+
+
+def _database_moved(url):
+    """Did any connection commit since the last call? Always True unless url is a SQLite file.
+
+    data_version changes when another connection commits, so it is read on a
+    connection that never writes. Callers hold _check_lock.
+    """
+    global _watch, _data_version
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        return True
+    if _watch is None:
+        _watch = sqlite3.connect(url.database, check_same_thread=False)
+    version = _watch.execute('PRAGMA data_version').fetchone()[0]
+    moved = version != _data_version
+    _data_version = version
+    return moved
+
+
+def _unexplained(previous, version, rows, stamp, committed):
+    """Did the table move beyond what the commits published here account for?"""
+    last_version, last_rows, last_stamp = previous
+    if version - last_version > committed['commits']:
+        return True  # an in-process write the feed did not see (insert statement, raw SQL)
+    if committed['bulk'] or (rows, stamp) == (last_rows, last_stamp):
+        return False  # bulk statements already published 'invalidate'
+    if rows - last_rows != committed['rows']:
+        return True
+    # a newer stamp than any row written here (older ones: the newest row was deleted)
+    explained = _newer(last_stamp, committed['stamp'])
+    return stamp is not None and (explained is None or stamp > explained)
+
+
+def check_unpublished():
+    """Publish 'invalidate' for entities whose table changed without a delta.
+
+    Runs at most once per CHANGE_FEED_HEARTBEAT per process; callers are the
+    waiting streams. The first run only records the baseline.
+    """
+    global _last_check
+    interval = current_app.config['CHANGE_FEED_HEARTBEAT']
+    if _last_check is not None and time.monotonic() - _last_check < interval:
+        return
+    if not _check_lock.acquire(blocking=False):
+        return  # another stream is checking
+    try:
+        if _last_check is not None and time.monotonic() - _last_check < interval:
+            return
+        _last_check = time.monotonic()
+        try:
+            if not _database_moved(db.engine.url):
+                return  # nothing committed anywhere; pending _committed entries wait for the next check
+        except sqlite3.Error:
+            current_app.logger.exception('change feed: could not read data_version')
+
+        tables = list(_models_by_table)
+        with _lock:
+            committed = {table: _committed.pop(table, _committed_entry()) for table in tables}
+            versions = dict(zip(tables, change_tracking.versions(tables)))
+        try:
+            stamps = _table_stamps()
+        except Exception:
+            current_app.logger.exception('change feed: could not read table stamps')
+            return
+
+        for table in tables:
+            rows, stamp = stamps[table]
+            previous = _baseline.get(table)
+            _baseline[table] = (versions[table], rows, stamp)
+            if previous is not None and _unexplained(previous, versions[table], rows, stamp, committed[table]):
+                publish(_entities_by_table[table], 'invalidate')
+    finally:
+        _check_lock.release()
@@ -0,0 +1,74 @@
+"""
+GBMS - Change Tracking
+글로벌사업처 해외사업관리시스템 - 테이블 단위 변경 버전
+
+Keeps a per-table version counter in the process. A table's counter goes up
+when a transaction that wrote to it commits. Caches store the versions they
+were computed from and treat any difference as stale.
+
+ORM writes are tracked automatically. Flushed objects and ORM-enabled
+insert/update/delete statements (session.execute(db.update(Model)...)) are
+collected per session and bumped on commit. Raw SQL through a connection is
+invisible here, so callers doing that should call bump() themselves.
+Writes made by other processes (import scripts, other workers) are not seen;
+caches rely on their TTL for those.
+"""
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_versions = {}
+_lock = threading.Lock()
+_installed = False
+
+
+def versions(tables):
+    """Current version tuple for the given table names"""
+    return tuple(_versions.get(table, 0) for table in tables)
+
+
+def bump(*tables):
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+def _pending(session):
+    return session.info.setdefault('changed_tables', set())
+
+
+def _after_flush(session, flush_context):
+    changed = _pending(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, '__tablename__', None)
+        if table:
+            changed.add(table)
+
+
+def _do_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            _pending(orm_execute_state.session).add(table.name)
+
+
+def _after_commit(session):
+    changed = session.info.pop('changed_tables', None)
+    if changed:
+        bump(*changed)
+
+
+def _after_rollback(session):
+    session.info.pop('changed_tables', None)
+
+
+def install():
+    """Listen on all ORM sessions (idempotent)"""
+    global _installed
+    if _installed:
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'do_orm_execute', _do_orm_execute)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+    _installed = True
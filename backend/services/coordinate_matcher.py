@@ -0,0 +1,113 @@
+"""
+GBMS - Project Title Matcher
+글로벌사업처 해외사업관리시스템 - KRC 데이터와 사업 매칭
+
+Matches external records (country + project name) to Project rows. Candidates
+are loaded once, blocked by country and indexed by character bigrams, so each
+lookup only scores projects of the same country that share at least one
+bigram. Scores are Dice coefficients over bigram sets (robust for Korean
+titles, which have few whitespace-separated tokens).
+
+Containment scores 1.0: a KRC description that contains a project's title
+(or whose first PREFIX_LENGTH characters appear in the title, the old
+substring rule) is a match even when the rest of a long description drags
+its Dice score below min_score. Only titles take part, and the contained
+text needs MIN_CONTAINED_LENGTH characters: short generic titles
+('관개사업') and project descriptions are scored by Dice only.
+"""
+import re
+from collections import defaultdict, namedtuple
+
+MatchResult = namedtuple('MatchResult', ['status', 'project_id', 'score', 'candidates'])
+# status: 'matched', 'ambiguous' or 'unmatched'
+# candidates: [(project_id, score), ...] best first (top 3)
+
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+
+PREFIX_LENGTH = 20  # leading characters of the searched text looked up as a substring
+MIN_CONTAINED_LENGTH = 8  # shorter texts are too generic to count as contained
+
+
+def normalize(text):
+    """Lowercase and drop whitespace/punctuation"""
+    return _NON_WORD.sub('', (text or '').lower())
+
+
+def bigrams(text):
+    text = normalize(text)
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def contains(text, part):
+    return len(part) >= MIN_CONTAINED_LENGTH and part in text
+
+
+class CoordinateMatcher:
+    """Country-blocked bigram index over candidate projects"""
+
+    def __init__(self, candidates, min_score=0.6, margin=0.05):
+        """candidates: iterable of (project_id, country, [title, other text, ...])
+
+        The first text is the title, the only one used for containment. A match needs score >= min_score; if another project scores within
+        margin of the best one the result is reported as ambiguous.
+        """
+        self.min_score = min_score
+        self.margin = margin
+        self._entries = []  # (project_id, normalized text, bigram set, is title)
+        self._exact = defaultdict(dict)  # country -> normalized text -> project ids
+        self._index = defaultdict(lambda: defaultdict(list))  # country -> bigram -> entry ids
+
+        for project_id, country, texts in candidates:
+            country = (country or '').strip()
+            for position, text in enumerate(texts):
+                grams = bigrams(text)
+                if not grams:
+                    continue
+                entry_id = len(self._entries)
+                key = normalize(text)
+                self._entries.append((project_id, key, grams, position == 0))
+                self._exact[country].setdefault(key, set()).add(project_id)
+                for gram in grams:
+                    self._index[country][gram].append(entry_id)
+
+    def match(self, country, text):
+        country = (country or '').strip()
+        key = normalize(text)
+        grams = bigrams(text)
+        if not grams:
+            return MatchResult('unmatched', None, 0.0, [])
+
+        exact = self._exact.get(country, {}).get(key)
+        if exact and len(exact) == 1:
+            project_id = next(iter(exact))
+            return MatchResult('matched', project_id, 1.0, [(project_id, 1.0)])
+
+        # Count shared bigrams per entry through the inverted index
+        shared = defaultdict(int)
+        country_index = self._index.get(country, {})
+        for gram in grams:
+            for entry_id in country_index.get(gram, ()):
+                shared[entry_id] += 1
+
+        prefix = key[:PREFIX_LENGTH]
+        best = {}
+        for entry_id, count in shared.items():
+            project_id, entry_key, entry_grams, is_title = self._entries[entry_id]
+            if is_title and (contains(entry_key, prefix) or contains(key, entry_key)):
+                score = 1.0
+            else:
+                score = 2.0 * count / (len(grams) + len(entry_grams))
+            if score > best.get(project_id, 0.0):
+                best[project_id] = score
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:3]
+        if not ranked or ranked[0][1] < self.min_score:
+            return MatchResult('unmatched', None, ranked[0][1] if ranked else 0.0, ranked)
+
+        project_id, score = ranked[0]
+        if len(ranked) > 1 and ranked[1][1] >= score - self.margin:
+            return MatchResult('ambiguous', None, score, ranked)
+
+        return MatchResult('matched', project_id, score, ranked)
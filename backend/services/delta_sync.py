@@ -0,0 +1,108 @@
+"""
+GBMS - Delta Sync
+글로벌사업처 해외사업관리시스템 - ?since= 증분 동기화
+
+List endpoints return a version token with every full response. A client
+that keeps the rows locally (IndexedDB) sends it back as ?since=<version>
+and receives only the rows changed after it, plus the ids deleted since
+(from the tombstones table), and a new token.
+
+The token is the server time when the response was built. Changes are
+selected with updated_at > token - DELTA_SYNC_OVERLAP_SECONDS: a
+transaction stamps updated_at before it commits, so a row can become
+visible after a token later than its stamp was issued. The overlap makes
+clients receive such rows (and a few they already have) again; applying a
+delta is idempotent. Tokens older than DELTA_SYNC_TOMBSTONE_DAYS can miss
+deletes (tombstones are purged by the job workers), so those requests get
+the full list (full=true) and the client replaces its copy.
+
+Writes must move updated_at forward: the column's onupdate does it for ORM
+changes and SQLAlchemy UPDATE statements (bulk ones included); raw SQL
+has to set it. Deletes must call record_deletes().
+"""
+from datetime import datetime, timedelta
+from flask import current_app, request
+from models import db, Tombstone
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class InvalidVersion(ValueError):
+    """?since= is not a version token issued by this server"""
+
+
+def new_version():
+    """Version token for a response built now"""
+    return str((datetime.utcnow() - _EPOCH) // timedelta(microseconds=1))
+
+
+def requested_since():
+    """?since= as a datetime, or None for a full response.
+
+    Raises InvalidVersion for a malformed token. Returns None (full
+    response) for a token older than the tombstone retention.
+    """
+    value = request.args.get('since')
+    if not value:
+        return None
+    try:
+        since = _EPOCH + timedelta(microseconds=int(value))
+    except (ValueError, OverflowError):
+        raise InvalidVersion(value)
+    if since > datetime.utcnow() + timedelta(minutes=5):
+        raise InvalidVersion(value)
+    if since < _retention_start():
+        return None
+    return since
+
+
+def changed_after(since):
+    """Lower bound for updated_at / deleted_at in a delta for since"""
+    return since - timedelta(seconds=current_app.config['DELTA_SYNC_OVERLAP_SECONDS'])
+
+
+def delta(model, query, since):
+    """(rows, removed_ids) for a delta response.
+
+    query is the endpoint's filtered query. rows are the changed rows that
+    match it. removed_ids are rows deleted since, plus changed rows that no
+    longer match the filters (the client drops them from its copy).
+    """
+    cutoff = changed_after(since)
+    rows = query.filter(model.updated_at > cutoff).order_by(model.id).all()
+    matching = {row.id for row in rows}
+    changed = db.session.scalars(db.select(model.id).where(model.updated_at > cutoff))
+    removed = {record_id for record_id in changed if record_id not in matching}
+    removed.update(deleted_ids(model.__tablename__, since))
+    return rows, sorted(removed)
+
+
+def deleted_ids(table, since):
+    return db.session.scalars(
+        db.select(Tombstone.entity_id).where(
+            Tombstone.entity_type == table,
+            Tombstone.deleted_at > changed_after(since)
+        )
+    ).all()
+
+
+def record_deletes(table, ids):
+    """Leave tombstones for deleted rows of table (caller commits)"""
+    if ids:
+        now = datetime.utcnow()
+        db.session.execute(db.insert(Tombstone), [
+            {'entity_type': table, 'entity_id': record_id, 'deleted_at': now} for record_id in ids
+        ])
+
+
+def _retention_start():
+    return datetime.utcnow() - timedelta(days=current_app.config['DELTA_SYNC_TOMBSTONE_DAYS'])
+
+
+def purge_tombstones():
+    """Remove tombstones past the retention (tokens that old get a full response anyway)"""
+    deleted = db.session.execute(
+        db.delete(Tombstone).where(Tombstone.deleted_at < _retention_start())
+    ).rowcount
+    db.session.commit()
+    return deleted
@@ -0,0 +1,303 @@
+"""
+GBMS - Document Full-text Index
+글로벌사업처 해외사업관리시스템 - 문서 본문 검색 (SQLite FTS5)
+
+document_fts holds one row per document (rowid = documents.id) with the
+title, file name and extracted body text. Title/file name are written
+synchronously on upload; body text is extracted on a process pool and
+filled in when the worker finishes. Documents missing from the index
+(uploaded before it existed) are added at startup by ensure_index and
+their text is extracted by a background job. documents.text_status records
+the outcome of every extraction (indexed, empty, failed), so documents
+without text are not picked up again on every start.
+
+The index needs SQLite; on other databases search falls back to LIKE on
+title and file name, and the write functions here do nothing.
+"""
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from models import db, Document
+from services.text_extraction import extract_text, is_supported
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'document_fts'
+
+# BM25 column weights: title, file_name, content
+RANK_EXPRESSION = f'bm25({FTS_TABLE}, 10.0, 5.0, 1.0)'
+SNIPPET_EXPRESSION = f"snippet({FTS_TABLE}, 2, '<mark>', '</mark>', '…', 16)"
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=current_app.config['DOCUMENT_INDEX_WORKERS'])
+    return _executor
+
+
+def available():
+    """FTS5 exists only on SQLite; other databases search titles/file names with LIKE"""
+    return db.engine.dialect.name == 'sqlite'
+
+
+def ensure_index():
+    """Create the FTS5 table if it does not exist and add rows for documents missing from it.
+
+    Documents uploaded before the index existed get their title/file name
+    rows here (so they are searchable right away). Returns the number of
+    rows added; their body text still has to be extracted (extract_missing).
+    """
+    db.session.execute(db.text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5(title, file_name, content, tokenize='unicode61 remove_diacritics 2')"
+    ))
+    db.session.commit()
+
+    try:
+        added = db.session.execute(db.text(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, file_name, content) "
+            f"SELECT id, COALESCE(title, ''), COALESCE(file_name, ''), '' FROM documents "
+            f"WHERE id NOT IN (SELECT rowid FROM {FTS_TABLE})"
+        )).rowcount
+        db.session.commit()
+    except Exception as e:
+        # another process starting at the same time backfilled first
+        db.session.rollback()
+        logger.warning('문서 검색 색인 보충 실패: %s', e)
+        return 0
+    return added
+
+
+def build_match_query(search):
+    """Turn free text into an FTS5 query: every term must match, as a prefix"""
+    terms = [t.replace('"', '""') for t in search.split() if t.strip()]
+    return ' '.join(f'"{t}"*' for t in terms)
+
+
+def _write_row(doc_id, title, file_name, content):
+    db.session.execute(db.text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :id'), {'id': doc_id})
+    db.session.execute(
+        db.text(f'INSERT INTO {FTS_TABLE} (rowid, title, file_name, content) '
+                f'VALUES (:id, :title, :file_name, :content)'),
+        {'id': doc_id, 'title': title or '', 'file_name': file_name or '', 'content': content or ''}
+    )
+
+
+def update_metadata(document):
+    """Refresh title/file name of a document, keeping its extracted text.
+
+    Runs inside the caller's transaction.
+    """
+    if not available():
+        return
+    updated = db.session.execute(
+        db.text(f'UPDATE {FTS_TABLE} SET title = :title, file_name = :file_name WHERE rowid = :id'),
+        {'id': document.id, 'title': document.title or '', 'file_name': document.file_name or ''}
+    )
+    if updated.rowcount == 0:
+        _write_row(document.id, document.title, document.file_name, '')
+
+
+def remove(doc_id):
+    """Drop a document from the index (inside the caller's transaction)"""
+    if not available():
+        return
+    db.session.execute(db.text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :id'), {'id': doc_id})
+
+
+def _set_text_status(doc_id, status):
+    # Plain SQL: the status is bookkeeping and must not invalidate document caches
+    db.session.execute(
+        db.text('UPDATE documents SET text_status = :status WHERE id = :id'),
+        {'id': doc_id, 'status': status}
+    )
+
+
+def _text_status(content):
+    if content is None:
+        return 'failed'
+    return 'indexed' if content else 'empty'
+
+
+def schedule_extraction(document):
+    """Extract body text in the background and store it when done"""
+    if not available() or not is_supported(document.file_type):
+        return None
+
+    app = current_app._get_current_object()
+    doc_id = document.id
+    future = get_executor().submit(extract_text, document.file_path, document.file_type)
+
+    def store(done):
+        try:
+            content = done.result()
+        except Exception as e:
+            logger.warning('문서 %s 본문 추출 실패: %s', doc_id, e)
+            content = None
+
+        with app.app_context():
+            try:
+                updated = db.session.execute(
+                    db.text(f'UPDATE {FTS_TABLE} SET content = :content WHERE rowid = :id'),
+                    {'id': doc_id, 'content': content or ''}
+                )
+                # Document deleted while extraction was running: nothing to update
+                if updated.rowcount:
+                    _set_text_status(doc_id, _text_status(content))
+                    db.session.commit()
+                else:
+                    db.session.rollback()
+            except Exception as e:
+                db.session.rollback()
+                logger.warning('문서 %s 색인 저장 실패: %s', doc_id, e)
+
+    future.add_done_callback(store)
+    return future
+
+
+def index_document(document):
+    """Index a newly uploaded document: metadata now, body text in the background.
+
+    Must be called after the document row is committed.
+    """
+    if not available():
+        return
+    update_metadata(document)
+    db.session.commit()
+    schedule_extraction(document)
+
+
+def _extract_batches(documents, batch_size):
+    """Extract body text on the process pool, batch_size documents at a time.
+
+    Yields lists of (document, content, text_status); content is None when
+    the file type is not supported, the file is missing or extraction failed.
+    """
+    executor = get_executor()
+    for start in range(0, len(documents), batch_size):
+        batch = documents[start:start + batch_size]
+        futures = {}
+        for document in batch:
+            if is_supported(document.file_type) and os.path.exists(document.file_path):
+                futures[document.id] = executor.submit(extract_text, document.file_path, document.file_type)
+
+        results = []
+        for document in batch:
+            content = None
+            status = 'empty'
+            future = futures.get(document.id)
+            if future is not None:
+                try:
+                    content = future.result()
+                    status = _text_status(content)
+                except Exception as e:
+                    logger.warning('문서 %s 본문 추출 실패: %s', document.id, e)
+                    status = 'failed'
+            elif is_supported(document.file_type):
+                status = 'failed'  # file missing on disk
+            results.append((document, content, status))
+        yield results
+
+
+def rebuild(batch_size=50):
+    """Re-extract every document synchronously on the process pool.
+
+    Returns (indexed, skipped) counts.
+    """
+    db.session.execute(db.text(f'DELETE FROM {FTS_TABLE}'))
+    db.session.commit()
+
+    indexed = 0
+    skipped = 0
+    documents = Document.query.order_by(Document.id).all()
+
+    for results in _extract_batches(documents, batch_size):
+        for document, content, status in results:
+            if content is None:
+                skipped += 1
+            else:
+                indexed += 1
+            _write_row(document.id, document.title, document.file_name, content)
+            _set_text_status(document.id, status)
+        db.session.commit()
+
+    return indexed, skipped
+
+
+def extract_missing(batch_size=50, progress=None):
+    """Extract body text for indexed documents that have none yet (e.g. after ensure_index backfilled them).
+
+    Documents already tried (text_status set, even if the text came out
+    empty or extraction failed) are left alone; rebuild() retries them.
+    progress(percent, message, indexed=, skipped=) is called after each batch's
+    commit. Returns (indexed, skipped).
+    """
+    missing = db.session.scalars(db.text(
+        f"SELECT f.rowid FROM {FTS_TABLE} f JOIN documents d ON d.id = f.rowid "
+        f"WHERE f.content = '' AND d.text_status IS NULL"
+    )).all()
+    documents = Document.query.filter(Document.id.in_(missing)).order_by(Document.id).all() if missing else []
+
+    indexed = 0
+    skipped = 0
+    for results in _extract_batches(documents, batch_size):
+        for document, content, status in results:
+            _set_text_status(document.id, status)
+            if not content:
+                skipped += 1
+                continue
+            db.session.execute(
+                db.text(f'UPDATE {FTS_TABLE} SET content = :content WHERE rowid = :id'),
+                {'id': document.id, 'content': content}
+            )
+            indexed += 1
+        db.session.commit()
+        if progress:
+            done = indexed + skipped
+            progress(done * 100 // len(documents), f'{done}/{len(documents)}개 문서 본문 색인',
+                     indexed=indexed, skipped=skipped)
+
+    return indexed, skipped
+
+
+def apply_search(query, search):
+    """Restrict a Document query to search hits, best matches first.
+
+    Full-text hits (title, file name, body; terms match as prefixes) come
+    first by BM25 rank. Title/file name infix matches (LIKE) are kept as
+    well: the unicode61 tokenizer splits on spaces only, so '개발' would not
+    find '농업개발' through FTS. Without FTS5 (not SQLite) only LIKE is used.
+
+    Adds a 'snippet' column (None for LIKE-only hits), so the query yields
+    (Document, snippet) rows.
+    """
+    like_match = db.or_(
+        Document.title.ilike(f'%{search}%'),
+        Document.file_name.ilike(f'%{search}%')
+    )
+    if not available():
+        return query.filter(like_match).add_columns(
+            db.null().label('snippet')
+        ).order_by(Document.created_at.desc())
+
+    hits = db.select(
+        db.literal_column('rowid').label('doc_id'),
+        db.literal_column(SNIPPET_EXPRESSION).label('snippet'),
+        db.literal_column(RANK_EXPRESSION).label('rank')
+    ).select_from(db.text(FTS_TABLE)).where(
+        db.text(f'{FTS_TABLE} MATCH :match').bindparams(match=build_match_query(search))
+    ).subquery('fts_hits')
+
+    return query.outerjoin(hits, hits.c.doc_id == Document.id).filter(
+        db.or_(hits.c.doc_id.isnot(None), like_match)
+    ).add_columns(
+        hits.c.snippet
+    ).order_by(
+        hits.c.rank.is_(None),
+        hits.c.rank,
+        Document.created_at.desc()
+    )
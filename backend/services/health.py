@@ -0,0 +1,89 @@
+"""
+GBMS - Readiness Checks
+글로벌사업처 해외사업관리시스템 - 준비 상태(readiness) 점검
+
+Each check returns a dict with 'status' ('ok', 'warn' or 'fail') and its own
+timing or details. The worker is ready when no check fails; a 'warn' (large
+WAL, disk getting full) is reported but still lets traffic in.
+"""
+import os
+import time
+import shutil
+from flask import current_app
+from sqlalchemy import text
+from models import db
+from services import response_cache
+
+
+def _timed(check):
+    started = time.perf_counter()
+    try:
+        result = check()
+    except Exception as e:
+        result = {'status': 'fail', 'error': str(e)}
+    result['durationMs'] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def check_database():
+    db.session.execute(text('SELECT id FROM users LIMIT 1')).first()
+    db.session.rollback()  # do not keep a read transaction open on the pooled connection
+    return {'status': 'ok'}
+
+
+def check_wal():
+    """WAL file size and checkpoint lag (frames not yet copied back to the DB file).
+
+    Lag comes from a PASSIVE checkpoint, which never waits for readers or
+    writers, so it is safe to run from a probe.
+    """
+    url = db.engine.url
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        return {'status': 'ok', 'skipped': 'not a SQLite file database'}
+
+    wal_path = url.database + '-wal'
+    wal_bytes = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+
+    with db.engine.connect() as conn:
+        busy, log_frames, checkpointed = conn.exec_driver_sql('PRAGMA wal_checkpoint(PASSIVE)').one()
+    lag = max(0, log_frames - checkpointed) if log_frames >= 0 else 0
+
+    config = current_app.config
+    status = 'ok'
+    if wal_bytes > config['HEALTH_WAL_WARN_BYTES'] or lag > config['HEALTH_WAL_WARN_FRAMES']:
+        status = 'warn'
+    return {'status': status, 'walBytes': wal_bytes, 'checkpointLagFrames': lag, 'busy': bool(busy)}
+
+
+def check_disk():
+    usage = shutil.disk_usage(current_app.config['UPLOAD_FOLDER'])
+    free_mb = usage.free // (1024 * 1024)
+    config = current_app.config
+
+    status = 'ok'
+    if free_mb < config['HEALTH_MIN_FREE_DISK_MB']:
+        status = 'fail'
+    elif free_mb < config['HEALTH_MIN_FREE_DISK_MB'] * 4:
+        status = 'warn'
+    return {'status': status, 'freeMb': free_mb, 'totalMb': usage.total // (1024 * 1024)}
+
+
+def check_cache():
+    warmup = response_cache.warmup_status()
+    status = 'ok' if warmup['state'] in ('done', 'skipped') else 'fail'
+    if warmup['state'] == 'failed':
+        # a broken warm-up must not keep the worker out of rotation forever
+        status = 'warn'
+    return {'status': status, **warmup}
+
+
+def readiness():
+    """(ready, checks)"""
+    checks = {
+        'database': _timed(check_database),
+        'wal': _timed(check_wal),
+        'disk': _timed(check_disk),
+        'cache': _timed(check_cache),
+    }
+    ready = all(check['status'] != 'fail' for check in checks.values())
+    return ready, checks
@@ -0,0 +1,247 @@
+"""
+GBMS - Background Jobs
+글로벌사업처 해외사업관리시스템 - 백그라운드 작업 대기열
+
+Long operations (Excel upload/export, bulk delete, KRC imports) can be queued
+in the jobs table instead of holding a request worker and the SQLite write
+lock for their whole duration. The route answers 202 with the job id. The
+worker processes (scripts/run_job_worker.py) claim queued jobs one at a time
+and run the handler registered for the job type.
+
+A handler receives a JobContext. progress() records the percentage and
+commits the session, so handlers call it between units of work: the commit
+also releases the write lock between chunks. Counts passed to progress()
+(imported=..., deleted=...) describe the work committed so far; they are
+stored as the job's result in the same commit, so a job that fails halfway
+still reports what it already wrote. A handler that produces a file
+writes it to result_file(); the finished job then gets a download token,
+and GET /api/jobs/download/<token> serves the file for JOB_RESULT_TTL seconds.
+
+A job that stops reporting progress for JOB_STALE_SECONDS (its worker was
+killed) is queued again, up to JOB_MAX_ATTEMPTS runs. The next run starts
+the handler from the beginning, so handlers must be idempotent: skip rows
+that already exist (uploads), act on what is still there (deletes) or
+rewrite the same values (coordinates, text index).
+"""
+import os
+import json
+import time
+import uuid
+import secrets
+import logging
+from datetime import datetime, timedelta
+from flask import current_app, request
+from sqlalchemy import select, update
+from models import db, Job
+from services import delta_sync, token_revocation
+
+log = logging.getLogger(__name__)
+
+_handlers = {}  # job_type -> function(JobContext) -> result dict
+
+
+def handler(job_type):
+    """Register the function that runs jobs of this type"""
+    def register(func):
+        _handlers[job_type] = func
+        return func
+    return register
+
+
+def async_requested():
+    """?async=true or 'Prefer: respond-async' on the current request"""
+    if request.args.get('async', '').lower() in ('1', 'true'):
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+
+def job_folder():
+    folder = current_app.config['JOB_FOLDER']
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _new_path(filename):
+    extension = os.path.splitext(filename or '')[1].lower()
+    return os.path.join(job_folder(), f'{uuid.uuid4().hex}{extension}')
+
+
+def save_input(file_storage):
+    """Keep an uploaded file for the worker; returns its path"""
+    path = _new_path(file_storage.filename)
+    file_storage.save(path)
+    return path
+
+
+def enqueue(job_type, params=None, user_id=None, input_path=None):
+    """Add a queued job (caller commits)"""
+    job = Job(
+        job_type=job_type,
+        status='queued',
+        params=json.dumps(params or {}, ensure_ascii=False),
+        input_path=input_path,
+        created_by=user_id
+    )
+    db.session.add(job)
+    return job
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+class JobContext:
+    """What a handler gets: params, the requesting user, progress and result file"""
+
+    def __init__(self, job):
+        self.job = job
+        self.job_id = job.id
+        self.params = json.loads(job.params or '{}')
+        self.user_id = job.created_by
+        self.input_path = job.input_path
+        self.partial = {}
+
+    def progress(self, percent, message=None, **counts):
+        """Record progress and commit (the handler's pending work is committed too).
+
+        counts (e.g. imported=120) are the work committed so far; they become the
+        job's result if the handler fails later.
+        """
+        self.job.progress = max(0, min(100, int(percent)))
+        if message is not None:
+            self.job.message = message[:500]
+        if counts:
+            self.partial.update(counts)
+            self.job.result = json.dumps({**self.partial, 'complete': False}, ensure_ascii=False)
+        self.job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+
+    def result_file(self, filename):
+        """Path to write the downloadable result to; filename is what the user downloads"""
+        self.job.result_path = _new_path(filename)
+        self.job.result_name = filename
+        return self.job.result_path
+
+
+def claim(worker_id):
+    """Mark the oldest queued job as running for this worker; None when the queue is empty"""
+    while True:
+        job_id = db.session.scalar(
+            select(Job.id).where(Job.status == 'queued').order_by(Job.id).limit(1)
+        )
+        if job_id is None:
+            db.session.rollback()
+            return None
+
+        now = datetime.utcnow()
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'queued')
+            .values(status='running', worker=worker_id, started_at=now, heartbeat_at=now,
+                    progress=0, result=None, attempts=Job.attempts + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id)
+        # another worker took it first; try the next one
+
+
+def _remove(path):
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def run(job):
+    """Run one claimed job to completion and record the outcome"""
+    job_id = job.id
+    func = _handlers.get(job.job_type)
+    try:
+        if func is None:
+            raise ValueError(f'알 수 없는 작업 유형입니다: {job.job_type}')
+        result = func(JobContext(job))
+    except Exception as e:
+        log.exception('Job %s (%s) failed', job_id, job.job_type)
+        db.session.rollback()
+        # result keeps the counts of the last progress() commit
+        job = db.session.get(Job, job_id)
+        _remove(job.result_path)
+        job.status = 'failed'
+        job.error = str(e)
+        job.result_path = None
+    else:
+        job.status = 'done'
+        job.progress = 100
+        job.result = json.dumps(result or {}, ensure_ascii=False, default=str)
+        if job.result_path:
+            job.download_token = secrets.token_urlsafe(32)
+
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    _remove(job.input_path)
+    return job
+
+
+def requeue_stale():
+    """Give jobs whose worker stopped reporting back to the queue (or fail them)"""
+    config = current_app.config
+    cutoff = datetime.utcnow() - timedelta(seconds=config['JOB_STALE_SECONDS'])
+    stale = Job.query.filter(Job.status == 'running', Job.heartbeat_at < cutoff).all()
+    for job in stale:
+        if job.attempts < config['JOB_MAX_ATTEMPTS']:
+            job.status = 'queued'
+            job.message = '작업자가 응답하지 않아 다시 대기열에 넣었습니다.'
+        else:
+            job.status = 'failed'
+            job.error = '작업자가 응답하지 않아 작업이 중단되었습니다.'
+            job.finished_at = datetime.utcnow()
+    db.session.commit()
+    return len(stale)
+
+
+def purge_expired():
+    """Delete finished jobs (and their files) older than JOB_RESULT_TTL"""
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['JOB_RESULT_TTL'])
+    expired = Job.query.filter(
+        Job.status.in_(('done', 'failed', 'cancelled')),
+        Job.finished_at < cutoff
+    ).all()
+    for job in expired:
+        _remove(job.result_path)
+        _remove(job.input_path)
+        db.session.delete(job)
+    db.session.commit()
+    return len(expired)
+
+
+def download_expired(job):
+    ttl = timedelta(seconds=current_app.config['JOB_RESULT_TTL'])
+    return job.finished_at is None or job.finished_at + ttl < datetime.utcnow()
+
+
+def work(worker_id, once=False):
+    """Worker loop (needs an app context). With once=True, stop when the queue is empty."""
+    config = current_app.config
+    last_maintenance = 0
+    while True:
+        if time.monotonic() - last_maintenance >= 60:
+            requeue_stale()
+            purge_expired()
+            delta_sync.purge_tombstones()
+            token_revocation.purge_expired()
+            last_maintenance = time.monotonic()
+
+        job = claim(worker_id)
+        if job is None:
+            if once:
+                return
+            time.sleep(config['JOB_POLL_SECONDS'])
+            continue
+
+        log.info('Job %s (%s) started on %s', job.id, job.job_type, worker_id)
+        job = run(job)
+        log.info('Job %s finished: %s', job.id, job.status)
+        db.session.remove()
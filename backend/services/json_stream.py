@@ -0,0 +1,138 @@
+"""
+GBMS - Streaming JSON Reader
+글로벌사업처 해외사업관리시스템 - 대용량 JSON 배열 스트리밍
+
+Reads the items of a top-level JSON array one at a time, so memory use
+stays flat regardless of file size. Uses ijson when installed and a
+json.JSONDecoder.raw_decode based reader otherwise.
+"""
+import json
+import queue
+import threading
+from itertools import islice
+
+READ_SIZE = 64 * 1024
+
+_END = object()
+
+
+def _iter_raw_decode(f, read_size):
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(read_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip(chars):
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    fill()
+    skip(' \t\r\n')
+    if pos >= len(buf) or buf[pos] != '[':
+        raise ValueError('JSON 배열 형식이 아닙니다.')
+    pos += 1
+
+    while True:
+        skip(' \t\r\n,')
+        if pos >= len(buf):
+            raise ValueError('JSON 배열이 닫히지 않았습니다.')
+        if buf[pos] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+            # A value ending exactly at the buffer edge may be truncated (e.g. a number)
+            if end == len(buf) and not eof:
+                raise json.JSONDecodeError('incomplete', buf, end)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+
+        pos = end
+        yield item
+
+        # Drop consumed text now and then so the buffer stays small
+        if pos > read_size:
+            buf = buf[pos:]
+            pos = 0
+
+
+def iter_json_array(path, read_size=READ_SIZE):
+    """Yield the items of a JSON file whose top level is an array"""
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from _iter_raw_decode(f, read_size)
+
+
+def batched(iterable, size):
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def prefetch(iterable, depth=4):
+    """Produce items on a background thread so parsing overlaps with consumption.
+
+    At most depth items are buffered; exceptions from the producer are
+    re-raised in the consumer.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    return
+                buffer.put(item)
+            buffer.put(_END)
+        except Exception as e:
+            buffer.put(e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Unblock the producer if it is waiting on a full queue
+        while thread.is_alive():
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                thread.join(0.05)
@@ -0,0 +1,73 @@
+"""
+GBMS - Login Throttle
+글로벌사업처 해외사업관리시스템 - 로그인 시도 제한
+
+Failed password checks are kept in in-memory sliding windows, one per client
+IP and one per account. Once a window is full, further attempts from that
+IP or for that account get 429 with Retry-After until the oldest failure
+leaves the window. A successful login clears the account's window.
+
+Only failures count, so a whole office behind one NAT address can still log
+in at 9am; the per-IP limit is set higher than the per-account limit for the
+same reason. State is per process and bounded to LOGIN_THROTTLE_MAX_KEYS
+keys (least recently used are dropped).
+"""
+import time
+import threading
+from collections import OrderedDict, deque
+from flask import current_app
+
+_windows = OrderedDict()  # (kind, key) -> deque of failure timestamps
+_lock = threading.Lock()
+
+
+def _limits():
+    config = current_app.config
+    return {
+        'ip': (config['LOGIN_MAX_FAILURES_PER_IP'], config['LOGIN_IP_WINDOW_SECONDS']),
+        'account': (config['LOGIN_MAX_FAILURES_PER_ACCOUNT'], config['LOGIN_ACCOUNT_WINDOW_SECONDS']),
+    }
+
+
+def _prune(window, period, now):
+    while window and window[0] <= now - period:
+        window.popleft()
+
+
+def retry_after(ip, account):
+    """Seconds until another attempt is allowed, or 0 when not throttled"""
+    now = time.monotonic()
+    wait = 0
+    with _lock:
+        for kind, key in (('ip', ip), ('account', account)):
+            window = _windows.get((kind, key))
+            if not window:
+                continue
+            limit, period = _limits()[kind]
+            _prune(window, period, now)
+            if len(window) >= limit:
+                wait = max(wait, window[0] + period - now)
+    return int(wait) + 1 if wait else 0
+
+
+def record_failure(ip, account):
+    now = time.monotonic()
+    max_keys = current_app.config['LOGIN_THROTTLE_MAX_KEYS']
+    with _lock:
+        for kind, key in (('ip', ip), ('account', account)):
+            if not key:
+                continue
+            limit, period = _limits()[kind]
+            window = _windows.get((kind, key))
+            if window is None:
+                window = _windows[(kind, key)] = deque(maxlen=limit)
+            _prune(window, period, now)
+            window.append(now)
+            _windows.move_to_end((kind, key))
+        while len(_windows) > max_keys:
+            _windows.popitem(last=False)
+
+
+def record_success(account):
+    with _lock:
+        _windows.pop(('account', account), None)
@@ -0,0 +1,229 @@
+"""
+GBMS - Metrics
+글로벌사업처 해외사업관리시스템 - Prometheus 형식 운영 지표
+
+A small in-process registry (counters, gauges, histograms with labels) that
+renders the Prometheus text exposition format for GET /metrics. Request
+latency, response size, in-flight requests and active uploads are recorded
+from before/after/teardown request hooks. DB pool checkout wait is timed
+around pool.connect, and SQLite busy/locked errors are counted from the
+engine's handle_error event. Caches report hits and misses with
+cache_hit()/cache_miss().
+
+Values are per process: behind a multi-worker server, scrape every worker,
+or aggregate the results in Prometheus. Scrapes are allowed with the
+METRICS_TOKEN bearer token or from METRICS_ALLOWED_IPS (see scrape_allowed).
+"""
+import hmac
+import time
+import bisect
+import threading
+from flask import g, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+
+# Endpoints whose in-flight requests count as active uploads
+UPLOAD_ENDPOINTS = {'documents.upload_document', 'consulting.upload_consulting_projects'}
+
+_registry = []
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.extend(self._render_value(labels, value))
+        return lines
+
+    def _render_value(self, labels, value):
+        return [f'{self.name}{_format_labels(self.label_names, labels)} {value}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_value(self, labels, value):
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{self.name}_bucket{_format_labels(self.label_names, labels, ("le", le))} {cumulative}')
+        label_text = _format_labels(self.label_names, labels)
+        lines.append(f'{self.name}_sum{label_text} {total}')
+        lines.append(f'{self.name}_count{label_text} {count}')
+        return lines
+
+
+request_duration = Histogram(
+    'gbms_http_request_duration_seconds', 'HTTP request latency',
+    labels=('blueprint', 'route', 'method', 'status'))
+response_size = Histogram(
+    'gbms_http_response_size_bytes', 'HTTP response body size (when known)',
+    labels=('blueprint', 'route'), buckets=SIZE_BUCKETS)
+requests_in_flight = Gauge('gbms_http_requests_in_flight', 'Requests currently being handled')
+uploads_in_progress = Gauge('gbms_uploads_in_progress', 'File uploads currently being processed', labels=('endpoint',))
+pool_checkout_wait = Histogram(
+    'gbms_db_pool_checkout_seconds', 'Time to obtain a pooled DB connection (includes pre-ping)',
+    buckets=POOL_WAIT_BUCKETS)
+sqlite_busy = Counter(
+    'gbms_db_sqlite_busy_total', 'SQLite "database is locked/busy" errors after the driver timeout',
+    labels=('endpoint',))
+cache_requests = Counter('gbms_cache_requests_total', 'Cache lookups', labels=('cache', 'result'))
+change_feed_subscribers = Gauge('gbms_change_feed_subscribers', 'Open change feed (SSE/long-poll) connections')
+
+
+def cache_hit(cache):
+    cache_requests.inc(cache, 'hit')
+
+
+def cache_miss(cache):
+    cache_requests.inc(cache, 'miss')
+
+
+def render():
+    """All metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def _route_labels():
+    rule = request.url_rule
+    return request.blueprint or '', rule.rule if rule is not None else '<unmatched>'
+
+
+def _instrument_pool(engine):
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+def _on_db_error(context):
+    message = str(context.original_exception).lower()
+    if 'database is locked' in message or 'database is busy' in message:
+        try:
+            endpoint = request.endpoint or ''
+        except RuntimeError:
+            endpoint = '<background>'
+        sqlite_busy.inc(endpoint)
+
+
+def scrape_allowed(config):
+    """Bearer METRICS_TOKEN, or a direct request from METRICS_ALLOWED_IPS.
+
+    Requests carrying X-Forwarded-For came through the reverse proxy, whose
+    address would otherwise pass the allowlist for every client.
+    """
+    token = config.get('METRICS_TOKEN')
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    if token and scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), token.encode()):
+        return True
+    if 'X-Forwarded-For' in request.headers:
+        return False
+    return request.remote_addr in config.get('METRICS_ALLOWED_IPS', ())
+
+
+def init_app(app, db):
+    """Register request hooks and DB instrumentation (call inside an app context)"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    engine = db.engine
+    _instrument_pool(engine)
+    event.listen(engine, 'handle_error', _on_db_error)
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        requests_in_flight.inc()
+        if request.endpoint in UPLOAD_ENDPOINTS:
+            g.metrics_upload = request.endpoint
+            uploads_in_progress.inc(request.endpoint)
+
+    @app.after_request
+    def record_response_metrics(response):
+        g.metrics_status = response.status_code
+        if not response.is_streamed and response.content_length is not None:
+            response_size.observe(response.content_length, *_route_labels())
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        requests_in_flight.dec()
+        upload = g.pop('metrics_upload', None)
+        if upload:
+            uploads_in_progress.dec(upload)
+        status = g.get('metrics_status', 500)
+        request_duration.observe(time.perf_counter() - started, *_route_labels(), request.method, str(status))
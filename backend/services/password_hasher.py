@@ -0,0 +1,113 @@
+"""
+GBMS - Password Hashing Service
+글로벌사업처 해외사업관리시스템 - 비밀번호 해시 처리
+
+Password hashing is deliberately CPU-heavy. Doing it inline lets a burst of
+logins occupy every request worker. Here verification and hashing run on a
+small process pool (PASSWORD_HASH_WORKERS) instead. At most
+PASSWORD_HASH_MAX_PENDING jobs can be queued. When the queue stays full for
+PASSWORD_HASH_QUEUE_TIMEOUT seconds, HasherBusy is raised and the route
+answers 503 with Retry-After. The rest of the API keeps its workers either way.
+Workers are started with forkserver (spawn where that is unavailable), not
+fork: forking a threaded server process can copy locks held by other threads.
+
+Hashes that do not use PASSWORD_HASH_METHOD are rehashed after a successful
+login (verify_and_update), so changing the method takes effect gradually.
+"""
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+_executor = None
+_slots = None
+_init_lock = threading.Lock()
+
+
+class HasherBusy(Exception):
+    """The hashing queue is full; the caller should retry later"""
+
+
+# ---------------------------------------------------------------------------
+# Work functions (run in worker processes)
+# ---------------------------------------------------------------------------
+
+def _check(password_hash, password):
+    return check_password_hash(password_hash, password)
+
+
+def _generate(password, method):
+    return generate_password_hash(password, method=method)
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def get_executor():
+    global _executor, _slots
+    with _init_lock:
+        if _executor is None:
+            config = current_app.config
+            _executor = ProcessPoolExecutor(max_workers=config['PASSWORD_HASH_WORKERS'],
+                                            mp_context=_mp_context())
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(config['PASSWORD_HASH_MAX_PENDING'])
+    return _executor
+
+
+def _run(func, *args):
+    global _executor
+    executor = get_executor()
+    if not _slots.acquire(timeout=current_app.config['PASSWORD_HASH_QUEUE_TIMEOUT']):
+        raise HasherBusy()
+    try:
+        return executor.submit(func, *args).result()
+    except BrokenProcessPool:
+        # a worker died (OOM, killed): recreate the pool next time, answer inline now
+        with _init_lock:
+            if _executor is executor:
+                _executor = None
+        return func(*args)
+    finally:
+        _slots.release()
+
+
+# ---------------------------------------------------------------------------
+# API
+# ---------------------------------------------------------------------------
+
+def verify(password_hash, password):
+    if not password_hash:
+        return False
+    return _run(_check, password_hash, password)
+
+
+def hash_password(password):
+    return _run(_generate, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def needs_rehash(password_hash):
+    """True when the stored hash was made with a different method/parameters"""
+    method = (password_hash or '').split('$', 1)[0]
+    return method != current_app.config['PASSWORD_HASH_METHOD']
+
+
+def set_password(user, password):
+    user.password_hash = hash_password(password)
+
+
+def verify_and_update(user, password):
+    """Verify the password; on success upgrade an outdated hash (caller commits)"""
+    if not verify(user.password_hash, password):
+        return False
+    if needs_rehash(user.password_hash):
+        set_password(user, password)
+    return True
@@ -0,0 +1,82 @@
+"""
+GBMS - Period Parsing
+글로벌사업처 해외사업관리시스템 - 사업기간 문자열 파싱
+
+KRC data writes dates as two-digit years with an apostrophe: "'72-10"
+(year-month), "'23" (year) and periods as "'23-'28". Two-digit years from
+72 up are 19xx (KRC overseas work starts in 1972), the rest 20xx.
+Pure functions without Flask/DB imports so scripts can use them directly.
+"""
+import re
+import calendar
+from datetime import date, datetime
+from functools import lru_cache
+
+CENTURY_PIVOT = 72
+
+_YEAR_MONTH = re.compile(r"^'?(\d{2}|\d{4})(?:\s*[-./]\s*(\d{1,2}))?$")
+_YEAR_RANGE = re.compile(r"^'?(\d{2}|\d{4})\s*[-~]\s*'?(\d{2}|\d{4})$")
+
+
+def expand_year(year):
+    """'72 -> 1972, '23 -> 2023; four-digit years pass through"""
+    year = int(year)
+    if year >= 100:
+        return year
+    return 1900 + year if year >= CENTURY_PIVOT else 2000 + year
+
+
+@lru_cache(maxsize=8192)
+def parse_period_point(value, end=False):
+    """Parse "'72-10", "'72", "1972-10", "1972.10" or an ISO date/datetime.
+
+    Returns the first day of the month/year, or the last day when end=True
+    (so ranges are inclusive). Unparseable values give None.
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text or text.lower() in ('nan', 'none', '-'):
+        return None
+
+    match = _YEAR_MONTH.match(text)
+    if match:
+        year = expand_year(match.group(1))
+        month = int(match.group(2)) if match.group(2) else None
+        if month is not None and not 1 <= month <= 12:
+            return None
+        if month is None:
+            return date(year, 12, 31) if end else date(year, 1, 1)
+        if end:
+            return date(year, month, calendar.monthrange(year, month)[1])
+        return date(year, month, 1)
+
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=8192)
+def parse_period_range(value, prefer_range=False):
+    """Parse a period like "'23-'28" into (2023-01-01, 2028-12-31).
+
+    "'23-28" and "2019-2023" are ranges too. A second number is read as a
+    month ("'72-10" is a single point) only when it is 1-12 and has no
+    apostrophe; with prefer_range=True (fields that only ever hold year
+    ranges, like the ODA period) "'10-12" is 2010-2012 instead of Dec 2010.
+    Returns (None, None) when nothing can be parsed.
+    """
+    if value is None:
+        return None, None
+    text = str(value).strip()
+
+    match = _YEAR_RANGE.match(text)
+    year_month = _YEAR_MONTH.match(text)
+    is_month = year_month and year_month.group(2) and 1 <= int(year_month.group(2)) <= 12
+    if match and (prefer_range or not is_month):
+        start = expand_year(match.group(1))
+        end = expand_year(match.group(2))
+        return date(start, 1, 1), date(end, 12, 31)
+
+    return parse_period_point(text), parse_period_point(text, end=True)
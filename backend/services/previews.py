@@ -0,0 +1,216 @@
+"""
+GBMS - Document Preview Cache
+글로벌사업처 해외사업관리시스템 - 문서 미리보기(썸네일)
+
+Previews are rendered on a process pool after upload and stored as JPEG in
+PREVIEW_FOLDER, keyed by the blob content hash so identical files share one
+preview. The folder is a size-bounded LRU: serving a preview bumps its mtime
+and the oldest files are evicted once PREVIEW_CACHE_MAX_BYTES is exceeded.
+
+Images need Pillow; PDF first pages additionally need PyMuPDF or poppler's
+pdftoppm on PATH.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+IMAGE_TYPES = {'jpg', 'jpeg', 'png', 'gif'}
+PREVIEW_TYPES = IMAGE_TYPES | {'pdf'}
+
+_executor = None
+_pending = set()
+_failed = set()  # hashes that could not be rendered (no PDF backend, broken file)
+_pending_lock = threading.Lock()
+_evict_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Rendering (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+def _save_thumbnail(image, dest_path, size):
+    from PIL import Image
+
+    image.thumbnail((size, size))
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    # Write next to the target and rename, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest_path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as out:
+        image.save(out, 'JPEG', quality=80, optimize=True)
+    os.replace(tmp_path, dest_path)
+
+
+def _render_pdf_page(src_path, size):
+    """First PDF page as a PIL image, via PyMuPDF or pdftoppm"""
+    from PIL import Image
+
+    try:
+        import fitz
+        with fitz.open(src_path) as pdf:
+            page = pdf.load_page(0)
+            zoom = size / max(page.rect.width, page.rect.height)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            return Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+    except ImportError:
+        pass
+
+    if not shutil.which('pdftoppm'):
+        return None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        prefix = os.path.join(tmp_dir, 'page')
+        subprocess.run(
+            ['pdftoppm', '-f', '1', '-l', '1', '-singlefile', '-png',
+             '-scale-to', str(size), src_path, prefix],
+            check=True, capture_output=True, timeout=60
+        )
+        with Image.open(prefix + '.png') as image:
+            image.load()
+            return image
+
+
+def render_preview(src_path, file_type, dest_path, size):
+    """Render a JPEG preview of an image or the first page of a PDF.
+
+    Returns True when a preview was written.
+    """
+    from PIL import Image
+
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+
+    if file_type in IMAGE_TYPES:
+        with Image.open(src_path) as image:
+            image.seek(0)  # first frame of animated GIFs
+            _save_thumbnail(image.copy(), dest_path, size)
+        return True
+
+    if file_type == 'pdf':
+        image = _render_pdf_page(src_path, size)
+        if image is None:
+            return False
+        _save_thumbnail(image, dest_path, size)
+        return True
+
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Cache management (app process)
+# ---------------------------------------------------------------------------
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=current_app.config['PREVIEW_WORKERS'])
+    return _executor
+
+
+def is_supported(document):
+    return bool(document.content_hash) and (document.file_type or '').lower() in PREVIEW_TYPES
+
+
+def preview_path(content_hash, root=None):
+    root = root or current_app.config['PREVIEW_FOLDER']
+    return os.path.join(root, content_hash[:2], f'{content_hash}.jpg')
+
+
+def lookup(document):
+    """Path of a cached preview (bumping its LRU position), or None"""
+    path = preview_path(document.content_hash)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def evict(root, max_bytes):
+    """Delete least recently used previews until the cache fits in max_bytes"""
+    with _evict_lock:
+        entries = []
+        total = 0
+        for dirpath, dirnames, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        if total <= max_bytes:
+            return 0
+
+        # Evict down to 90% so eviction does not run on every new preview
+        target = max_bytes * 0.9
+        removed = 0
+        for mtime, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def has_failed(document):
+    return document.content_hash in _failed
+
+
+def schedule(document):
+    """Generate a preview in the background if it is not cached yet"""
+    if not is_supported(document) or has_failed(document):
+        return None
+
+    content_hash = document.content_hash
+    dest_path = preview_path(content_hash)
+    if os.path.exists(dest_path):
+        return None
+
+    with _pending_lock:
+        if content_hash in _pending:
+            return None
+        _pending.add(content_hash)
+
+    config = current_app.config
+    root = config['PREVIEW_FOLDER']
+    max_bytes = config['PREVIEW_CACHE_MAX_BYTES']
+    future = get_executor().submit(
+        render_preview, document.file_path, document.file_type.lower(), dest_path, config['PREVIEW_SIZE']
+    )
+
+    def done(finished):
+        try:
+            rendered = finished.result()
+        except Exception as e:
+            logger.warning('미리보기 생성 실패 (%s): %s', content_hash, e)
+            rendered = False
+
+        with _pending_lock:
+            _pending.discard(content_hash)
+            if not rendered:
+                _failed.add(content_hash)
+
+        if rendered:
+            evict(root, max_bytes)
+
+    future.add_done_callback(done)
+    return future
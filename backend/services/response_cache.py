@@ -0,0 +1,120 @@
+"""
+GBMS - Response Cache
+글로벌사업처 해외사업관리시스템 - GIS/대시보드 응답 캐시
+
+Aggregate endpoints (GIS map data, dashboard statistics) are cached as
+serialized JSON per process. Each entry remembers the change_tracking
+versions of the tables it reads, so a committed write to any of them
+invalidates it at once; RESPONSE_CACHE_TTL bounds staleness from writes
+this process cannot see. Concurrent misses for one key compute once.
+
+register_warmup() lists the responses to precompute. start_warmup() runs
+them in a background thread after startup; the readiness probe reports
+not-ready until it finishes, so the first request after a restart does not
+pay for the cold path. Only the serving process starts it (app.init_background);
+elsewhere the state stays 'skipped'.
+"""
+import time
+import threading
+import logging
+from collections import OrderedDict
+from flask import current_app, request
+from services import change_tracking, metrics
+
+logger = logging.getLogger(__name__)
+
+_entries = OrderedDict()  # key -> (versions, expires_at, body)
+_lock = threading.Lock()
+_key_locks = {}
+_warmers = []
+_warmup = {'state': 'skipped', 'entries': 0, 'durationMs': None, 'error': None}
+
+
+def _key_lock(key):
+    with _lock:
+        lock = _key_locks.get(key)
+        if lock is None:
+            lock = _key_locks[key] = threading.Lock()
+        return lock
+
+
+def _lookup(key, versions):
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry[0] == versions and entry[1] > time.monotonic():
+            _entries.move_to_end(key)
+            return entry[2]
+    return None
+
+
+def _store(key, versions, body):
+    config = current_app.config
+    with _lock:
+        _entries[key] = (versions, time.monotonic() + config['RESPONSE_CACHE_TTL'], body)
+        _entries.move_to_end(key)
+        while len(_entries) > config['RESPONSE_CACHE_MAX_ENTRIES']:
+            old_key, _ = _entries.popitem(last=False)
+            _key_locks.pop(old_key, None)
+
+
+def cached_json(name, tables, builder, key=()):
+    """JSON response for builder() (a dict), served from cache while tables are unchanged.
+
+    The key combines name, the extra key values and the request's query arguments.
+    """
+    cache_key = (name, tuple(key), tuple(sorted(request.args.items(multi=True))))
+    versions = change_tracking.versions(tables)
+
+    body = _lookup(cache_key, versions)
+    if body is None:
+        with _key_lock(cache_key):
+            body = _lookup(cache_key, versions)
+            if body is None:
+                metrics.cache_miss(name)
+                # versions were read before building: a write during the build leaves the entry stale
+                body = current_app.json.response(builder()).get_data()
+                _store(cache_key, versions, body)
+            else:
+                metrics.cache_hit(name)
+    else:
+        metrics.cache_hit(name)
+
+    return current_app.response_class(body, mimetype='application/json')
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _key_locks.clear()
+
+
+def register_warmup(path, func):
+    """func() fills the cache; it is called inside a test request context for path"""
+    _warmers.append((path, func))
+
+
+def warmup_status():
+    return dict(_warmup)
+
+
+def warm_up(app):
+    _warmup.update(state='running', error=None)
+    started = time.perf_counter()
+    try:
+        for path, func in _warmers:
+            with app.test_request_context(path):
+                func()
+        _warmup.update(state='done', entries=len(_entries))
+    except Exception as e:
+        logger.exception('Response cache warm-up failed')
+        _warmup.update(state='failed', error=str(e))
+    finally:
+        _warmup['durationMs'] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def start_warmup(app):
+    if not app.config.get('RESPONSE_CACHE_WARMUP', True):
+        _warmup.update(state='skipped')
+        return
+    _warmup.update(state='pending')
+    threading.Thread(target=warm_up, args=(app,), name='response-cache-warmup', daemon=True).start()
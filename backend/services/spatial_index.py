@@ -0,0 +1,141 @@
+"""
+GBMS - Spatial Index
+글로벌사업처 해외사업관리시스템 - 좌표 격자 인덱스 (반경 검색)
+
+Projects, consulting projects and offices with coordinates are kept per
+process in a fixed grid of GIS_INDEX_CELL_DEGREES cells. A radius query
+only visits the cells overlapping the circle's bounding box (wrapping at
+the antimeridian, widening toward the poles) and computes great-circle
+distances for the points in those cells.
+
+Like the user directory, the index remembers the change_tracking versions
+of the tables it was built from. It is rebuilt on the first query after a
+committed write to any of them, or after GIS_INDEX_TTL for writes from other
+processes. The rebuild reads committed rows through its own session.
+"""
+import math
+import time
+import threading
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy import select, null
+from sqlalchemy.orm import Session
+from models import db, Project, ConsultingProject, Office
+from services import change_tracking
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+TABLES = ('projects', 'consulting_projects', 'offices')
+KINDS = ('project', 'consulting', 'office')
+
+_lock = threading.Lock()
+_index = {'versions': None, 'expires_at': 0, 'cell': None, 'cells': {}, 'count': 0}
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _points():
+    """Compact records for every row with usable coordinates"""
+    sources = (
+        ('project', select(Project.id, Project.latitude, Project.longitude, Project.code,
+                           Project.title, Project.country, Project.status, Project.project_type)),
+        ('consulting', select(ConsultingProject.id, ConsultingProject.latitude, ConsultingProject.longitude,
+                              ConsultingProject.number, ConsultingProject.title_kr, ConsultingProject.country,
+                              ConsultingProject.status, ConsultingProject.project_type)),
+        ('office', select(Office.id, Office.latitude, Office.longitude, null(), Office.name,
+                          Office.country, Office.status, Office.office_type)),
+    )
+    with Session(db.engine) as session:
+        for kind, statement in sources:
+            for row_id, lat, lng, code, title, country, status, row_type in session.execute(statement):
+                if not lat or not lng:
+                    continue  # NULL or 0 means "not located" throughout the GIS code
+                yield {
+                    'kind': kind,
+                    'id': row_id,
+                    'code': code,
+                    'title': title,
+                    'country': country,
+                    'status': status,
+                    'type': row_type,
+                    'lat': float(lat),
+                    'lng': float(lng),
+                }
+
+
+def _cell_of(lat, lng, cell):
+    return int(math.floor(lat / cell)), int(math.floor(lng / cell)) % int(round(360 / cell))
+
+
+def _build(cell):
+    cells = defaultdict(list)
+    count = 0
+    for record in _points():
+        cells[_cell_of(record['lat'], record['lng'], cell)].append(record)
+        count += 1
+    return {'cell': cell, 'cells': dict(cells), 'count': count}
+
+
+def _current():
+    global _index
+    versions = change_tracking.versions(TABLES)
+    index = _index
+    if index['versions'] == versions and index['expires_at'] > time.monotonic():
+        return index
+
+    with _lock:
+        index = _index
+        if index['versions'] != versions or index['expires_at'] <= time.monotonic():
+            config = current_app.config
+            # versions were read before building: a write during the build leaves it stale
+            index = _index = {
+                **_build(config['GIS_INDEX_CELL_DEGREES']),
+                'versions': versions,
+                'expires_at': time.monotonic() + config['GIS_INDEX_TTL'],
+            }
+        return index
+
+
+def _candidate_cells(lat, lng, radius_km, cell):
+    columns = int(round(360 / cell))
+    dlat = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+
+    widest = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+    if lat_max >= 90 or lat_min <= -90 or widest * KM_PER_DEGREE * 180 <= radius_km:
+        column_range = range(columns)  # circle reaches a pole or spans all longitudes
+    else:
+        dlng = radius_km / (KM_PER_DEGREE * widest)
+        first = int(math.floor((lng - dlng) / cell))
+        last = int(math.floor((lng + dlng) / cell))
+        column_range = range(first, min(last, first + columns - 1) + 1)
+
+    for row in range(int(math.floor(lat_min / cell)), int(math.floor(lat_max / cell)) + 1):
+        for column in column_range:
+            yield row, column % columns
+
+
+def nearby(lat, lng, radius_km, kinds=None, limit=None):
+    """Points within radius_km of (lat, lng), nearest first, each with 'distanceKm'"""
+    kinds = set(kinds or KINDS)
+    index = _current()
+    found = []
+    for key in _candidate_cells(lat, lng, radius_km, index['cell']):
+        for record in index['cells'].get(key, ()):
+            if record['kind'] not in kinds:
+                continue
+            distance = haversine_km(lat, lng, record['lat'], record['lng'])
+            if distance <= radius_km:
+                found.append((distance, record))
+
+    found.sort(key=lambda item: item[0])
+    if limit:
+        found = found[:limit]
+    return [{**record, 'distanceKm': round(distance, 1)} for distance, record in found]
+
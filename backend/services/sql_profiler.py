@@ -0,0 +1,181 @@
+"""
+GBMS - SQL Profiler
+글로벌사업처 해외사업관리시스템 - 요청별 SQL 계측 및 느린 쿼리 로그
+
+A sampled fraction of requests (SQL_PROFILE_SAMPLE_RATE) is profiled:
+cursor execute events are timed and summed per request, and the response
+carries a Server-Timing header (db;dur=..;desc="N queries", app;dur=..)
+that browser devtools and the benchmark script read.
+
+Statements slower than SQL_SLOW_QUERY_MS are handed to a background thread.
+That thread writes them as JSON lines to a size-rotated log, together with
+the normalized statement, the endpoint and the EXPLAIN plan. The plan runs
+on a separate connection and only once per normalized statement per
+SQL_EXPLAIN_INTERVAL seconds, so the request thread only pays for a clock
+read and a queue put.
+"""
+import os
+import re
+import json
+import time
+import queue
+import random
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from flask import g, request, has_request_context
+from sqlalchemy import event
+
+_slow_queue = queue.Queue(maxsize=1000)
+_worker = None
+_explained = {}  # normalized statement -> last EXPLAIN time
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)', re.IGNORECASE)
+_PLACEHOLDER = re.compile(r'(?:%\(\w+\)s|:\w+|\$\d+|%s)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_statement(statement):
+    """Replace literals and placeholders with ?, collapse IN lists and whitespace,
+    so the same query shape groups under one key"""
+    text = _STRING_LITERAL.sub('?', statement)
+    text = _PLACEHOLDER.sub('?', text)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _IN_LIST.sub('IN (...)', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def _profiling():
+    return has_request_context() and g.get('sql_profile') is not None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _profiling():
+        conn.info.setdefault('sql_profiler_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not _profiling():
+        return
+    starts = conn.info.get('sql_profiler_start')
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+
+    profile = g.sql_profile
+    profile['count'] += 1
+    profile['db_ms'] += elapsed_ms
+
+    if elapsed_ms >= profile['slow_ms']:
+        try:
+            _slow_queue.put_nowait({
+                'statement': statement,
+                'parameters': parameters if not executemany else None,
+                'duration_ms': round(elapsed_ms, 2),
+                'endpoint': request.endpoint,
+                'method': request.method,
+                'path': request.path,
+            })
+        except queue.Full:
+            pass  # never block a request on the log
+
+
+def _handle_error(context):
+    # the statement failed, so after_cursor_execute will not pop its start time
+    starts = context.connection.info.get('sql_profiler_start') if context.connection else None
+    if starts:
+        starts.pop()
+
+
+def _explain(engine, statement, parameters):
+    prefix = 'EXPLAIN QUERY PLAN ' if engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    try:
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters or ()).fetchall()
+        return [' '.join(str(col) for col in row) for row in rows]
+    except Exception as e:
+        return [f'EXPLAIN failed: {e}']
+
+
+def _write_slow_queries(engine, log, explain_interval):
+    while True:
+        entry = _slow_queue.get()
+        normalized = normalize_statement(entry['statement'])
+        now = time.time()
+
+        plan = None
+        statement = entry['statement'].lstrip().upper()
+        if statement.startswith(('SELECT', 'WITH')) and now - _explained.get(normalized, 0) >= explain_interval:
+            _explained[normalized] = now
+            plan = _explain(engine, entry['statement'], entry['parameters'])
+
+        log.info(json.dumps({
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'endpoint': entry['endpoint'],
+            'request': f"{entry['method']} {entry['path']}",
+            'duration_ms': entry['duration_ms'],
+            'statement': normalized,
+            'plan': plan,
+        }, ensure_ascii=False))
+
+
+def _start_writer(app, engine):
+    global _worker
+    if _worker is not None:
+        return
+
+    log = logging.getLogger('gbms.slow_queries')
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    if not log.handlers:
+        os.makedirs(os.path.dirname(app.config['SQL_SLOW_QUERY_LOG']), exist_ok=True)
+        handler = RotatingFileHandler(
+            app.config['SQL_SLOW_QUERY_LOG'],
+            maxBytes=app.config['SQL_SLOW_QUERY_LOG_BYTES'],
+            backupCount=app.config['SQL_SLOW_QUERY_LOG_BACKUPS'],
+            encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
+
+    _worker = threading.Thread(
+        target=_write_slow_queries,
+        args=(engine, log, app.config['SQL_EXPLAIN_INTERVAL']),
+        name='sql-slow-query-log',
+        daemon=True
+    )
+    _worker.start()
+
+
+def init_app(app, db):
+    """Register cursor timing and the request hooks (call inside an app context)"""
+    sample_rate = app.config.get('SQL_PROFILE_SAMPLE_RATE', 0)
+    if sample_rate <= 0:
+        return
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+    _start_writer(app, engine)
+
+    slow_ms = app.config['SQL_SLOW_QUERY_MS']
+
+    @app.before_request
+    def start_sql_profile():
+        if sample_rate >= 1 or random.random() < sample_rate:
+            g.sql_profile = {'count': 0, 'db_ms': 0.0, 'slow_ms': slow_ms, 'started': time.perf_counter()}
+
+    @app.after_request
+    def add_server_timing(response):
+        profile = g.get('sql_profile')
+        if profile is not None:
+            total_ms = (time.perf_counter() - profile['started']) * 1000
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={profile["db_ms"]:.1f};desc="{profile["count"]} queries", app;dur={total_ms:.1f}'
+            )
+        return response
@@ -0,0 +1,149 @@
+"""
+GBMS - Document Text Extraction
+글로벌사업처 해외사업관리시스템 - 문서 본문 추출
+
+Pure functions (no Flask/DB access) so they can run in worker processes.
+DOCX/XLSX/PPTX are read straight from their OOXML parts; PDF needs the
+optional pypdf package. OOXML parts are parsed incrementally and reading
+stops at MAX_TEXT_LENGTH characters or MAX_DECOMPRESSED_BYTES of XML per
+document, so a large (or zip-bomb) file costs bounded time and memory.
+"""
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+MAX_TEXT_LENGTH = 2 * 1024 * 1024  # characters kept per document
+MAX_DECOMPRESSED_BYTES = 64 * 1024 * 1024  # XML read from the zip members per document
+READ_CHUNK = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\r\f\v]+')
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+
+
+class _Limits:
+    """What one document may still read: decompressed XML bytes and text characters"""
+
+    def __init__(self):
+        self.bytes = MAX_DECOMPRESSED_BYTES
+        self.chars = MAX_TEXT_LENGTH
+
+    def exhausted(self):
+        return self.bytes <= 0 or self.chars <= 0
+
+
+def _xml_text(data, text_tag, break_tag=None, limits=None):
+    """Collect text nodes of an OOXML part, one line per break_tag element.
+
+    Reads data in chunks and stops when limits run out (the rest of the part
+    is never decompressed).
+    """
+    limits = limits or _Limits()
+    parser = ET.XMLPullParser(events=('end',))
+    parts = []
+    while not limits.exhausted():
+        chunk = data.read(min(READ_CHUNK, limits.bytes))
+        if not chunk:
+            break
+        limits.bytes -= len(chunk)
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if tag == text_tag and elem.text:
+                parts.append(elem.text)
+                limits.chars -= len(elem.text)
+            elif break_tag and tag == break_tag:
+                parts.append('\n')
+            elem.clear()
+    return ' '.join(parts)
+
+
+def extract_txt(path):
+    with open(path, 'rb') as f:
+        raw = f.read(MAX_TEXT_LENGTH * 2)
+    for encoding in ('utf-8', 'cp949'):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode('latin-1')
+
+
+def extract_docx(path):
+    with zipfile.ZipFile(path) as zf, zf.open('word/document.xml') as part:
+        return _xml_text(part, 't', 'p')
+
+
+def extract_xlsx(path):
+    texts = []
+    limits = _Limits()
+    with zipfile.ZipFile(path) as zf:
+        names = zf.namelist()
+        if 'xl/sharedStrings.xml' in names:
+            with zf.open('xl/sharedStrings.xml') as part:
+                texts.append(_xml_text(part, 't', 'si', limits))
+        # Inline strings live in the sheets themselves
+        for name in sorted(n for n in names if n.startswith('xl/worksheets/sheet')):
+            if limits.exhausted():
+                break
+            with zf.open(name) as part:
+                texts.append(_xml_text(part, 't', 'row', limits))
+    return '\n'.join(texts)
+
+
+def extract_pptx(path):
+    def slide_number(name):
+        match = re.search(r'(\d+)\.xml$', name)
+        return int(match.group(1)) if match else 0
+
+    texts = []
+    limits = _Limits()
+    with zipfile.ZipFile(path) as zf:
+        slides = [n for n in zf.namelist() if re.match(r'ppt/slides/slide\d+\.xml$', n)]
+        for name in sorted(slides, key=slide_number):
+            if limits.exhausted():
+                break
+            with zf.open(name) as part:
+                texts.append(_xml_text(part, 't', 'p', limits))
+    return '\n'.join(texts)
+
+
+def extract_pdf(path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return ''
+
+    texts = []
+    length = 0
+    for page in PdfReader(path).pages:
+        text = page.extract_text() or ''
+        texts.append(text)
+        length += len(text)
+        if length >= MAX_TEXT_LENGTH:
+            break
+    return '\n'.join(texts)
+
+
+EXTRACTORS = {
+    'txt': extract_txt,
+    'docx': extract_docx,
+    'xlsx': extract_xlsx,
+    'pptx': extract_pptx,
+    'pdf': extract_pdf,
+}
+
+
+def is_supported(file_type):
+    return (file_type or '').lower() in EXTRACTORS
+
+
+def extract_text(path, file_type):
+    """Return normalized plain text of a document, '' for unsupported types"""
+    extractor = EXTRACTORS.get((file_type or '').lower())
+    if not extractor:
+        return ''
+
+    text = extractor(path)
+    text = _WHITESPACE.sub(' ', text)
+    text = _BLANK_LINES.sub('\n', text)
+    return text.strip()[:MAX_TEXT_LENGTH]
@@ -0,0 +1,92 @@
+"""
+GBMS - Token Revocation List
+글로벌사업처 해외사업관리시스템 - 토큰 폐기 목록
+
+Access tokens carry the user's role/department/is_active as claims, so
+token_required authorizes without a DB lookup. This compact list is what
+still lets a logout, deactivation or role change take effect. It holds
+revoked token ids (jti) and per-user "not before" cutoffs.
+
+The list lives in the token_revocations table. Every process keeps a copy in
+memory and reloads it at most every TOKEN_REVOCATION_REFRESH_SECONDS, so
+revocations made by another worker apply within that interval. Revocations
+made in this process apply immediately. The reload only reads; rows are
+deleted by purge_expired() (run from the job worker's maintenance loop) once
+every token they could match has expired.
+"""
+import time
+import threading
+from datetime import datetime
+from flask import current_app
+from models import db, TokenRevocation
+
+_jtis = set()
+_cutoffs = {}  # user_id -> unix time; tokens issued before it are revoked
+_loaded_at = None
+_lock = threading.Lock()
+
+
+def _to_unix(value):
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+
+def _reload():
+    global _jtis, _cutoffs, _loaded_at
+    now = datetime.utcnow()
+    jtis = set()
+    cutoffs = {}
+    rows = db.session.query(
+        TokenRevocation.jti, TokenRevocation.user_id, TokenRevocation.not_before
+    ).filter(TokenRevocation.expires_at >= now)
+    for jti, user_id, not_before in rows:
+        if jti:
+            jtis.add(jti)
+        if user_id and not_before:
+            cutoffs[user_id] = max(cutoffs.get(user_id, 0), _to_unix(not_before))
+
+    _jtis, _cutoffs = jtis, cutoffs
+    _loaded_at = time.monotonic()
+
+
+def purge_expired():
+    """Delete rows whose tokens have all expired"""
+    deleted = TokenRevocation.query.filter(
+        TokenRevocation.expires_at < datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def refresh_if_stale():
+    if _loaded_at is not None and \
+            time.monotonic() - _loaded_at < current_app.config['TOKEN_REVOCATION_REFRESH_SECONDS']:
+        return
+    with _lock:
+        if _loaded_at is None or \
+                time.monotonic() - _loaded_at >= current_app.config['TOKEN_REVOCATION_REFRESH_SECONDS']:
+            _reload()
+
+
+def is_revoked(claims):
+    refresh_if_stale()
+    if claims.get('jti') in _jtis:
+        return True
+    cutoff = _cutoffs.get(claims.get('user_id'))
+    return cutoff is not None and claims.get('iat', 0) < cutoff
+
+
+def revoke_token(jti, user_id, expires_at):
+    """Revoke one token until it expires (caller commits)"""
+    db.session.add(TokenRevocation(jti=jti, user_id=user_id, expires_at=expires_at))
+    _jtis.add(jti)
+
+
+def revoke_user(user_id):
+    """Revoke every access and refresh token issued to the user so far (caller commits)"""
+    now = datetime.utcnow()
+    db.session.add(TokenRevocation(
+        user_id=user_id,
+        not_before=now,
+        expires_at=now + current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+    ))
+    _cutoffs[user_id] = max(_cutoffs.get(user_id, 0), _to_unix(now))
@@ -0,0 +1,111 @@
+"""
+GBMS - User Directory
+글로벌사업처 해외사업관리시스템 - 사용자 디렉터리 캐시
+
+The user table is small and changes rarely, but it is read all the time:
+manager pickers load the full list, project details embed the manager, and
+documents, consulting projects and activity logs show the creator's name.
+This keeps one in-memory copy per process with the same records that
+User.to_dict() returns, indexed by id and by department.
+
+The copy remembers the change_tracking version of the users table and is
+rebuilt on the first read after a committed user write. USER_DIRECTORY_TTL
+bounds staleness from writes made by other processes. version() is a digest
+of the contents, so it is the same in every worker and can serve as an ETag.
+
+The rebuild reads through its own session, so it only sees committed rows,
+never the pending changes of the request that triggered it.
+"""
+import time
+import json
+import hashlib
+import threading
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from services import change_tracking
+
+_TABLES = ('users',)
+
+_lock = threading.Lock()
+_directory = {
+    'versions': None,
+    'expires_at': 0,
+    'by_id': {},
+    'by_department': {},
+    'ordered': [],
+    'version': None,
+}
+
+
+def _build():
+    # models imports this module for its serializers
+    from models import db, User
+
+    with Session(db.engine) as session:
+        records = [user.to_dict() for user in session.scalars(select(User).order_by(User.name, User.id))]
+
+    by_department = {}
+    for record in records:
+        by_department.setdefault(record['department'], []).append(record)
+
+    digest = hashlib.sha1(json.dumps(records, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    return {
+        'by_id': {record['id']: record for record in records},
+        'by_department': by_department,
+        'ordered': records,
+        'version': digest.hexdigest()[:16],
+    }
+
+
+def _current():
+    global _directory
+    versions = change_tracking.versions(_TABLES)
+    directory = _directory
+    if directory['versions'] == versions and directory['expires_at'] > time.monotonic():
+        return directory
+
+    with _lock:
+        directory = _directory
+        if directory['versions'] != versions or directory['expires_at'] <= time.monotonic():
+            # versions were read before building: a write during the build leaves it stale
+            directory = _directory = {
+                **_build(),
+                'versions': versions,
+                'expires_at': time.monotonic() + current_app.config['USER_DIRECTORY_TTL'],
+            }
+        return directory
+
+
+def get(user_id):
+    """Compact user record (User.to_dict()) or None"""
+    if user_id is None:
+        return None
+    record = _current()['by_id'].get(user_id)
+    return dict(record) if record else None
+
+
+def name(user_id):
+    if user_id is None:
+        return None
+    record = _current()['by_id'].get(user_id)
+    return record['name'] if record else None
+
+
+def users(department=None, is_active=None):
+    """User records ordered by name, optionally filtered"""
+    directory = _current()
+    records = directory['by_department'].get(department, []) if department else directory['ordered']
+    if is_active is not None:
+        records = [record for record in records if record['isActive'] == is_active]
+    return [dict(record) for record in records]
+
+
+def version():
+    return _current()['version']
+
+
+def invalidate():
+    global _directory
+    with _lock:
+        _directory = {**_directory, 'versions': None}
@@ -0,0 +1,107 @@
+"""
+GBMS - Streaming ZIP Archives
+글로벌사업처 해외사업관리시스템 - ZIP 일괄 다운로드
+
+Builds a ZIP archive incrementally while it is being sent: zipfile writes
+into a non-seekable buffer (local headers + data descriptors), and the
+buffer is drained after every chunk, so neither the archive nor a member
+file is ever held in memory or written to disk.
+"""
+import io
+import os
+import zipfile
+from datetime import datetime
+
+CHUNK_SIZE = 256 * 1024
+
+# Formats that are already compressed: store as-is instead of deflating again
+STORED_TYPES = {'jpg', 'jpeg', 'png', 'gif', 'zip', 'pdf', 'docx', 'xlsx', 'pptx'}
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands written bytes back to the generator"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def unique_name(name, used):
+    """Return name, or 'name (2).ext' style if it is already in the archive"""
+    if name not in used:
+        used.add(name)
+        return name
+
+    base, ext = os.path.splitext(name)
+    counter = 2
+    while f'{base} ({counter}){ext}' in used:
+        counter += 1
+    name = f'{base} ({counter}){ext}'
+    used.add(name)
+    return name
+
+
+def iter_zip(entries, chunk_size=CHUNK_SIZE):
+    """Yield a ZIP archive of entries piece by piece.
+
+    entries: iterable of (arcname, path, file_type, modified_at). Files that
+    are missing on disk are skipped and listed in a trailing text member.
+    """
+    buffer = _StreamBuffer()
+    missing = []
+    used = set()
+
+    with zipfile.ZipFile(buffer, 'w', allowZip64=True) as archive:
+        for arcname, path, file_type, modified_at in entries:
+            try:
+                source = open(path, 'rb')
+            except OSError:
+                missing.append(arcname)
+                continue
+
+            with source:
+                size = os.fstat(source.fileno()).st_size
+                info = zipfile.ZipInfo(
+                    unique_name(arcname, used),
+                    date_time=(modified_at or datetime.now()).timetuple()[:6]
+                )
+                info.compress_type = zipfile.ZIP_STORED if (file_type or '').lower() in STORED_TYPES \
+                    else zipfile.ZIP_DEFLATED
+
+                with archive.open(info, 'w', force_zip64=size > zipfile.ZIP64_LIMIT) as member:
+                    while True:
+                        chunk = source.read(chunk_size)
+                        if not chunk:
+                            break
+                        member.write(chunk)
+                        data = buffer.drain()
+                        if data:
+                            yield data
+
+            data = buffer.drain()
+            if data:
+                yield data
+
+        if missing:
+            archive.writestr(
+                unique_name('missing_files.txt', used),
+                '다음 파일을 찾을 수 없어 제외되었습니다.\n' + '\n'.join(missing)
+            )
+
+    yield buffer.drain()
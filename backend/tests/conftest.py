@@ -0,0 +1,47 @@
+"""
+GBMS - Test configuration
+글로벌사업처 해외사업관리시스템 - 테스트 공통 설정
+
+Run from the backend directory: python -m pytest -q
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+# The app reads these when it is first imported
+os.environ['FLASK_ENV'] = 'testing'
+os.environ.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app as flask_app
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope='session')
+def admin(app):
+    """admin / admin123 (created once per test session)"""
+    from models import db, User
+    with app.app_context():
+        user = User.query.filter_by(user_id='admin').first()
+        if user is None:
+            user = User(user_id='admin', name='관리자', department='gad', role='admin')
+            user.set_password('admin123')
+            db.session.add(user)
+            db.session.commit()
+    return {'userId': 'admin', 'password': 'admin123'}
+
+
+@pytest.fixture
+def auth_headers(client, admin):
+    token = client.post('/api/auth/login', json=admin).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
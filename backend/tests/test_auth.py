@@ -0,0 +1,65 @@
+"""
+GBMS - Authentication tests
+"""
+
+
+def login(client, user_id, password):
+    response = client.post('/api/auth/login', json={'userId': user_id, 'password': password})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def refresh(client, tokens):
+    return client.post('/api/auth/refresh', json={'refreshToken': tokens['refreshToken']})
+
+
+def create_user(app, user_id, password):
+    from models import db, User
+    with app.app_context():
+        user = User(user_id=user_id, name=user_id, department='gb', role='user')
+        user.set_password(password)
+        db.session.add(user)
+        db.session.commit()
+
+
+def test_refresh_token_works_until_logout(client, admin):
+    tokens = login(client, admin['userId'], admin['password'])
+    assert refresh(client, tokens).status_code == 200
+
+    response = client.post('/api/auth/logout', json={'refreshToken': tokens['refreshToken']},
+                           headers={'Authorization': f"Bearer {tokens['token']}"})
+    assert response.status_code == 200
+
+    assert refresh(client, tokens).status_code == 401
+    assert client.get('/api/auth/me', headers={'Authorization': f"Bearer {tokens['token']}"}).status_code == 401
+
+
+def test_password_change_revokes_refresh_tokens(app, client):
+    create_user(app, 'pwchange', 'old-password')
+    tokens = login(client, 'pwchange', 'old-password')
+    other_session = login(client, 'pwchange', 'old-password')
+
+    response = client.post('/api/auth/change-password',
+                           json={'currentPassword': 'old-password', 'newPassword': 'new-password'},
+                           headers={'Authorization': f"Bearer {tokens['token']}"})
+    assert response.status_code == 200
+
+    assert refresh(client, tokens).status_code == 401
+    assert refresh(client, other_session).status_code == 401
+    assert refresh(client, login(client, 'pwchange', 'new-password')).status_code == 200
+
+
+def test_revocation_reload_is_read_only(app):
+    from datetime import datetime, timedelta
+    from models import db, TokenRevocation
+    from services import token_revocation
+    with app.app_context():
+        db.session.add(TokenRevocation(jti='expired-jti', expires_at=datetime.utcnow() - timedelta(minutes=1)))
+        db.session.commit()
+
+        token_revocation._reload()
+        assert TokenRevocation.query.filter_by(jti='expired-jti').count() == 1
+        assert not token_revocation.is_revoked({'jti': 'expired-jti'})
+
+        assert token_revocation.purge_expired() >= 1
+        assert TokenRevocation.query.filter_by(jti='expired-jti').count() == 0
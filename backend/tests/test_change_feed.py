@@ -0,0 +1,89 @@
+"""
+GBMS - Change feed tests
+"""
+import pytest
+
+from models import db, Project
+from services import change_feed
+
+
+def project(code):
+    return {'code': code, 'title': f'사업 {code}', 'project_type': 'oda_bilateral',
+            'country': '베트남', 'department': 'aidc'}
+
+
+@pytest.fixture
+def feed(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'CHANGE_FEED_HEARTBEAT', 0)
+    with app.app_context():
+        change_feed.check_unpublished()  # baseline
+        subscription = change_feed.subscribe(['project'])
+        yield subscription
+        change_feed.unsubscribe(subscription)
+
+
+def received(subscription):
+    change_feed.check_unpublished()
+    ops = []
+    while (delta := subscription.get(timeout=0)) is not None:
+        ops.append(delta['op'])
+    return ops
+
+
+def test_orm_write_is_published_once(feed):
+    db.session.add(Project(**project('FEED-1')))
+    db.session.commit()
+    assert received(feed) == ['upsert']
+
+
+def test_orm_update_and_delete_are_published_once(feed):
+    row = Project(**project('FEED-3'))
+    db.session.add(row)
+    db.session.commit()
+    row.title = '변경'
+    db.session.commit()
+    db.session.delete(row)
+    db.session.commit()
+    assert received(feed) == ['upsert', 'upsert', 'delete']
+
+
+def test_insert_statement_is_invalidated(feed):
+    db.session.execute(db.insert(Project), [project('FEED-2')])
+    db.session.commit()
+    assert received(feed) == ['invalidate']
+
+
+def test_write_outside_the_session_is_invalidated(feed):
+    # what a job worker or import script in another process looks like from here
+    with db.engine.begin() as connection:
+        connection.execute(db.insert(Project.__table__), [project('FEED-4')])
+    assert received(feed) == ['invalidate']
+    with db.engine.begin() as connection:
+        connection.execute(db.update(Project.__table__).where(Project.code == 'FEED-4').values(title='변경'))
+    assert received(feed) == ['invalidate']
+    assert received(feed) == []
+
+
+def test_data_version_gate(tmp_path, monkeypatch):
+    from sqlalchemy.engine import make_url
+    import sqlite3
+
+    monkeypatch.setattr(change_feed, '_watch', None)
+    monkeypatch.setattr(change_feed, '_data_version', None)
+    path = tmp_path / 'feed.db'
+    writer = sqlite3.connect(path)
+    writer.execute('CREATE TABLE t (id INTEGER PRIMARY KEY)')
+    writer.commit()
+    url = make_url(f'sqlite:///{path}')
+
+    try:
+        assert change_feed._database_moved(url)  # first call records the baseline
+        assert not change_feed._database_moved(url)
+        writer.execute('INSERT INTO t DEFAULT VALUES')
+        writer.commit()
+        assert change_feed._database_moved(url)
+        assert not change_feed._database_moved(url)
+        assert change_feed._database_moved(make_url('sqlite:///:memory:'))
+    finally:
+        change_feed._watch.close()
+        writer.close()
@@ -0,0 +1,74 @@
+"""
+GBMS - Coordinate matcher tests
+"""
+from services.coordinate_matcher import CoordinateMatcher
+
+PROJECTS = [
+    (1, '베트남', ['메콩델타 관개시설 현대화 사업']),
+    (2, '베트남', ['하노이 농촌개발 마스터플랜 수립']),
+    (3, '캄보디아', ['메콩델타 관개시설 현대화 사업']),
+    (4, '라오스', ['비엔티안 농업용수 개발 타당성조사']),
+]
+
+
+def matcher():
+    return CoordinateMatcher(PROJECTS, min_score=0.6)
+
+
+def test_exact_title_matches():
+    result = matcher().match('베트남', '메콩델타 관개시설 현대화 사업')
+    assert (result.status, result.project_id, result.score) == ('matched', 1, 1.0)
+
+
+def test_country_blocks_candidates():
+    result = matcher().match('캄보디아', '메콩델타 관개시설 현대화 사업')
+    assert result.project_id == 3
+
+
+def test_long_description_containing_title_matches():
+    # the old substring rule matched this; Dice over the whole text is < 0.6
+    description = ('라오스 비엔티안 농업용수 개발 타당성조사 (2019-2021, 한국농어촌공사 수행, '
+                   '수혜면적 3,200ha, 양수장 및 용수로 설계 포함)')
+    result = matcher().match('라오스', description)
+    assert (result.status, result.project_id, result.score) == ('matched', 4, 1.0)
+
+
+def test_description_prefix_in_title_matches():
+    # old rule: first 20 characters of the description found in the title
+    result = matcher().match('베트남', '하노이 농촌개발 마스터플랜 수립 및 시범사업 추진 계획')
+    assert (result.status, result.project_id) == ('matched', 2)
+
+
+def test_similar_title_scores_by_dice():
+    result = matcher().match('베트남', '하노이 농촌지역개발 마스터플랜 수립')
+    assert result.status == 'matched' and result.project_id == 2
+    assert 0.6 <= result.score < 1.0
+
+
+def test_unrelated_text_is_unmatched():
+    result = matcher().match('베트남', '댐 안전진단')
+    assert result.status == 'unmatched'
+
+
+def test_short_text_is_not_treated_as_contained():
+    result = matcher().match('베트남', '사업')
+    assert result.status == 'unmatched'
+
+
+def test_containing_two_titles_is_ambiguous():
+    candidates = PROJECTS + [(5, '베트남', ['관개시설 현대화 사업'])]
+    result = CoordinateMatcher(candidates).match('베트남', '메콩델타 관개시설 현대화 사업 2단계')
+    assert result.status == 'ambiguous'
+
+
+def test_generic_short_title_is_not_contained():
+    candidates = PROJECTS + [(5, '베트남', ['관개사업'])]
+    result = CoordinateMatcher(candidates).match('베트남', '하노이 인근 농촌 관개사업 및 도로 포장 지원')
+    assert result.status == 'unmatched'
+
+
+def test_description_is_not_used_for_containment():
+    candidates = [(6, '베트남', ['농업 기술 지원', '하노이 농촌개발 마스터플랜 수립'])]
+    description = '하노이 농촌개발 마스터플랜 수립 (2015-2017, 수혜면적 1,200ha, 시범마을 조성 포함)'
+    result = CoordinateMatcher(candidates).match('베트남', description)
+    assert result.status == 'unmatched'
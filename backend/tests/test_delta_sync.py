@@ -0,0 +1,29 @@
+"""
+GBMS - Delta sync tests
+"""
+import import_krc_data
+from models import db, Project
+
+
+def test_krc_sync_delete_reaches_since_clients(app, client, auth_headers):
+    with app.app_context():
+        for code in ('SYNC-A', 'SYNC-B'):
+            db.session.add(Project(code=code, title=code, project_type='oda_bilateral',
+                                   country='라오스', department='aidc'))
+        db.session.commit()
+        removed_id = Project.query.filter_by(code='SYNC-B').one().id
+
+    full = client.get('/api/projects', headers=auth_headers).get_json()
+    assert full['full'] and removed_id in [row['id'] for row in full['data']]
+
+    with app.app_context():
+        conn = db.engine.raw_connection().driver_connection
+        import_krc_data.ensure_sync_table(conn)
+        plan = {'insert': [], 'update': [], 'unchanged': 0, 'delete': ['SYNC-B'], 'kept': []}
+        import_krc_data.apply_sync(conn, 'oda', plan)
+        conn.commit()
+
+    delta = client.get(f"/api/projects?since={full['version']}", headers=auth_headers).get_json()
+    assert delta['full'] is False
+    assert removed_id in delta['deleted']
+    assert removed_id not in [row['id'] for row in delta['data']]
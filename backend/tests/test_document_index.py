@@ -0,0 +1,49 @@
+"""
+GBMS - Document text extraction / index tests
+"""
+import zipfile
+
+from models import db, Document
+from services import document_index, text_extraction
+
+
+def write_docx(path, paragraphs):
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('word/document.xml',
+                    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                    f'<w:body>{body}</w:body></w:document>')
+
+
+def test_docx_text(tmp_path):
+    path = tmp_path / 'a.docx'
+    write_docx(path, ['관개 사업', '타당성 조사'])
+    lines = text_extraction.extract_text(str(path), 'docx').split('\n')
+    assert [line.strip() for line in lines] == ['관개 사업', '타당성 조사']
+
+
+def test_docx_read_is_capped(tmp_path, monkeypatch):
+    # Compresses to a few KB but would decompress to ~30 MB
+    path = tmp_path / 'bomb.docx'
+    write_docx(path, ['x' * 100] * 300_000)
+    monkeypatch.setattr(text_extraction, 'MAX_DECOMPRESSED_BYTES', 256 * 1024)
+
+    text = text_extraction.extract_text(str(path), 'docx')
+    assert 0 < len(text) < 256 * 1024
+
+
+def test_empty_documents_are_not_extracted_again(app):
+    with app.app_context():
+        document = Document(title='도면', doc_type='drawing', file_name='a.hwp', file_path='/nonexistent/a.hwp', file_type='hwp')
+        db.session.add(document)
+        db.session.commit()
+        document_index.ensure_index()
+
+        try:
+            assert document_index.extract_missing() == (0, 1)
+            assert db.session.get(Document, document.id).text_status == 'empty'
+            assert document_index.extract_missing() == (0, 0)
+        finally:
+            document_index.remove(document.id)
+            db.session.delete(document)
+            db.session.commit()
@@ -0,0 +1,49 @@
+"""
+GBMS - Background job tests
+"""
+import json
+
+from models import db, ActivityLog
+from services import jobs
+
+
+@jobs.handler('test_partial_failure')
+def run_partial_failure(job):
+    db.session.add(ActivityLog(action='test', entity_type='job', description='first chunk'))
+    job.progress(50, '1/2', written=1)
+    db.session.add(ActivityLog(action='test', entity_type='job', description='second chunk'))
+    raise RuntimeError('disk full')
+
+
+def test_failed_job_keeps_committed_counts(app):
+    with app.app_context():
+        jobs.enqueue('test_partial_failure')
+        db.session.commit()
+
+        job = jobs.run(jobs.claim('test-worker'))
+
+        assert job.status == 'failed'
+        assert job.error == 'disk full'
+        assert json.loads(job.result) == {'written': 1, 'complete': False}
+        descriptions = db.session.scalars(
+            db.select(ActivityLog.description).where(ActivityLog.action == 'test')
+        ).all()
+        assert descriptions == ['first chunk']
+
+
+def test_retry_starts_without_the_previous_result(app):
+    with app.app_context():
+        job = jobs.enqueue('test_partial_failure')
+        job.status, job.result = 'queued', json.dumps({'written': 1, 'complete': False})
+        db.session.commit()
+
+        claimed = jobs.claim('test-worker')
+        assert claimed.id == job.id and claimed.result is None
+        jobs.run(claimed)
+
+
+def test_krc_coordinates_rejects_bad_min_score(client, auth_headers):
+    for value in ('abc', None, 0, 1.5):
+        response = client.post('/api/jobs/krc-coordinates', json={'minScore': value}, headers=auth_headers)
+        assert response.status_code == 400
+        assert response.get_json()['errors']
@@ -0,0 +1,87 @@
+"""
+GBMS - KRC import/sync tests
+"""
+import json
+
+import pytest
+
+import import_krc_data
+from models import db, Project, ProjectPhase
+
+
+@pytest.fixture
+def krc_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(import_krc_data, 'KRC_DATA_DIR', str(tmp_path))
+    return tmp_path
+
+
+def write_oda(krc_dir, items):
+    (krc_dir / 'global_oda.json').write_text(json.dumps(items, ensure_ascii=False), encoding='utf-8')
+
+
+def oda_item(code, title):
+    return {'__id': code, 'description': title, 'name': '라오스', 'period': "'20-'23"}
+
+
+def test_sync_keeps_projects_with_phases(app, krc_dir):
+    with app.app_context():
+        project = Project(code='PLAN-PHASE', title='단계 있는 사업', project_type='oda_bilateral',
+                          country='라오스', department='aidc')
+        db.session.add(project)
+        db.session.flush()
+        db.session.add(ProjectPhase(project_id=project.id, name='착수'))
+        db.session.commit()
+
+        conn = db.engine.raw_connection().driver_connection
+        import_krc_data.ensure_sync_table(conn)
+        conn.execute("INSERT INTO krc_sync_state (code, source, fingerprint) VALUES ('PLAN-PHASE', 'oda', 'x')")
+        write_oda(krc_dir, [oda_item('PLAN-OTHER', '다른 사업')])
+
+        try:
+            plan = import_krc_data.plan_sync(conn, 'oda')
+            assert plan['kept'] == ['PLAN-PHASE'] and plan['delete'] == []
+        finally:
+            conn.rollback()
+            ProjectPhase.query.filter_by(project_id=project.id).delete()
+            db.session.delete(project)
+            db.session.commit()
+
+
+def test_sync_skips_bad_items(app, krc_dir):
+    with app.app_context():
+        conn = db.engine.raw_connection().driver_connection
+        import_krc_data.ensure_sync_table(conn)
+        conn.execute("INSERT INTO krc_sync_state (code, source, fingerprint) VALUES ('PLAN-GONE', 'oda', 'x')")
+        write_oda(krc_dir, [oda_item('PLAN-NEW', '새 사업'), {'description': '잘못된 예산', 'budget': {'원': 1}}])
+
+        try:
+            plan = import_krc_data.plan_sync(conn, 'oda')
+            assert [row['code'] for row, _ in plan['insert']] == ['PLAN-NEW']
+            assert plan['skipped'] == 1
+            # the bad item's code is unknown, so nothing is treated as removed
+            assert plan['delete'] == [] and plan['kept'] == []
+        finally:
+            conn.rollback()
+
+
+def test_full_reimport_reaches_since_clients(app, client, auth_headers, krc_dir):
+    with app.app_context():
+        for code in ('FULL-A', 'FULL-B'):
+            db.session.add(Project(code=code, title=code, project_type='oda_bilateral',
+                                   country='라오스', department='aidc'))
+        db.session.commit()
+
+    full = client.get('/api/projects', headers=auth_headers).get_json()
+    old_ids = {row['id'] for row in full['data']}
+
+    write_oda(krc_dir, [oda_item('FULL-A', '다시 입력된 사업')])
+    with app.app_context():
+        conn = db.engine.raw_connection().driver_connection
+        assert import_krc_data.reimport_krc_data(conn) == (0, 1)
+        current = {project.id: project.code for project in Project.query}
+
+    delta = client.get(f"/api/projects?since={full['version']}", headers=auth_headers).get_json()
+    assert delta['full'] is False
+    assert [row['code'] for row in delta['data']] == ['FULL-A']
+    # reused ids come back as rows, not as deletions
+    assert set(delta['deleted']) == old_ids - set(current)
@@ -0,0 +1,33 @@
+"""
+GBMS - Office route tests
+"""
+import pytest
+
+
+def create(client, headers, **fields):
+    return client.post('/api/offices', json={'name': '하노이 사무소', 'country': '베트남', **fields},
+                       headers=headers)
+
+
+@pytest.mark.parametrize('latitude, longitude', [
+    (91, 105.8), (-90.5, 105.8), (21.0, 180.1), ('north', 105.8), (21.0, True), ('nan', 105.8),
+])
+def test_invalid_coordinates_are_rejected(client, auth_headers, latitude, longitude):
+    response = create(client, auth_headers, latitude=latitude, longitude=longitude)
+    assert response.status_code == 400
+    assert response.get_json()['errors']
+
+
+def test_coordinates_are_stored_as_numbers(client, auth_headers):
+    response = create(client, auth_headers, latitude='21.03', longitude=105.85)
+    assert response.status_code == 201
+    office = response.get_json()['data']
+    assert (office['latitude'], office['longitude']) == (21.03, 105.85)
+
+    response = client.put(f"/api/offices/{office['id']}", json={'latitude': '', 'longitude': None},
+                          headers=auth_headers)
+    assert response.status_code == 200
+    assert (response.get_json()['data']['latitude'], response.get_json()['data']['longitude']) == (None, None)
+
+    response = client.put(f"/api/offices/{office['id']}", json={'latitude': -95}, headers=auth_headers)
+    assert response.status_code == 400
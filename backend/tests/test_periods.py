@@ -0,0 +1,49 @@
+"""
+GBMS - Period parsing tests
+"""
+from datetime import date
+
+import import_krc_data
+from services.periods import parse_period_point, parse_period_range
+
+
+def test_apostrophe_range():
+    assert parse_period_range("'23-'28") == (date(2023, 1, 1), date(2028, 12, 31))
+
+
+def test_range_without_second_apostrophe():
+    # 28 is not a month, so this is '23-'28
+    assert parse_period_range("'23-28") == (date(2023, 1, 1), date(2028, 12, 31))
+    assert parse_period_range('23-28') == (date(2023, 1, 1), date(2028, 12, 31))
+
+
+def test_four_digit_range():
+    assert parse_period_range('2019-2023') == (date(2019, 1, 1), date(2023, 12, 31))
+    assert parse_period_range('2019~2023') == (date(2019, 1, 1), date(2023, 12, 31))
+
+
+def test_year_month_is_a_single_month():
+    assert parse_period_range("'20.01") == (date(2020, 1, 1), date(2020, 1, 31))
+    assert parse_period_range("'72-10") == (date(1972, 10, 1), date(1972, 10, 31))
+
+
+def test_prefer_range_reads_month_like_end_as_year():
+    assert parse_period_range("'10-12", prefer_range=True) == (date(2010, 1, 1), date(2012, 12, 31))
+    assert parse_period_range("'08-11", prefer_range=True) == (date(2008, 1, 1), date(2011, 12, 31))
+    assert parse_period_range("'23-'28", prefer_range=True) == (date(2023, 1, 1), date(2028, 12, 31))
+
+
+def test_oda_period_is_a_year_range():
+    row = import_krc_data.oda_row({'description': '관개 사업', 'name': '라오스', 'period': "'10-12"})
+    assert (row['start_date'], row['end_date']) == ('2010-01-01', '2012-12-31')
+
+
+def test_century_pivot():
+    assert parse_period_range("'72-'75") == (date(1972, 1, 1), date(1975, 12, 31))
+    assert parse_period_point("'71") == date(2071, 1, 1)
+
+
+def test_unparseable():
+    assert parse_period_range('미정') == (None, None)
+    assert parse_period_range(None) == (None, None)
+    assert parse_period_point("'20-13") is None
@@ -0,0 +1,32 @@
+"""
+GBMS - Project route tests
+"""
+from models import db, Project
+
+
+def make_projects(app, *codes):
+    with app.app_context():
+        rows = [Project(code=code, title=code, project_type='consulting', country='몽골', department='gb')
+                for code in codes]
+        db.session.add_all(rows)
+        db.session.commit()
+        return [row.id for row in rows]
+
+
+def test_bulk_update_changes_department(app, client, auth_headers):
+    ids = make_projects(app, 'BULK-1', 'BULK-2')
+    response = client.patch('/api/projects/bulk-update', headers=auth_headers,
+                            json={'ids': ids, 'changes': {'department': 'aidc'}})
+    assert response.status_code == 200
+    assert response.get_json()['data']['updated'] == 2
+    with app.app_context():
+        assert {row.department for row in Project.query.filter(Project.id.in_(ids))} == {'aidc'}
+
+
+def test_bulk_update_rejects_unknown_department(app, client, auth_headers):
+    ids = make_projects(app, 'BULK-3')
+    response = client.patch('/api/projects/bulk-update', headers=auth_headers,
+                            json={'ids': ids, 'changes': {'department': 'sales'}})
+    assert response.status_code == 400
+    with app.app_context():
+        assert db.session.get(Project, ids[0]).department == 'gb'
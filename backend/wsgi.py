@@ -0,0 +1,17 @@
+"""
+GBMS - WSGI entry point
+글로벌사업처 해외사업관리시스템 - 운영 서버 진입점
+
+Importing app only builds the application; this module also starts the
+serving process's background work (init_background). Point the WSGI server
+here, without preloading the app before forking workers, so every worker
+starts its own threads:
+
+Run with: gunicorn wsgi:app   (settings in gunicorn.conf.py)
+
+Use threaded workers (gunicorn.conf.py sets --worker-class gthread): change
+feed streams hold a request for minutes, which would pin sync workers.
+"""
+from app import app, init_background
+
+init_background(app)
@@ -17,13 +17,48 @@ const API = {
         return '/api';
     },
 
+    // In-flight refresh shared by concurrent requests
+    _refreshing: null,
+
+    /**
+     * Exchange the refresh token for a new short-lived access token
+     * @returns {Promise<boolean>} Whether a new token was stored
+     */
+    async refreshAccessToken() {
+        const refreshToken = Utils.storage.get('gbms_refresh_token');
+        if (!refreshToken) return false;
+
+        if (!this._refreshing) {
+            this._refreshing = (async () => {
+                try {
+                    const response = await fetch(`${this.BASE_URL}/auth/refresh`, {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ refreshToken }),
+                    });
+                    if (!response.ok) return false;
+
+                    const data = await response.json();
+                    Utils.storage.set('gbms_token', data.token);
+                    return true;
+                } catch (error) {
+                    return false;
+                } finally {
+                    this._refreshing = null;
+                }
+            })();
+        }
+        return this._refreshing;
+    },
+
     /**
      * Make API request
      * @param {string} endpoint - API endpoint
      * @param {Object} options - Fetch options
+     * @param {boolean} retry - Retry once after refreshing an expired access token
      * @returns {Promise<Object>} Response data
      */
-    async request(endpoint, options = {}) {
+    async request(endpoint, options = {}, retry = true) {
         const url = `${this.BASE_URL}${endpoint}`;
 
         const defaultOptions = {
@@ -50,8 +85,11 @@ const API = {
         try {
             const response = await fetch(url, mergedOptions);
 
-            // Handle 401 Unauthorized
+            // Handle 401 Unauthorized (access token expired -> refresh once and retry)
             if (response.status === 401) {
+                if (retry && await this.refreshAccessToken()) {
+                    return this.request(endpoint, options, false);
+                }
                 Auth.logout();
                 throw new Error('인증이 만료되었습니다. 다시 로그인해주세요.');
             }
@@ -98,6 +136,16 @@ const API = {
         });
     },
 
+    /**
+     * PATCH request
+     */
+    async patch(endpoint, data = {}) {
+        return this.request(endpoint, {
+            method: 'PATCH',
+            body: JSON.stringify(data),
+        });
+    },
+
     /**
      * DELETE request
      */
@@ -108,7 +156,7 @@ const API = {
     /**
      * Upload file
      */
-    async upload(endpoint, formData) {
+    async upload(endpoint, formData, retry = true) {
         const token = Utils.storage.get('gbms_token');
         const headers = {};
         if (token) {
@@ -121,6 +169,10 @@ const API = {
             body: formData,
         });
 
+        if (response.status === 401 && retry && await this.refreshAccessToken()) {
+            return this.upload(endpoint, formData, false);
+        }
+
         if (!response.ok) {
             const data = await response.json();
             throw new Error(data.message || '파일 업로드 중 오류가 발생했습니다.');
@@ -168,6 +220,15 @@ const API = {
             return API.delete(`/projects/${id}`);
         },
 
+        /**
+         * Apply the same changes to many projects
+         * @param {Object} target - { ids: [...] } or { filters: {...} }
+         * @param {Object} changes - e.g. { status: 'completed', progress: 100 }
+         */
+        async bulkUpdate(target, changes) {
+            return API.patch('/projects/bulk-update', { ...target, changes });
+        },
+
         /**
          * Get project statistics
          */
@@ -265,6 +326,13 @@ const API = {
 
         async update(id, data) {
             return API.put(`/offices/${id}`, data);
+        },
+
+        /**
+         * Projects within radiusKm of the office, nearest first
+         */
+        async nearbyProjects(id, radiusKm) {
+            return API.get(`/offices/${id}/nearby-projects`, { radius: radiusKm });
         }
     },
 
@@ -310,6 +378,36 @@ const API = {
         }
     },
 
+    // ==========================================
+    // Jobs API (background upload/export/delete)
+    // ==========================================
+    jobs: {
+        async list() {
+            return API.get('/jobs');
+        },
+
+        async get(id) {
+            return API.get(`/jobs/${id}`);
+        },
+
+        async cancel(id) {
+            return API.delete(`/jobs/${id}`);
+        },
+
+        /**
+         * Poll a job until it is done/failed/cancelled
+         */
+        async wait(id, intervalMs = 2000) {
+            for (;;) {
+                const response = await API.get(`/jobs/${id}`);
+                if (['done', 'failed', 'cancelled'].includes(response.data.status)) {
+                    return response.data;
+                }
+                await new Promise(resolve => setTimeout(resolve, intervalMs));
+            }
+        }
+    },
+
     // ==========================================
     // GIS API
     // ==========================================
@@ -321,6 +419,13 @@ const API = {
             return API.get('/gis/projects', filters);
         },
 
+        /**
+         * Get offices with coordinates (same marker format as projects)
+         */
+        async getOffices(filters = {}) {
+            return API.get('/gis/offices', filters);
+        },
+
         /**
          * Get GIS statistics
          */
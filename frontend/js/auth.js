@@ -6,6 +6,7 @@
 const Auth = {
     // Storage keys
     TOKEN_KEY: 'gbms_token',
+    REFRESH_TOKEN_KEY: 'gbms_refresh_token',
     USER_KEY: 'gbms_user',
 
     /**
@@ -71,6 +72,9 @@ const Auth = {
             if (response.success) {
                 // Store auth data
                 Utils.storage.set(this.TOKEN_KEY, response.token);
+                if (response.refreshToken) {
+                    Utils.storage.set(this.REFRESH_TOKEN_KEY, response.refreshToken);
+                }
                 Utils.storage.set(this.USER_KEY, response.user);
 
                 // Show success and redirect
@@ -233,10 +237,34 @@ const Auth = {
     },
 
     /**
-     * Logout user
+     * Logout user (revokes the access and refresh tokens on the server)
      */
-    logout() {
+    async logout() {
+        const refreshToken = Utils.storage.get(this.REFRESH_TOKEN_KEY);
+        if (refreshToken) {
+            // keepalive: the request may outlive the page we are leaving
+            const send = () => fetch(`${API.BASE_URL}/auth/logout`, {
+                method: 'POST',
+                keepalive: true,
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Authorization': `Bearer ${Utils.storage.get(this.TOKEN_KEY)}`,
+                },
+                body: JSON.stringify({ refreshToken }),
+            });
+            try {
+                const response = await send();
+                // expired access token: refresh once so the refresh token still gets revoked
+                if (response.status === 401 && await API.refreshAccessToken()) {
+                    await send();
+                }
+            } catch (error) {
+                console.error('Logout Error:', error);
+            }
+        }
+
         Utils.storage.remove(this.TOKEN_KEY);
+        Utils.storage.remove(this.REFRESH_TOKEN_KEY);
         Utils.storage.remove(this.USER_KEY);
         window.location.href = 'index.html';
     },
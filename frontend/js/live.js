@@ -0,0 +1,76 @@
+/**
+ * GBMS - Live Updates Module
+ * 글로벌사업처 해외사업관리시스템 - 실시간 변경 알림
+ *
+ * Subscribes to /api/events/stream (server-sent events). Each committed
+ * change arrives as a delta { cursor, entity, op, id, data }; pages patch
+ * what they show instead of polling the full endpoint. 'resync' means
+ * deltas were missed and the page should reload its data once.
+ */
+
+const LiveFeed = {
+    /**
+     * Open the change stream
+     * @param {Object} options
+     * @param {string[]} options.topics - Entities to receive (e.g. ['project', 'consulting'])
+     * @param {Function} options.onChange - Called with each delta
+     * @param {Function} options.onResync - Called when the page must reload its data
+     * @returns {Object} Handle with close()
+     */
+    connect({ topics = [], onChange, onResync } = {}) {
+        if (typeof EventSource === 'undefined') return { close() {} };
+
+        const state = { source: null, lastEventId: null, closed: false, timer: null };
+
+        const open = () => {
+            const token = Utils.storage.get('gbms_token');
+            if (!token || state.closed) return;
+
+            const params = new URLSearchParams({ token });
+            if (topics.length) params.set('topics', topics.join(','));
+            // a new EventSource does not resend the previous one's last id
+            if (state.lastEventId) params.set('lastEventId', state.lastEventId);
+
+            const source = new EventSource(`${API.BASE_URL}/events/stream?${params}`);
+            state.source = source;
+
+            source.addEventListener('change', (event) => {
+                state.lastEventId = event.lastEventId;
+                if (onChange) onChange(JSON.parse(event.data));
+            });
+
+            source.addEventListener('resync', (event) => {
+                state.lastEventId = event.lastEventId;
+                if (onResync) onResync();
+            });
+
+            source.onerror = () => {
+                // the server closes streams periodically and the access token
+                // is short-lived: reopen with a fresh token instead of letting
+                // the browser retry with the old URL
+                source.close();
+                if (state.closed) return;
+                clearTimeout(state.timer);
+                state.timer = setTimeout(async () => {
+                    await API.refreshAccessToken();
+                    open();
+                }, 3000);
+            };
+        };
+
+        open();
+
+        return {
+            close() {
+                state.closed = true;
+                clearTimeout(state.timer);
+                if (state.source) state.source.close();
+            }
+        };
+    }
+};
+
+// Export for module usage
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = LiveFeed;
+}